@@ -0,0 +1,389 @@
+"""병합 엔진 벤치마크 (fake_com의 가짜 COM 객체 사용 - Windows·Office 불필요).
+
+    python benchmark.py [--rows 1000,10000,100000] [--backends hwp,word,ppt] [--modes individual,combined]
+                        [--fields 30] [--image-slots 2] [--image-ratio 0.5] [--images 8]
+                        [--latency 0] [--output bench.json] [--compare 이전결과.json]
+    python benchmark.py --engines native [--compression store,fast,default,max] [--deflate-threads 4]
+
+형식별 합성 템플릿(필드 여러 개, 머리글·바닥글, 텍스트 상자, 이미지 자리)과 지정한 행 수·이미지 비율의
+합성 데이터를 만들고, 엔진 × 출력 방식마다 별도 프로세스에서 yongmerge.run_merge를 실행합니다.
+결과(행/초, 최대 RSS, 출력 크기, COM 호출 수, 단계별 p50/p95)를 커밋 해시와 함께 JSON으로 저장하므로
+--compare로 다른 커밋의 결과와 비교할 수 있습니다. 엔진의 고정 대기(time.sleep)는 측정에서 제외합니다.
+--engines native는 실제 zip 템플릿(.hwpx/.docx/.pptx)으로 네이티브 엔진의 개별 저장을
+압축 정책별로 측정해 처리량과 출력 크기를 비교합니다.
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+import contextlib
+
+BACKENDS = ('hwp', 'word', 'ppt')
+MODES = ('individual', 'combined')
+ENGINES = ('com', 'native')
+# 네이티브 엔진 압축 정책 (native_merge.COMPRESSION_POLICIES와 같은 이름)
+COMPRESSIONS = ('store', 'fast', 'default', 'max')
+TEMPLATE_EXTENSIONS = {'hwp': '.hwp', 'word': '.docx', 'ppt': '.pptx'}
+NATIVE_EXTENSIONS = {'hwp': '.hwpx', 'word': '.docx', 'ppt': '.pptx'}
+
+# PowerPoint 슬라이드 하나에 넣는 필드 텍스트 상자 수
+FIELDS_PER_SLIDE = 6
+# 합성 이미지 크기 (작은 사진과 큰 사진을 번갈아 생성)
+IMAGE_SIZES = ((320, 240), (1600, 1200))
+
+
+def field_names(fields):
+    return [f"F{i}" for i in range(1, fields + 1)]
+
+
+def image_names(image_slots):
+    return [f"IMAGE{i}" for i in range(1, image_slots + 1)]
+
+
+def build_template(directory, backend, fields=30, image_slots=2):
+    """필드·머리글/바닥글·텍스트 상자·이미지 자리가 있는 합성 템플릿을 만들고 경로를 반환합니다."""
+    import fake_com
+
+    names = field_names(fields)
+    images = image_names(image_slots)
+    path = os.path.join(directory, f"bench_{backend}{TEMPLATE_EXTENSIONS[backend]}")
+    body = "\n".join(f"항목 {i}: {{{{{name}}}}} 확인" for i, name in enumerate(names, 1))
+    slots = "\n".join(f"{{{{{name}}}}}" for name in images)
+    if backend == 'hwp':
+        # 한글 가짜 문서는 본문 하나뿐이라 머리말·꼬리말을 본문 앞뒤 줄로 둠
+        content = f"머리말 {{{{{names[0]}}}}}\n{body}\n{slots}\n꼬리말 {{{{{names[-1]}}}}}"
+    elif backend == 'word':
+        content = {'main': f"{body}\n{slots}",
+                   'header': f"머리글 {{{{{names[0]}}}}}",
+                   'footer': f"바닥글 {{{{{names[-1]}}}}} 쪽"}
+    else:
+        content = [[f"{{{{{name}}}}} 님" for name in names[i:i + FIELDS_PER_SLIDE]]
+                   for i in range(0, len(names), FIELDS_PER_SLIDE)]
+        content.append([f"{{{{{name}}}}}" for name in images] or ["이미지 없음"])
+    return fake_com.write_template(path, backend, content)
+
+
+def _filler(tag, count):
+    # 행마다 바뀌지 않는 스타일·테마 파트 (실제 문서처럼 잘 압축되는 반복 XML)
+    return "".join(f'<{tag} id="S{i}" name="Style {i}" size="{20 + i % 10}" color="{i * 2654435761 % 16777216:06X}"/>'
+                   for i in range(count))
+
+
+def build_native_template(directory, backend, fields=30):
+    """네이티브 엔진용 실제 zip 템플릿(.hwpx/.docx/.pptx)을 만들고 경로를 반환합니다.
+
+    필드와 머리글·바닥글 외에 스타일·테마·이미지처럼 행마다 바뀌지 않는 멤버를 넣어 실제 문서와 비슷하게 만듭니다.
+    """
+    import zipfile
+
+    names = field_names(fields)
+    path = os.path.join(directory, f"bench_{backend}{NATIVE_EXTENSIONS[backend]}")
+    media = random.Random(0).randbytes(64 * 1024)  # 압축되지 않는 사진 데이터 대신
+    w = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+    a = 'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"'
+    hp = 'xmlns:hp="http://www.hancom.co.kr/hwpml/2011/paragraph"'
+    if backend == 'word':
+        def paragraph(text):
+            return f'<w:p><w:r><w:t xml:space="preserve">{text}</w:t></w:r></w:p>'
+        body = "".join(paragraph(f"항목 {i}: {{{{{name}}}}} 확인") for i, name in enumerate(names, 1))
+        members = [
+            ("[Content_Types].xml", "<Types/>"),
+            ("word/document.xml", f"<w:document {w}><w:body>{body}<w:sectPr/></w:body></w:document>"),
+            ("word/header1.xml", f"<w:hdr {w}>{paragraph(f'머리글 {{{{{names[0]}}}}}')}</w:hdr>"),
+            ("word/footer1.xml", f"<w:ftr {w}>{paragraph(f'바닥글 {{{{{names[-1]}}}}} 쪽')}</w:ftr>"),
+            ("word/styles.xml", f"<w:styles {w}>{_filler('w:style', 2000)}</w:styles>"),
+            ("word/theme/theme1.xml", f"<a:theme {a}>{_filler('a:font', 1000)}</a:theme>"),
+            ("word/media/image1.jpeg", media),
+        ]
+    elif backend == 'ppt':
+        members = [("[Content_Types].xml", "<Types/>")]
+        for number, start in enumerate(range(0, len(names), FIELDS_PER_SLIDE), 1):
+            shapes = "".join(f"<p:sp><p:txBody><a:p><a:r><a:t>{{{{{name}}}}} 님</a:t></a:r></a:p></p:txBody></p:sp>"
+                             for name in names[start:start + FIELDS_PER_SLIDE])
+            members.append((f"ppt/slides/slide{number}.xml", f'<p:sld xmlns:p="p" {a}>{shapes}</p:sld>'))
+        members += [
+            ("ppt/slideMasters/slideMaster1.xml", f'<p:sldMaster xmlns:p="p">{_filler("p:style", 2000)}</p:sldMaster>'),
+            ("ppt/theme/theme1.xml", f"<a:theme {a}>{_filler('a:font', 1000)}</a:theme>"),
+            ("ppt/media/image1.jpeg", media),
+        ]
+    else:
+        def field(name):
+            return (f'<hp:p><hp:run><hp:ctrl><hp:fieldBegin type="CLICK_HERE" name="{name}"/></hp:ctrl>'
+                    f'<hp:t>{name}</hp:t><hp:ctrl><hp:fieldEnd/></hp:ctrl></hp:run></hp:p>')
+        members = [
+            ("mimetype", "application/hwp+zip"),
+            ("Contents/header.xml", f'<hh:head xmlns:hh="hh">{_filler("hh:charPr", 2000)}</hh:head>'),
+            ("Contents/section0.xml", f"<hs:sec xmlns:hs='hs' {hp}>{''.join(field(name) for name in names)}</hs:sec>"),
+            ("BinData/image1.jpg", media),
+        ]
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members:
+            archive.writestr(name, data, zipfile.ZIP_STORED if name == 'mimetype' else zipfile.ZIP_DEFLATED)
+    return path
+
+
+def build_images(directory, count):
+    """크기가 다른 합성 PNG 이미지 count개를 만듭니다."""
+    from PIL import Image
+
+    paths = []
+    for i in range(count):
+        width, height = IMAGE_SIZES[i % len(IMAGE_SIZES)]
+        path = os.path.join(directory, f"image_{i}.png")
+        Image.new("RGB", (width, height), ((i * 53) % 256, (i * 97) % 256, (i * 31) % 256)).save(path)
+        paths.append(path)
+    return paths
+
+
+def build_dataset(rows, fields=30, image_slots=2, image_ratio=0.5, image_paths=(), seed=0):
+    """합성 데이터(DataFrame)를 만듭니다 - 이미지 칸은 image_ratio 비율의 행에만 채움."""
+    import pandas as pd
+
+    rng = random.Random(seed)
+    alphabet = "가나다라마바사아자차카타파하ABCDEFGHIJ0123456789"
+    data = {name: ["".join(rng.choices(alphabet, k=rng.randint(3, 20))) for _ in range(rows)]
+            for name in field_names(fields)}
+    for name in image_names(image_slots):
+        data[name] = [rng.choice(image_paths) if image_paths and rng.random() < image_ratio else ""
+                      for _ in range(rows)]
+    return pd.DataFrame(data)
+
+
+def peak_rss_bytes():
+    """현재 프로세스의 최대 RSS(바이트) - 측정할 수 없으면 None."""
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux는 KB, macOS는 바이트 단위
+        return peak if sys.platform == 'darwin' else peak * 1024
+    try:
+        import psutil
+    except ImportError:
+        return None
+    info = psutil.Process().memory_info()
+    return getattr(info, 'peak_wset', info.rss)
+
+
+def output_bytes(result):
+    """run_merge 결과의 출력 파일(통합본 또는 개별 파일들) 크기 합계."""
+    path = result['path']
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path) if '_row_' in name)
+
+
+@contextlib.contextmanager
+def _no_engine_waits():
+    # 엔진이 COM 프로그램을 기다리는 고정 sleep은 가짜 객체에서는 의미가 없으므로 제외
+    original = time.sleep
+    time.sleep = lambda seconds: None
+    try:
+        yield
+    finally:
+        time.sleep = original
+
+
+def run_case(case, workdir, quiet=True):
+    """벤치마크 한 건을 현재 프로세스에서 실행하고 측정 결과 dict를 반환합니다."""
+    import com_factory
+    import fake_com
+    import template_cache
+    import yongmerge
+
+    os.makedirs(workdir, exist_ok=True)
+    image_dir = os.path.join(workdir, "images")
+    os.makedirs(image_dir, exist_ok=True)
+    engine = case.get('engine', 'com')
+    if engine == 'native':
+        # 네이티브 엔진은 텍스트 값만 채우므로 이미지 칸 없이 측정
+        case = dict(case, image_slots=0)
+        template = build_native_template(workdir, case['backend'], case['fields'])
+    else:
+        template = build_template(workdir, case['backend'], case['fields'], case['image_slots'])
+    image_paths = build_images(image_dir, case['images']) if case['image_slots'] else []
+    dataframe = build_dataset(case['rows'], case['fields'], case['image_slots'], case['image_ratio'],
+                              image_paths, case.get('seed', 0))
+
+    factory = fake_com.FakeComFactory(latency=case.get('latency', 0.0))
+    output = open(os.devnull, 'w', encoding='utf-8') if quiet else None
+    # 합성 템플릿의 분석 결과가 사용자 캐시에 쌓이지 않도록 작업 폴더에 캐시
+    template_cache.configure(cache_dir=os.path.join(workdir, "template_cache"))
+    try:
+        with _no_engine_waits(), com_factory.use_factory(factory), \
+                contextlib.redirect_stdout(output or sys.stdout):
+            start = time.perf_counter()
+            result = yongmerge.run_merge(template, dataframe, case['mode'], engine=engine,
+                                         native_options={'compression': case.get('compression'),
+                                                         'threads': case.get('threads')})
+            seconds = time.perf_counter() - start
+    finally:
+        template_cache.configure()
+        if output is not None:
+            output.close()
+
+    phases = {phase: {'p50': entry['p50'], 'p95': entry['p95']}
+              for phase, entry in result['trace']['summary'].items()}
+    return dict(case,
+                seconds=round(seconds, 3),
+                rows_per_sec=round(case['rows'] / seconds, 2) if seconds > 0 else None,
+                peak_rss=peak_rss_bytes(),
+                output_bytes=output_bytes(result),
+                com_calls=factory.total_calls(),
+                phases=phases)
+
+
+def _run_case_subprocess(case, workdir):
+    # 최대 RSS가 케이스끼리 섞이지 않도록 케이스마다 새 프로세스에서 실행
+    result_path = os.path.join(workdir, "result.json")
+    env = dict(os.environ, PYTHONIOENCODING='utf-8')
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--run-case', json.dumps(case),
+                           '--workdir', workdir, '--result-file', result_path],
+                          capture_output=True, text=True, encoding='utf-8', errors='replace', env=env)
+    if proc.returncode != 0 or not os.path.isfile(result_path):
+        return dict(case, error=(proc.stderr or proc.stdout)[-2000:])
+    with open(result_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def git_commit():
+    """현재 소스의 커밋 해시 (수정된 파일이 있으면 '-dirty' 추가, git이 없으면 None)."""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=directory, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'diff', '--quiet', 'HEAD', '--'], cwd=directory).returncode != 0
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ('-dirty' if dirty else '')
+
+
+def case_key(result):
+    return (result['backend'], result['mode'], result['rows'], result.get('engine', 'com'), result.get('compression'))
+
+
+def case_label(result):
+    """결과 표의 엔진 이름 (네이티브 엔진은 압축 정책을 붙임, 예: 'word/fast')."""
+    if result.get('engine') == 'native':
+        return f"{result['backend']}/{result.get('compression') or 'default'}"
+    return result['backend']
+
+
+def compare(baseline, current):
+    """두 결과 파일의 같은 케이스끼리 행/초·COM 호출 수 변화를 표로 만듭니다."""
+    previous = {case_key(r): r for r in baseline['results'] if 'error' not in r}
+    lines = [f"기준 {baseline['meta'].get('commit')} -> 현재 {current['meta'].get('commit')}",
+             f"{'엔진':<14}{'방식':<12}{'행':>8} {'행/초':>10} {'변화':>8} {'COM 호출':>10} {'변화':>8}"]
+    for result in current['results']:
+        old = previous.get(case_key(result))
+        if old is None or 'error' in result:
+            continue
+        speed = (result['rows_per_sec'] / old['rows_per_sec'] - 1) * 100 if old['rows_per_sec'] else 0.0
+        calls = (result['com_calls'] / old['com_calls'] - 1) * 100 if old['com_calls'] else 0.0
+        lines.append(f"{case_label(result):<14}{result['mode']:<12}{result['rows']:>8} "
+                     f"{result['rows_per_sec']:>10.1f} {speed:>+7.1f}% {result['com_calls']:>10} {calls:>+7.1f}%")
+    return "\n".join(lines)
+
+
+def _csv_list(text, allowed=None):
+    items = [item.strip() for item in text.split(',') if item.strip()]
+    if allowed is not None:
+        unknown = [item for item in items if item not in allowed]
+        if unknown:
+            raise argparse.ArgumentTypeError(f"알 수 없는 값: {', '.join(unknown)}")
+    return items
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="YongMerge 병합 엔진 벤치마크 (가짜 COM 객체 사용)")
+    parser.add_argument('--rows', type=lambda text: [int(n) for n in _csv_list(text)], default=[1000],
+                        help="데이터 행 수 목록 (쉼표 구분, 예: 1000,10000,100000)")
+    parser.add_argument('--backends', type=lambda text: _csv_list(text, BACKENDS), default=list(BACKENDS))
+    parser.add_argument('--modes', type=lambda text: _csv_list(text, MODES), default=list(MODES))
+    parser.add_argument('--engines', type=lambda text: _csv_list(text, ENGINES), default=['com'],
+                        help="측정할 엔진 (com: 가짜 COM 객체, native: 실제 zip 템플릿·개별 저장만)")
+    parser.add_argument('--compression', type=lambda text: _csv_list(text, COMPRESSIONS), default=list(COMPRESSIONS),
+                        help="네이티브 엔진에서 비교할 압축 정책 (쉼표 구분)")
+    parser.add_argument('--deflate-threads', type=int, help="네이티브 엔진 압축 스레드 수 (기본: CPU 수, 최대 4)")
+    parser.add_argument('--fields', type=int, default=30, help="텍스트 필드 수")
+    parser.add_argument('--image-slots', type=int, default=2, help="이미지 자리 수")
+    parser.add_argument('--image-ratio', type=float, default=0.5, help="이미지가 들어가는 칸의 비율 (0~1)")
+    parser.add_argument('--images', type=int, default=8, help="서로 다른 합성 이미지 수")
+    parser.add_argument('--latency', type=float, default=0.0, help="COM 호출마다 더할 지연(초)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="결과 JSON 경로 (기본: benchmark_<커밋>.json)")
+    parser.add_argument('--compare', help="비교할 이전 결과 JSON")
+    parser.add_argument('--keep', action='store_true', help="생성한 템플릿·출력 파일을 지우지 않음")
+    parser.add_argument('--run-case', help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', help=argparse.SUPPRESS)
+    parser.add_argument('--result-file', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    if args.run_case:
+        result = run_case(json.loads(args.run_case), args.workdir)
+        with open(args.result_file, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False)
+        return 0
+
+    commit = git_commit()
+    meta = {'commit': commit, 'python': platform.python_version(), 'platform': platform.platform(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'fields': args.fields, 'image_slots': args.image_slots, 'image_ratio': args.image_ratio,
+            'images': args.images, 'latency': args.latency, 'seed': args.seed}
+    base = {'fields': args.fields, 'image_slots': args.image_slots, 'image_ratio': args.image_ratio,
+            'images': args.images, 'latency': args.latency, 'seed': args.seed}
+    cases = []
+    for rows in args.rows:
+        for backend in args.backends:
+            if 'com' in args.engines:
+                cases += [dict(base, backend=backend, mode=mode, rows=rows) for mode in args.modes]
+            if 'native' in args.engines:
+                # 네이티브 엔진은 개별 저장만 지원
+                cases += [dict(base, backend=backend, mode='individual', rows=rows, engine='native',
+                               compression=compression, threads=args.deflate_threads)
+                          for compression in args.compression]
+    results = []
+    root = tempfile.mkdtemp(prefix="yongmerge_bench_")
+    try:
+        for number, case in enumerate(cases):
+            label, mode, rows = case_label(case), case['mode'], case['rows']
+            workdir = os.path.join(root, f"{number}_{case['backend']}_{mode}_{rows}")
+            result = _run_case_subprocess(case, workdir)
+            results.append(result)
+            if 'error' in result:
+                print(f"{label:<14}{mode:<12}{rows:>8}  실패: {result['error'].strip().splitlines()[-1:]}")
+            else:
+                rss = f"{result['peak_rss'] / 1048576:.0f}MB" if result['peak_rss'] else "-"
+                print(f"{label:<14}{mode:<12}{rows:>8}  {result['rows_per_sec']:>9.1f} 행/초  "
+                      f"RSS {rss:>6}  출력 {result['output_bytes'] / 1024:.0f}KB  "
+                      f"COM {result['com_calls']}회")
+            if not args.keep:
+                shutil.rmtree(workdir, ignore_errors=True)
+    finally:
+        if args.keep:
+            print(f"작업 폴더: {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+    report = {'meta': meta, 'results': results}
+    output = args.output or f"benchmark_{(commit or 'local')[:12]}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {output}")
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print(compare(json.load(f), report))
+    return 1 if any('error' in r for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""문서 프로그램(한글·Word·PowerPoint) COM 객체 생성.
+
+엔진은 win32com을 직접 부르지 않고 이 모듈을 거쳐 인스턴스를 얻습니다.
+use_factory()로 생성 함수를 바꾸면 fake_com의 가짜 객체로 Windows·Office 없이 엔진을 실행할 수 있습니다.
+"""
+import threading
+from contextlib import contextmanager
+
+try:
+    import win32com.client as _win32
+except ImportError:  # Windows가 아니거나 pywin32가 없는 환경
+    _win32 = None
+
+# 교체된 생성 함수: factory(prog_id) -> COM 객체 (None이면 win32com 사용)
+_factory = None
+_factory_lock = threading.Lock()
+
+
+def set_factory(factory):
+    """COM 객체 생성 함수를 바꿉니다 (None이면 win32com으로 되돌림)."""
+    global _factory
+    with _factory_lock:
+        _factory = factory
+
+
+def get_factory():
+    return _factory
+
+
+@contextmanager
+def use_factory(factory):
+    """with 블록 안에서만 factory로 COM 객체를 만듭니다."""
+    previous = _factory
+    set_factory(factory)
+    try:
+        yield factory
+    finally:
+        set_factory(previous)
+
+
+def available():
+    """문서 프로그램 인스턴스를 만들 수 있는지 (win32com 또는 교체된 생성 함수)."""
+    return _factory is not None or _win32 is not None
+
+
+def dispatch(prog_id):
+    """새 인스턴스를 별도 프로세스로 생성합니다 (DispatchEx)."""
+    if _factory is not None:
+        return _factory(prog_id)
+    if _win32 is None:
+        raise RuntimeError(f"COM을 사용할 수 없습니다 (Windows와 pywin32 필요): {prog_id}")
+    return _win32.DispatchEx(prog_id)
+
+
+def get_active(prog_id):
+    """실행 중인 인스턴스를 가져옵니다 (가짜 객체를 쓰는 중에는 항상 새로 생성하도록 실패)."""
+    if _factory is not None:
+        raise RuntimeError(f"실행 중인 인스턴스 없음: {prog_id}")
+    if _win32 is None:
+        raise RuntimeError(f"COM을 사용할 수 없습니다 (Windows와 pywin32 필요): {prog_id}")
+    return _win32.GetActiveObject(prog_id)
+
+
+def co_initialize():
+    """현재 스레드의 COM 초기화 (pywin32가 없으면 아무것도 하지 않음)."""
+    try:
+        import pythoncom
+    except ImportError:
+        return False
+    pythoncom.CoInitialize()
+    return True
+
+
+def co_uninitialize():
+    try:
+        import pythoncom
+    except ImportError:
+        return
+    pythoncom.CoUninitialize()
@@ -0,0 +1,206 @@
+import json
+import time
+import threading
+
+# 지연 시간 히스토그램 구간 (상한, 초)
+LATENCY_BUCKETS = (1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0, float('inf'))
+LATENCY_LABELS = ('<10us', '<100us', '<1ms', '<10ms', '<100ms', '<1s', '>=1s')
+
+# COM 객체가 아닌 일반 값 (감싸지 않고 그대로 반환)
+_PLAIN_TYPES = (str, bytes, int, float, bool, type(None), tuple, list, dict)
+
+# 스레드별 현재 통계 (활성화된 스레드에서만 get_*_instance가 프록시를 반환)
+_local = threading.local()
+
+
+class ComCallStats:
+    """COM 멤버별 호출 횟수, 누적·최대 시간, 지연 시간 히스토그램."""
+
+    def __init__(self):
+        self.members = {}
+        self._lock = threading.Lock()
+
+    def record(self, member, seconds):
+        bucket = next(i for i, bound in enumerate(LATENCY_BUCKETS) if seconds < bound)
+        with self._lock:
+            entry = self.members.get(member)
+            if entry is None:
+                entry = self.members[member] = {'count': 0, 'total': 0.0, 'max': 0.0,
+                                                'histogram': [0] * len(LATENCY_BUCKETS)}
+            entry['count'] += 1
+            entry['total'] += seconds
+            entry['max'] = max(entry['max'], seconds)
+            entry['histogram'][bucket] += 1
+
+    def merge(self, members):
+        """다른 프로세스에서 모은 members dict를 합칩니다."""
+        with self._lock:
+            for member, other in members.items():
+                entry = self.members.setdefault(member, {'count': 0, 'total': 0.0, 'max': 0.0,
+                                                         'histogram': [0] * len(LATENCY_BUCKETS)})
+                entry['count'] += other['count']
+                entry['total'] += other['total']
+                entry['max'] = max(entry['max'], other['max'])
+                entry['histogram'] = [a + b for a, b in zip(entry['histogram'], other['histogram'])]
+
+    def total_calls(self):
+        return sum(entry['count'] for entry in self.members.values())
+
+    def total_seconds(self):
+        return sum(entry['total'] for entry in self.members.values())
+
+    def top(self, limit=20):
+        """호출 횟수가 많은 순서로 [(멤버, entry), ...]를 반환합니다."""
+        with self._lock:
+            items = list(self.members.items())
+        items.sort(key=lambda item: (-item[1]['count'], -item[1]['total']))
+        return items[:limit]
+
+    def report(self, limit=20):
+        lines = [f"COM 호출 {self.total_calls()}회, {self.total_seconds():.3f}초 (상위 {limit}개 멤버)",
+                 f"{'횟수':>8} {'합계ms':>10} {'평균ms':>8} {'최대ms':>8}  멤버"]
+        for member, entry in self.top(limit):
+            lines.append(f"{entry['count']:>8} {entry['total'] * 1000:>10.1f} "
+                         f"{entry['total'] / entry['count'] * 1000:>8.2f} {entry['max'] * 1000:>8.2f}  {member}")
+        return "\n".join(lines)
+
+    def to_dict(self, limit=None):
+        members = self.top(limit if limit is not None else len(self.members))
+        return {
+            'total_calls': self.total_calls(),
+            'total_seconds': round(self.total_seconds(), 6),
+            'buckets': list(LATENCY_LABELS),
+            'members': [dict(member=member, count=entry['count'], total=round(entry['total'], 6),
+                             max=round(entry['max'], 6), histogram=entry['histogram'])
+                        for member, entry in members],
+        }
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        return path
+
+
+def _unwrap(value):
+    return object.__getattribute__(value, '_obj') if isinstance(value, ComProxy) else value
+
+
+def _short(path):
+    """결과 객체 경로는 마지막 두 단계만 유지 (예: 'Presentations.Open()', 'Slides[].Shapes[]')."""
+    return ".".join(path.split(".")[-2:])
+
+
+def _is_com_object(value):
+    return hasattr(value, '_oleobj_')
+
+
+def _wrap_value(value, path, stats):
+    if isinstance(value, _PLAIN_TYPES) or isinstance(value, ComProxy):
+        return value
+    return ComProxy(value, path, stats)
+
+
+class ComProxy:
+    """COM 객체를 감싸 속성 읽기·쓰기와 메서드 호출(프로세스 간 왕복)마다 시간을 기록합니다.
+
+    반환된 하위 객체(XHwpWindows, Slides의 각 항목 등)도 다시 감싸므로
+    'Slides[].Shapes[].HasTextFrame'처럼 접근 경로별로 집계됩니다.
+    """
+    __slots__ = ('_obj', '_path', '_stats')
+
+    def __init__(self, obj, path, stats):
+        object.__setattr__(self, '_obj', obj)
+        object.__setattr__(self, '_path', path)
+        object.__setattr__(self, '_stats', stats)
+
+    def __getattr__(self, name):
+        obj, path, stats = self._obj, self._path, self._stats
+        member = f"{path}.{name}"
+        start = time.perf_counter()
+        value = getattr(obj, name)
+        if callable(value) and not _is_com_object(value):
+            # 메서드는 호출할 때 왕복이 일어남
+            return _ComMethod(value, member, stats)
+        stats.record(member, time.perf_counter() - start)
+        return _wrap_value(value, member, stats)
+
+    def __setattr__(self, name, value):
+        start = time.perf_counter()
+        setattr(self._obj, name, _unwrap(value))
+        self._stats.record(f"{self._path}.{name}=", time.perf_counter() - start)
+
+    def __call__(self, *args, **kwargs):
+        return _ComMethod(self._obj, self._path, self._stats)(*args, **kwargs)
+
+    def __iter__(self):
+        member = f"{self._path}[]"
+        iterator = iter(self._obj)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self._stats.record(member, time.perf_counter() - start)
+            yield _wrap_value(item, _short(member), self._stats)
+
+    def __getitem__(self, key):
+        member = f"{self._path}[]"
+        start = time.perf_counter()
+        item = self._obj[key]
+        self._stats.record(member, time.perf_counter() - start)
+        return _wrap_value(item, _short(member), self._stats)
+
+    def __len__(self):
+        start = time.perf_counter()
+        length = len(self._obj)
+        self._stats.record(f"{self._path}.__len__", time.perf_counter() - start)
+        return length
+
+    def __bool__(self):
+        return bool(self._obj)
+
+    def __eq__(self, other):
+        return self._obj == _unwrap(other)
+
+    def __hash__(self):
+        return hash(self._obj)
+
+    def __repr__(self):
+        return f"<ComProxy {self._path}: {self._obj!r}>"
+
+
+class _ComMethod:
+    __slots__ = ('_method', '_member', '_stats')
+
+    def __init__(self, method, member, stats):
+        self._method = method
+        self._member = member
+        self._stats = stats
+
+    def __call__(self, *args, **kwargs):
+        args = tuple(_unwrap(arg) for arg in args)
+        kwargs = {key: _unwrap(value) for key, value in kwargs.items()}
+        start = time.perf_counter()
+        try:
+            result = self._method(*args, **kwargs)
+        finally:
+            self._stats.record(self._member, time.perf_counter() - start)
+        return _wrap_value(result, _short(self._member + "()"), self._stats)
+
+
+def activate(stats):
+    """현재 스레드에서 만드는 문서 프로그램 인스턴스를 stats로 계측합니다 (None이면 해제)."""
+    _local.stats = stats
+
+
+def current():
+    return getattr(_local, 'stats', None)
+
+
+def wrap(app, name):
+    """get_*_instance가 반환하는 COM 객체 - 계측이 켜져 있으면 프록시로 감쌉니다."""
+    stats = current()
+    if stats is None or app is None:
+        return app
+    return ComProxy(app, name, stats)
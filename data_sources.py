@@ -0,0 +1,187 @@
+import os
+import time
+import codecs
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+import pandas as pd
+
+# 확장자별 데이터 소스 형식
+DATA_SOURCE_FORMATS = {
+    '.xlsx': 'xlsx',
+    '.xlsm': 'xlsx',
+    '.csv': 'csv',
+    '.tsv': 'csv',
+    '.txt': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'feather',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.db': 'sqlite',
+    '.sqlite': 'sqlite',
+    '.sqlite3': 'sqlite',
+}
+
+# 파일 선택 다이얼로그용 필터
+DATA_FILE_FILTER = (
+    "Data Files (*.xlsx *.xlsm *.csv *.tsv *.txt *.parquet *.pq *.feather *.arrow *.jsonl *.ndjson *.db *.sqlite *.sqlite3);;"
+    "Excel Files (*.xlsx *.xlsm);;"
+    "CSV Files (*.csv *.tsv *.txt);;"
+    "Parquet / Feather (*.parquet *.pq *.feather *.arrow);;"
+    "JSON Lines (*.jsonl *.ndjson);;"
+    "SQLite (*.db *.sqlite *.sqlite3)"
+)
+
+# 인코딩 판별에 사용할 앞부분 크기
+_ENCODING_SAMPLE_SIZE = 256 * 1024
+
+
+def get_data_format(file_path):
+    """파일 확장자로 데이터 소스 형식을 반환합니다. 지원하지 않으면 빈 문자열."""
+    ext = os.path.splitext(file_path)[1].lower()
+    return DATA_SOURCE_FORMATS.get(ext, '')
+
+
+def detect_csv_encoding(file_path):
+    """CSV 파일의 인코딩을 판별합니다 (BOM → UTF-8 → CP949 순서).
+
+    한국어 엑셀에서 저장한 CSV는 CP949 또는 UTF-8(BOM)인 경우가 대부분입니다.
+    """
+    with open(file_path, 'rb') as f:
+        sample = f.read(_ENCODING_SAMPLE_SIZE)
+
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if sample.startswith(codecs.BOM_UTF16_LE) or sample.startswith(codecs.BOM_UTF16_BE):
+        return 'utf-16'
+
+    # 샘플 끝에서 멀티바이트 문자가 잘릴 수 있으므로 증분 디코더 사용
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    try:
+        codecs.getincrementaldecoder('cp949')().decode(sample, final=False)
+        return 'cp949'
+    except UnicodeDecodeError:
+        # 판별 불가 시 UTF-8로 읽고 깨진 문자는 치환 (encoding_errors='replace')
+        return 'utf-8'
+
+
+def _csv_separator(file_path):
+    """.tsv와 .txt(엑셀 '텍스트 (탭으로 분리)' 저장 형식)는 탭, 그 외는 쉼표로 구분합니다."""
+    return '\t' if os.path.splitext(file_path)[1].lower() in ('.tsv', '.txt') else ','
+
+
+def normalize_dataframe(dataframe):
+    """엔진이 사용하는 형태(object 타입, 결측값은 None)로 변환합니다."""
+    return dataframe.astype(object).where(pd.notna, None)
+
+
+def load_xlsx(file_path):
+    try:
+        # python-calamine이 설치되어 있으면 openpyxl보다 훨씬 빠르게 읽음
+        import python_calamine  # noqa: F401
+        return pd.read_excel(file_path, engine='calamine')
+    except ImportError:
+        return pd.read_excel(file_path)
+
+
+def load_csv(file_path, encoding=None):
+    """CSV를 문자열 그대로 읽습니다 (학번 등의 앞자리 0 보존)."""
+    encoding = encoding or detect_csv_encoding(file_path)
+    dataframe = pd.read_csv(
+        file_path,
+        sep=_csv_separator(file_path),
+        encoding=encoding,
+        encoding_errors='replace',
+        dtype=str,
+        na_filter=False,
+    )
+    # 빈 문자열은 결측값으로 처리 (normalize_dataframe에서 None으로 변환)
+    return dataframe.mask(dataframe == '')
+
+
+def load_parquet(file_path):
+    return pd.read_parquet(file_path)
+
+
+def load_feather(file_path):
+    return pd.read_feather(file_path)
+
+
+def load_jsonl(file_path):
+    return pd.read_json(file_path, lines=True, dtype=False, encoding='utf-8')
+
+
+def _connect_sqlite(file_path):
+    """SQLite 파일을 읽기 전용으로 엽니다."""
+    uri = Path(os.path.abspath(file_path)).as_uri() + "?mode=ro"
+    return closing(sqlite3.connect(uri, uri=True))
+
+
+def list_sqlite_tables(file_path):
+    """SQLite 파일의 테이블/뷰 이름 목록을 반환합니다."""
+    with _connect_sqlite(file_path) as conn:
+        rows = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'view') "
+            "AND name NOT LIKE 'sqlite_%' ORDER BY name"
+        ).fetchall()
+    return [r[0] for r in rows]
+
+
+def _sqlite_query(table=None, query=None):
+    if query:
+        return query
+    if not table:
+        raise ValueError("SQLite 테이블 이름 또는 쿼리가 필요합니다.")
+    return 'SELECT * FROM "{}"'.format(table.replace('"', '""'))
+
+
+def load_sqlite(file_path, table=None, query=None):
+    """SQLite 테이블 또는 SELECT 쿼리 결과를 읽습니다 (읽기 전용 연결)."""
+    with _connect_sqlite(file_path) as conn:
+        return pd.read_sql_query(_sqlite_query(table, query), conn)
+
+
+def load_data_source(file_path, table=None, query=None, encoding=None):
+    """데이터 파일을 DataFrame으로 읽고 (DataFrame, 로드 정보)를 반환합니다.
+
+    로드 정보에는 형식, 행/열 수, 소요 시간(초)이 포함되어 형식별 속도를 비교할 수 있습니다.
+    """
+    data_format = get_data_format(file_path)
+    if not data_format:
+        raise ValueError(f"지원하지 않는 데이터 형식입니다: {os.path.basename(file_path)}")
+
+    start = time.perf_counter()
+    if data_format == 'xlsx':
+        dataframe = load_xlsx(file_path)
+    elif data_format == 'csv':
+        encoding = encoding or detect_csv_encoding(file_path)
+        dataframe = load_csv(file_path, encoding)
+    elif data_format == 'parquet':
+        dataframe = load_parquet(file_path)
+    elif data_format == 'feather':
+        dataframe = load_feather(file_path)
+    elif data_format == 'jsonl':
+        dataframe = load_jsonl(file_path)
+    else:
+        dataframe = load_sqlite(file_path, table, query)
+
+    dataframe = normalize_dataframe(dataframe)
+    dataframe.columns = [str(c) for c in dataframe.columns]
+    elapsed = time.perf_counter() - start
+
+    info = {
+        'format': data_format,
+        'encoding': encoding if data_format == 'csv' else None,
+        'rows': len(dataframe),
+        'columns': len(dataframe.columns),
+        'seconds': elapsed,
+    }
+    print(f"DEBUG: 데이터 로드 완료 ({data_format}) - {info['rows']}행 x {info['columns']}열, {elapsed:.3f}초")
+    return dataframe, info
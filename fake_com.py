@@ -0,0 +1,1049 @@
+"""Windows·Office 없이 엔진을 실행하기 위한 한글·Word·PowerPoint 가짜 COM 객체.
+
+    import com_factory, fake_com
+    factory = fake_com.FakeComFactory(latency=0.002)
+    with com_factory.use_factory(factory):
+        hwp_automation.process_hwp_template(df, "letter.hwp", "individual", None)
+    print(factory.calls.most_common(10))
+
+문서·필드·스토리 범위·도형을 메모리에서 흉내 내고, 밑줄로 시작하지 않는 멤버에 접근할 때마다
+프로세스 간 왕복 한 번으로 세어 지연 시간(latency, 멤버별 latencies)을 적용합니다.
+저장한 문서는 JSON이며 다시 열거나 InsertFile로 합칠 수 있습니다. 템플릿은 write_template()으로 만들거나
+실제 .docx/.pptx/.hwpx 파일의 텍스트와 누름틀을 읽어 씁니다 (바이너리 .hwp는 읽지 못함).
+"""
+import re
+import copy
+import json
+import time
+import zipfile
+import threading
+import collections
+import xml.etree.ElementTree as ET
+
+# 템플릿 텍스트의 {{필드}} (한글 누름틀로 변환)
+FIELD_RE = re.compile(r'\{\{([^{}]+)\}\}')
+# Word 스토리 텍스트에서 인라인 그림 위치
+PICTURE_MARK = '\x01'
+# 한글 GetFieldList 구분자
+FIELD_SEPARATOR = '\x02'
+
+
+class FakeComError(Exception):
+    """가짜 COM 호출 실패 (실제 COM의 com_error에 해당)."""
+
+
+# ---------------------------------------------------------------------------
+# 공통: 왕복 횟수와 지연 시간
+
+class _FakeObject:
+    """밑줄로 시작하지 않는 멤버 읽기·쓰기를 한 번의 COM 왕복으로 세는 기반 클래스."""
+    _com_name = 'Object'
+
+    def __init__(self, app):
+        object.__setattr__(self, '_app', app)
+
+    def __getattribute__(self, name):
+        if not name.startswith('_'):
+            com_name = object.__getattribute__(self, '_com_name')
+            object.__getattribute__(self, '_app')._round_trip(f"{com_name}.{name}")
+        return object.__getattribute__(self, name)
+
+    def __setattr__(self, name, value):
+        if not name.startswith('_'):
+            self._app._round_trip(f"{self._com_name}.{name}=")
+        object.__setattr__(self, name, value)
+
+
+class _FakeApp(_FakeObject):
+    _prog_id = None
+
+    def __init__(self, latency=0.0, latencies=None):
+        object.__setattr__(self, '_app', self)
+        self._latency = latency
+        self._latencies = latencies or {}
+        self._calls = collections.Counter()
+        self._lock = threading.Lock()
+        self._quit = False
+
+    def _round_trip(self, member):
+        with self._lock:
+            self._calls[member] += 1
+        delay = self._latencies.get(member, self._latencies.get(member.split('.', 1)[-1], self._latency))
+        if delay:
+            time.sleep(delay)
+
+
+class _FakeCollection(_FakeObject):
+    """Count, Item(), 순회를 지원하는 컬렉션 (순회 항목마다 왕복 한 번)."""
+    _com_name = 'Collection'
+    _base = 1  # Office 컬렉션은 1부터, 한글 XHwpDocuments는 0부터
+
+    def __init__(self, app, items_getter, com_name=None, base=None):
+        super().__init__(app)
+        self._items = items_getter
+        if com_name:
+            self._com_name = com_name
+        if base is not None:
+            self._base = base
+
+    @property
+    def Count(self):
+        return len(self._items())
+
+    def Item(self, index):
+        return self._items()[index - self._base]
+
+    def __iter__(self):
+        # 순회 중에 항목이 추가·삭제되어도 시작 시점 목록 기준 (COM 열거자와 같음)
+        for item in list(self._items()):
+            self._app._round_trip(f"{self._com_name}[]")
+            yield item
+
+    def __len__(self):
+        return len(self._items())
+
+
+# ---------------------------------------------------------------------------
+# 문서 파일 읽기·쓰기
+
+def _local(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def _text_to_segments(text):
+    """'{{이름}}'을 누름틀로 바꾼 한글 문서 구간 목록."""
+    segments, pos = [], 0
+    for match in FIELD_RE.finditer(text):
+        if match.start() > pos:
+            segments.append({'text': text[pos:match.start()]})
+        segments.append({'field': match.group(1), 'text': '', 'images': []})
+        pos = match.end()
+    if pos < len(text):
+        segments.append({'text': text[pos:]})
+    return segments
+
+
+def _paragraph_texts(root):
+    paragraphs = []
+    for p in root.iter():
+        if _local(p.tag) == 'p':
+            paragraphs.append("".join(t.text or "" for t in p.iter() if _local(t.tag) == 't'))
+    return paragraphs
+
+
+def _read_docx(archive):
+    stories = []
+    for name in sorted(archive.namelist()):
+        if name == 'word/document.xml':
+            story_type = 1   # wdMainTextStory
+        elif re.match(r'word/header\d*\.xml$', name):
+            story_type = 7   # wdPrimaryHeaderStory
+        elif re.match(r'word/footer\d*\.xml$', name):
+            story_type = 9   # wdPrimaryFooterStory
+        else:
+            continue
+        text = "\r".join(_paragraph_texts(ET.fromstring(archive.read(name))))
+        stories.append({'type': story_type, 'text': text, 'images': []})
+    stories.sort(key=lambda story: story['type'])
+    return {'kind': 'word', 'stories': stories}
+
+
+def _read_pptx(archive):
+    slide_names = sorted((n for n in archive.namelist() if re.match(r'ppt/slides/slide\d+\.xml$', n)),
+                         key=lambda n: int(re.search(r'(\d+)\.xml$', n).group(1)))
+    slides = []
+    for name in slide_names:
+        shapes = []
+        for element in ET.fromstring(archive.read(name)).iter():
+            kind = _local(element.tag)
+            if kind not in ('sp', 'pic'):
+                continue
+            box = {'left': 0.0, 'top': 0.0, 'width': 100.0, 'height': 100.0}
+            for child in element.iter():
+                if _local(child.tag) == 'off':
+                    box['left'] = int(child.get('x', 0)) / 12700
+                    box['top'] = int(child.get('y', 0)) / 12700
+                elif _local(child.tag) == 'ext' and child.get('cx'):
+                    box['width'] = int(child.get('cx')) / 12700
+                    box['height'] = int(child.get('cy')) / 12700
+            tx_body = next((c for c in element.iter() if _local(c.tag) == 'txBody'), None)
+            text = "\r".join(_paragraph_texts(tx_body)) if tx_body is not None else None
+            shapes.append(dict(box, text=text, picture=None if kind == 'sp' else ''))
+        slides.append({'shapes': shapes})
+    return {'kind': 'ppt', 'slides': slides}
+
+
+def _read_hwpx(archive):
+    segments = []
+    sections = sorted(n for n in archive.namelist() if re.match(r'Contents/section\d+\.xml$', n))
+    for name in sections:
+        field = None
+        for element in ET.fromstring(archive.read(name)).iter():
+            kind = _local(element.tag)
+            if kind == 'fieldBegin' and element.get('type', 'CLICK_HERE') == 'CLICK_HERE':
+                field = {'field': element.get('name', ''), 'text': '', 'images': []}
+                segments.append(field)
+            elif kind == 'fieldEnd':
+                field = None
+            elif kind == 't' and element.text:
+                if field is not None:
+                    field['text'] += element.text
+                else:
+                    segments.extend(_text_to_segments(element.text))
+    return {'kind': 'hwp', 'segments': segments}
+
+
+def load_document(path):
+    """가짜 COM이 저장한 JSON 또는 실제 .docx/.pptx/.hwpx에서 문서 모델을 읽습니다."""
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            names = set(archive.namelist())
+            if 'word/document.xml' in names:
+                return _read_docx(archive)
+            if any(n.startswith('ppt/slides/') for n in names):
+                return _read_pptx(archive)
+            if any(n.startswith('Contents/section') for n in names):
+                return _read_hwpx(archive)
+        raise FakeComError(f"지원하지 않는 문서 형식: {path}")
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise FakeComError(f"문서를 열 수 없습니다: {path} ({e})")
+    if not isinstance(data, dict) or 'kind' not in data:
+        raise FakeComError(f"가짜 COM 문서가 아닙니다: {path}")
+    return data
+
+
+def save_document(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+# write_template의 Word 영역 이름 -> StoryType (본문, 첫 머리글, 첫 바닥글)
+_WORD_STORY_TYPES = {'main': 1, 'header': 7, 'footer': 9}
+
+
+def write_template(path, kind, content):
+    """벤치마크·테스트용 템플릿을 만듭니다.
+
+    kind='hwp'·'word'는 '{{필드}}'가 들어 있는 텍스트(한글은 누름틀로 변환),
+    Word는 {'main': 본문, 'header': 머리글, 'footer': 바닥글} dict도 받습니다.
+    kind='ppt'는 슬라이드별 텍스트 상자 목록(예: [["{{이름}}", "{{IMAGE}}"]])입니다.
+    """
+    if kind == 'hwp':
+        data = {'kind': 'hwp', 'segments': _text_to_segments(content)}
+    elif kind == 'word':
+        parts = content if isinstance(content, dict) else {'main': content}
+        data = {'kind': 'word', 'stories': [
+            {'type': _WORD_STORY_TYPES[part], 'text': parts[part].replace("\n", "\r"), 'images': []}
+            for part in ('main', 'header', 'footer') if part in parts]}
+    elif kind == 'ppt':
+        data = {'kind': 'ppt', 'slides': [
+            {'shapes': [{'text': text, 'picture': None, 'left': 50.0, 'top': 50.0 + 120 * i,
+                         'width': 300.0, 'height': 100.0} for i, text in enumerate(slide)]}
+            for slide in content]}
+    else:
+        raise ValueError(f"알 수 없는 문서 종류: {kind}")
+    save_document(path, data)
+    return path
+
+
+# ---------------------------------------------------------------------------
+# 한글 (HWPFrame.HwpObject)
+
+class _HwpParameterSet(_FakeObject):
+    _com_name = 'HParameterSet'
+
+    def __init__(self, app, name):
+        super().__init__(app)
+        self._name = name
+        self._values = {}
+
+    @property
+    def HSet(self):
+        return self
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self._values.get(name)
+
+    def __setattr__(self, name, value):
+        if name.startswith('_'):
+            object.__setattr__(self, name, value)
+        else:
+            self._app._round_trip(f"{self._com_name}.{name}=")
+            self._values[name] = value
+
+
+class _HwpParameterSets(_FakeObject):
+    _com_name = 'HParameterSet'
+
+    def __init__(self, app):
+        super().__init__(app)
+        self._sets = {}
+
+    def _get(self, name):
+        if name not in self._sets:
+            self._sets[name] = _HwpParameterSet(self._app, name)
+        return self._sets[name]
+
+    @property
+    def HFindReplace(self):
+        return self._get('HFindReplace')
+
+    @property
+    def HInsertFile(self):
+        return self._get('HInsertFile')
+
+
+class _HwpAction(_FakeObject):
+    _com_name = 'HAction'
+
+    def GetDefault(self, action, parameter_set):
+        parameter_set._values.clear()
+        return True
+
+    def Execute(self, action, parameter_set):
+        values = parameter_set._values
+        if action == 'RepeatFind':
+            return self._app._find(values.get('FindString') or '')
+        if action == 'InsertFile':
+            return self._app._insert_file(values.get('filename'))
+        raise FakeComError(f"지원하지 않는 HAction.Execute: {action}")
+
+    def Run(self, action):
+        return self._app._run(action)
+
+
+class _HwpWindow(_FakeObject):
+    _com_name = 'XHwpWindow'
+
+    def __init__(self, app):
+        super().__init__(app)
+        self._visible = True
+
+    @property
+    def Visible(self):
+        return self._visible
+
+    @Visible.setter
+    def Visible(self, value):
+        self._visible = bool(value)
+
+
+class _HwpWindows(_FakeCollection):
+    _com_name = 'XHwpWindows'
+    _base = 0
+
+    def __init__(self, app):
+        super().__init__(app, lambda: [self._window])
+        self._window = _HwpWindow(app)
+
+    @property
+    def Active_XHwpWindow(self):
+        return self._window
+
+
+class FakeHwpDocument(_FakeObject):
+    _com_name = 'XHwpDocument'
+
+    def __init__(self, app, data=None, path=None):
+        super().__init__(app)
+        self._data = data or {'kind': 'hwp', 'segments': []}
+        self._path = path
+
+    @property
+    def Path(self):
+        return self._path or ""
+
+    def SetActive(self):
+        self._app._active = self._app._documents.index(self)
+        return True
+
+    def Close(self, option=0):
+        self._app._close_document(self)
+        return True
+
+
+class FakeHwp(_FakeApp):
+    """한글 자동화 객체. 누름틀, 찾기·삭제, 그림 삽입, 파일 끼워 넣기, 복사·붙여넣기를 흉내 냅니다."""
+    _com_name = 'Hwp'
+    _prog_id = 'HWPFrame.HwpObject'
+
+    def __init__(self, latency=0.0, latencies=None):
+        super().__init__(latency, latencies)
+        self._visible = False
+        self._windows = _HwpWindows(self)
+        self._parameter_sets = _HwpParameterSets(self)
+        self._action = _HwpAction(self)
+        self._documents = [FakeHwpDocument(self)]
+        self._active = 0
+        self._cursor = (0, 0)        # (구간 번호, 구간 안의 위치)
+        self._selection = None       # (구간 번호, 시작, 끝) 또는 ('field', 구간 번호)
+        self._clipboard = None
+
+    # --- 내부 문서 조작 ---
+    def _segments(self):
+        return self._documents[self._active]._data['segments']
+
+    def _close_document(self, document):
+        self._documents.remove(document)
+        if not self._documents:
+            self._documents.append(FakeHwpDocument(self))
+        self._active = min(self._active, len(self._documents) - 1)
+
+    def _find(self, text):
+        """커서 뒤에서 text를 찾아 선택합니다."""
+        if not text:
+            return False
+        segments = self._segments()
+        start_index, start_offset = self._cursor
+        for index in range(start_index, len(segments)):
+            found = segments[index].get('text', '').find(text, start_offset if index == start_index else 0)
+            if found >= 0:
+                self._selection = (index, found, found + len(text))
+                self._cursor = (index, found + len(text))
+                return True
+        return False
+
+    def _insert_segments(self, new_segments):
+        segments = self._segments()
+        index, offset = self._cursor
+        if index < len(segments) and 'field' not in segments[index] and offset:
+            # 텍스트 구간 가운데면 둘로 나눈 뒤 삽입
+            text = segments[index]['text']
+            segments[index:index + 1] = [{'text': text[:offset]}, {'text': text[offset:]}]
+            index += 1
+        segments[index:index] = new_segments
+        self._cursor = (index + len(new_segments), 0)
+
+    def _insert_file(self, path):
+        try:
+            data = load_document(path)
+        except FakeComError:
+            return False
+        self._insert_segments(copy.deepcopy(data.get('segments', [])))
+        return True
+
+    def _run(self, action):
+        segments = self._segments()
+        if action in ('MoveDocEnd', 'MoveBottomLevelEnd', 'MoveTopLevelEnd'):
+            self._cursor = (len(segments), 0)
+        elif action == 'Delete':
+            if self._selection and self._selection[0] != 'field':
+                index, start, end = self._selection
+                text = segments[index]['text']
+                segments[index]['text'] = text[:start] + text[end:]
+                self._cursor = (index, start)
+            self._selection = None
+        elif action == 'SelectAll':
+            self._selection = ('all', None)
+        elif action == 'Copy':
+            if self._selection and self._selection[0] == 'all':
+                self._clipboard = copy.deepcopy(segments)
+        elif action == 'Paste':
+            if self._clipboard:
+                self._insert_segments(copy.deepcopy(self._clipboard))
+        elif action == 'DeleteField':
+            if self._selection and self._selection[0] == 'field':
+                index = self._selection[1]
+                field = segments[index]
+                # 누름틀만 없애고 내용(텍스트·그림)은 남김
+                replacement = [{'text': field['text']}] + [{'image': path} for path in field['images']]
+                segments[index:index + 1] = replacement
+                self._selection = None
+        else:
+            raise FakeComError(f"지원하지 않는 HAction.Run: {action}")
+        return True
+
+    # --- COM 멤버 ---
+    @property
+    def Visible(self):
+        return self._visible
+
+    @Visible.setter
+    def Visible(self, value):
+        self._visible = bool(value)
+
+    @property
+    def XHwpWindows(self):
+        return self._windows
+
+    @property
+    def XHwpDocuments(self):
+        return _FakeCollection(self, lambda: self._documents, 'XHwpDocuments', base=0)
+
+    @property
+    def ActiveDocument(self):
+        return self._documents[self._active]
+
+    @property
+    def HParameterSet(self):
+        return self._parameter_sets
+
+    @property
+    def HAction(self):
+        return self._action
+
+    def RegisterModule(self, module_type, module_name):
+        return True
+
+    def SetMessageBoxMode(self, mode):
+        return 0
+
+    def Clear(self, option=0):
+        # 현재 문서를 닫고 빈 문서로
+        self._documents[self._active] = FakeHwpDocument(self)
+        self._cursor, self._selection = (0, 0), None
+        return True
+
+    def Open(self, path, file_format="", arg=""):
+        try:
+            data = load_document(path)
+        except FakeComError:
+            return False
+        current = self._documents[self._active]
+        document = FakeHwpDocument(self, copy.deepcopy(data), path)
+        if current._path is None and not current._data['segments']:
+            self._documents[self._active] = document
+        else:
+            self._documents.append(document)
+            self._active = len(self._documents) - 1
+        self._cursor, self._selection = (0, 0), None
+        return True
+
+    def SaveAs(self, path, file_format="", arg=""):
+        document = self._documents[self._active]
+        save_document(path, document._data)
+        document._path = path
+        return True
+
+    def Quit(self):
+        self._quit = True
+
+    def MovePos(self, move_id, para=0, pos=0):
+        # 2: 문서 처음(moveTopOfFile), 3: 문서 끝(moveBottomOfFile), 0: 본문 처음
+        self._cursor = (len(self._segments()), 0) if move_id == 3 else (0, 0)
+        self._selection = None
+        return True
+
+    def PutFieldText(self, field_name, text):
+        for segment in self._segments():
+            if segment.get('field') == field_name:
+                segment['text'] = str(text)
+                segment['images'] = []
+
+    def GetFieldText(self, field_name):
+        return FIELD_SEPARATOR.join(s['text'] for s in self._segments() if s.get('field') == field_name)
+
+    def GetFieldList(self, number=0, option=0):
+        names = []
+        for segment in self._segments():
+            name = segment.get('field')
+            if name is not None and name not in names:
+                names.append(name)
+        return FIELD_SEPARATOR.join(names)
+
+    def MoveToField(self, field_name, text=True, start=True, select=False):
+        for index, segment in enumerate(self._segments()):
+            if segment.get('field') == field_name:
+                self._cursor = (index, 0)
+                self._selection = ('field', index)
+                return True
+        return False
+
+    def InsertPicture(self, path, embedded=1, size_option=0, reverse=0, watermark=0, effect=0, width=0, height=0):
+        segments = self._segments()
+        index, _ = self._cursor
+        if index < len(segments) and 'field' in segments[index]:
+            segments[index]['images'].append(path)
+        else:
+            self._insert_segments([{'image': path}])
+        return _HwpCtrl(self)
+
+
+class _HwpCtrl(_FakeObject):
+    """InsertPicture가 반환하는 컨트롤."""
+    _com_name = 'Ctrl'
+
+
+# ---------------------------------------------------------------------------
+# Word (Word.Application)
+
+class _WordStory:
+    """스토리 텍스트와 인라인 그림 (텍스트의 PICTURE_MARK 순서대로 images)."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def replace(self, start, end, value, images=()):
+        text = self.data['text']
+        before = text[:start].count(PICTURE_MARK)
+        removed = text[start:end].count(PICTURE_MARK)
+        self.data['images'][before:before + removed] = list(images)
+        self.data['text'] = text[:start] + value + text[end:]
+
+
+class _WordReplacement(_FakeObject):
+    _com_name = 'Replacement'
+
+    def __init__(self, app):
+        super().__init__(app)
+        object.__setattr__(self, 'Text', "")
+
+    def ClearFormatting(self):
+        pass
+
+
+class _WordFind(_FakeObject):
+    _com_name = 'Find'
+
+    def __init__(self, app, word_range):
+        super().__init__(app)
+        self._range = word_range
+        for name, value in (('Text', ""), ('Forward', True), ('Wrap', 0)):
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, 'Replacement', _WordReplacement(app))
+
+    def ClearFormatting(self):
+        pass
+
+    def Execute(self, FindText=None, *args, Replace=0, **kwargs):
+        text = FindText if FindText is not None else object.__getattribute__(self, 'Text')
+        if not text:
+            return False
+        word_range = self._range
+        story = word_range._story
+        start, end = word_range._start, word_range._end_position()
+        if Replace == 2:  # wdReplaceAll
+            replacement = object.__getattribute__(object.__getattribute__(self, 'Replacement'), 'Text')
+            found = False
+            pos = story.data['text'].find(text, start)
+            while 0 <= pos and pos + len(text) <= end:
+                story.replace(pos, pos + len(text), replacement)
+                end += len(replacement) - len(text)
+                pos = story.data['text'].find(text, pos + len(replacement))
+                found = True
+            return found
+        pos = story.data['text'].find(text, start)
+        if pos < 0 or pos + len(text) > end:
+            return False
+        # 찾은 부분으로 범위를 옮김 (Word와 같음)
+        word_range._start, word_range._end, word_range._whole = pos, pos + len(text), False
+        return True
+
+
+class _WordInlineShape(_FakeObject):
+    _com_name = 'InlineShape'
+
+    def __init__(self, app, path, width, height):
+        super().__init__(app)
+        object.__setattr__(self, '_path', path)
+        object.__setattr__(self, 'Width', width)
+        object.__setattr__(self, 'Height', height)
+
+
+class _WordInlineShapes(_FakeObject):
+    _com_name = 'InlineShapes'
+
+    def __init__(self, app, word_range):
+        super().__init__(app)
+        self._range = word_range
+
+    def AddPicture(self, FileName, LinkToFile=False, SaveWithDocument=True, Range=None):
+        word_range = self._range
+        start = word_range._start
+        word_range._story.replace(start, start, PICTURE_MARK, [FileName])
+        word_range._start = word_range._end = start + 1
+        word_range._whole = False
+        return _WordInlineShape(self._app, FileName, *_picture_size_pt(FileName))
+
+
+def _picture_size_pt(path):
+    """그림 원래 크기(pt) - 읽지 못하면 100 x 100."""
+    try:
+        import image_utils
+        info = image_utils.get_image_info(path)
+        dpi = info.get('dpi') or (96, 96)
+        return info['width'] * 72 / (dpi[0] or 96), info['height'] * 72 / (dpi[1] or 96)
+    except Exception:
+        return 100.0, 100.0
+
+
+class FakeWordRange(_FakeObject):
+    _com_name = 'Range'
+
+    def __init__(self, app, document, story, start=0, end=None):
+        super().__init__(app)
+        self._document = document
+        self._story = story
+        self._start = start
+        self._whole = end is None   # 스토리 전체 범위는 텍스트가 바뀌어도 끝까지 따라감
+        self._end = end or 0
+
+    def _end_position(self):
+        return len(self._story.data['text']) if self._whole else self._end
+
+    @property
+    def Start(self):
+        return self._start
+
+    @property
+    def End(self):
+        return self._end_position()
+
+    @property
+    def StoryType(self):
+        return self._story.data['type']
+
+    @property
+    def Text(self):
+        return self._story.data['text'][self._start:self._end_position()]
+
+    @Text.setter
+    def Text(self, value):
+        end = self._end_position()
+        self._story.replace(self._start, end, str(value))
+        if not self._whole:
+            self._end = self._start + len(str(value))
+
+    @property
+    def Duplicate(self):
+        duplicate = FakeWordRange(self._app, self._document, self._story, self._start)
+        duplicate._whole, duplicate._end = self._whole, self._end
+        return duplicate
+
+    @property
+    def Find(self):
+        return _WordFind(self._app, self)
+
+    @property
+    def InlineShapes(self):
+        return _WordInlineShapes(self._app, self)
+
+    @property
+    def ShapeRange(self):
+        # 텍스트 상자는 흉내 내지 않음
+        return _FakeCollection(self._app, lambda: [], 'ShapeRange')
+
+    @property
+    def NextStoryRange(self):
+        return None
+
+    def Collapse(self, direction=1):
+        # 1: 시작으로(wdCollapseStart), 0: 끝으로(wdCollapseEnd)
+        position = self._start if direction == 1 else self._end_position()
+        self._start = self._end = position
+        self._whole = False
+
+    def InsertBreak(self, break_type=7):
+        self._story.replace(self._start, self._start, "\f")
+        self._start += 1
+        self._end = max(self._end, self._start)
+
+    def InsertFile(self, FileName, *args, **kwargs):
+        data = load_document(FileName)
+        main = next((s for s in data.get('stories', []) if s['type'] == 1), None)
+        if main is None:
+            raise FakeComError(f"본문이 없는 문서: {FileName}")
+        self._story.replace(self._start, self._start, main['text'], main['images'])
+        self._end = self._start + len(main['text'])
+
+
+class FakeWordDocument(_FakeObject):
+    _com_name = 'Document'
+
+    def __init__(self, app, data, path, read_only=False):
+        super().__init__(app)
+        self._data = data
+        self._path = path
+        self._read_only = read_only
+        self._stories = [_WordStory(story) for story in data['stories']]
+
+    def _main(self):
+        return next(s for s in self._stories if s.data['type'] == 1)
+
+    @property
+    def StoryRanges(self):
+        return _FakeCollection(self._app, lambda: [FakeWordRange(self._app, self, s) for s in self._stories],
+                               'StoryRanges')
+
+    @property
+    def Content(self):
+        return FakeWordRange(self._app, self, self._main())
+
+    def Range(self, Start=0, End=None):
+        return FakeWordRange(self._app, self, self._main(), Start, End if End is not None else Start)
+
+    def SaveAs(self, FileName, *args, **kwargs):
+        save_document(FileName, self._data)
+        self._path = FileName
+
+    def SaveAs2(self, FileName, *args, **kwargs):
+        return self.SaveAs(FileName)
+
+    def Close(self, SaveChanges=0):
+        self._app._open_documents.remove(self)
+
+
+class _WordDocuments(_FakeCollection):
+    _com_name = 'Documents'
+
+    def __init__(self, app):
+        super().__init__(app, lambda: app._open_documents)
+
+    def Open(self, FileName, ConfirmConversions=False, ReadOnly=False, AddToRecentFiles=True, **kwargs):
+        data = copy.deepcopy(load_document(FileName))
+        if data['kind'] != 'word':
+            raise FakeComError(f"Word 문서가 아닙니다: {FileName}")
+        document = FakeWordDocument(self._app, data, FileName, ReadOnly)
+        self._app._open_documents.append(document)
+        return document
+
+    def Add(self, Template=None, **kwargs):
+        document = FakeWordDocument(self._app, {'kind': 'word', 'stories': [{'type': 1, 'text': "", 'images': []}]},
+                                    None)
+        self._app._open_documents.append(document)
+        return document
+
+
+class FakeWord(_FakeApp):
+    """Word 자동화 객체. 스토리 범위, 찾기·바꾸기, 인라인 그림, InsertFile을 흉내 냅니다."""
+    _com_name = 'Word'
+    _prog_id = 'Word.Application'
+
+    def __init__(self, latency=0.0, latencies=None):
+        super().__init__(latency, latencies)
+        self._open_documents = []
+        self._documents = _WordDocuments(self)
+        for name, value in (('Visible', False), ('AutomationSecurity', 1), ('DisplayAlerts', -1)):
+            object.__setattr__(self, name, value)
+
+    @property
+    def Documents(self):
+        return self._documents
+
+    def Quit(self, SaveChanges=0):
+        self._open_documents.clear()
+        self._quit = True
+
+
+# ---------------------------------------------------------------------------
+# PowerPoint (PowerPoint.Application)
+
+class _PptTextRange(_FakeObject):
+    _com_name = 'TextRange'
+
+    def __init__(self, app, shape):
+        super().__init__(app)
+        self._shape = shape
+
+    @property
+    def Text(self):
+        return self._shape._data['text'] or ""
+
+    @Text.setter
+    def Text(self, value):
+        self._shape._data['text'] = str(value)
+
+
+class _PptTextFrame(_FakeObject):
+    _com_name = 'TextFrame'
+
+    def __init__(self, app, shape):
+        super().__init__(app)
+        self._shape = shape
+
+    @property
+    def HasText(self):
+        return bool(self._shape._data['text'])
+
+    @property
+    def TextRange(self):
+        return _PptTextRange(self._app, self._shape)
+
+
+class FakePptShape(_FakeObject):
+    _com_name = 'Shape'
+
+    def __init__(self, app, slide, data):
+        super().__init__(app)
+        self._slide = slide
+        self._data = data
+
+    @property
+    def HasTextFrame(self):
+        return self._data['text'] is not None
+
+    @property
+    def TextFrame(self):
+        if self._data['text'] is None:
+            raise FakeComError("텍스트 프레임이 없는 도형입니다.")
+        return _PptTextFrame(self._app, self)
+
+    def _box(name):
+        def getter(self):
+            return self._data[name]
+
+        def setter(self, value):
+            self._data[name] = float(value)
+        return property(getter, setter)
+
+    Left = _box('left')
+    Top = _box('top')
+    Width = _box('width')
+    Height = _box('height')
+    del _box
+
+    def Delete(self):
+        self._slide._shapes.remove(self)
+
+
+class _PptShapes(_FakeCollection):
+    _com_name = 'Shapes'
+
+    def __init__(self, app, slide):
+        super().__init__(app, lambda: slide._shapes)
+        self._slide = slide
+
+    def AddPicture(self, FileName, LinkToFile=0, SaveWithDocument=-1, Left=0, Top=0, Width=-1, Height=-1):
+        width, height = (Width, Height) if Width > 0 and Height > 0 else _picture_size_pt(FileName)
+        shape = FakePptShape(self._app, self._slide, {'text': None, 'picture': FileName, 'left': float(Left),
+                                                      'top': float(Top), 'width': float(width),
+                                                      'height': float(height)})
+        self._slide._shapes.append(shape)
+        return shape
+
+
+class FakePptSlide(_FakeObject):
+    _com_name = 'Slide'
+
+    def __init__(self, app, data):
+        super().__init__(app)
+        self._shapes = [FakePptShape(app, self, shape) for shape in data['shapes']]
+
+    def _to_data(self):
+        return {'shapes': [shape._data for shape in self._shapes]}
+
+    @property
+    def Shapes(self):
+        return _PptShapes(self._app, self)
+
+    def Copy(self):
+        self._app._clipboard = copy.deepcopy(self._to_data())
+
+
+class _PptSlides(_FakeCollection):
+    _com_name = 'Slides'
+
+    def __init__(self, app, presentation):
+        super().__init__(app, lambda: presentation._slides)
+        self._presentation = presentation
+
+    def Paste(self, Index=None):
+        if self._app._clipboard is None:
+            raise FakeComError("클립보드가 비어 있습니다.")
+        slide = FakePptSlide(self._app, copy.deepcopy(self._app._clipboard))
+        slides = self._presentation._slides
+        slides.insert(len(slides) if Index is None else Index - 1, slide)
+        return _FakeCollection(self._app, lambda: [slide], 'SlideRange')
+
+
+class FakePresentation(_FakeObject):
+    _com_name = 'Presentation'
+
+    def __init__(self, app, data, path):
+        super().__init__(app)
+        self._path = path
+        self._slides = [FakePptSlide(app, slide) for slide in data['slides']]
+
+    @property
+    def Slides(self):
+        return _PptSlides(self._app, self)
+
+    def SaveAs(self, FileName, *args, **kwargs):
+        save_document(FileName, {'kind': 'ppt', 'slides': [slide._to_data() for slide in self._slides]})
+        self._path = FileName
+
+    def Close(self):
+        self._app._open_presentations.remove(self)
+
+
+class _PptPresentations(_FakeCollection):
+    _com_name = 'Presentations'
+
+    def __init__(self, app):
+        super().__init__(app, lambda: app._open_presentations)
+
+    def Open(self, FileName, ReadOnly=False, Untitled=False, WithWindow=True):
+        data = load_document(FileName)
+        if data['kind'] != 'ppt':
+            raise FakeComError(f"PowerPoint 문서가 아닙니다: {FileName}")
+        presentation = FakePresentation(self._app, copy.deepcopy(data), None if Untitled else FileName)
+        self._app._open_presentations.append(presentation)
+        return presentation
+
+    def Add(self, WithWindow=True):
+        presentation = FakePresentation(self._app, {'slides': []}, None)
+        self._app._open_presentations.append(presentation)
+        return presentation
+
+
+class FakePowerPoint(_FakeApp):
+    """PowerPoint 자동화 객체. 슬라이드·도형·텍스트 프레임, 그림 추가, 슬라이드 복사·붙여넣기를 흉내 냅니다."""
+    _com_name = 'PowerPoint'
+    _prog_id = 'PowerPoint.Application'
+
+    def __init__(self, latency=0.0, latencies=None):
+        super().__init__(latency, latencies)
+        self._open_presentations = []
+        self._presentations = _PptPresentations(self)
+        self._clipboard = None
+        for name, value in (('Visible', False), ('AutomationSecurity', 1), ('DisplayAlerts', 1)):
+            object.__setattr__(self, name, value)
+
+    @property
+    def Presentations(self):
+        return self._presentations
+
+    def Quit(self):
+        self._open_presentations.clear()
+        self._quit = True
+
+
+# ---------------------------------------------------------------------------
+# 생성 함수
+
+class FakeComFactory:
+    """com_factory.use_factory()에 넘길 생성 함수. 만든 인스턴스와 전체 왕복 횟수를 모아 둡니다.
+
+    latency는 모든 왕복에 적용할 지연 시간(초), latencies는 {'Hwp.Open': 0.3, 'SaveAs': 0.1}처럼
+    멤버별로 덮어쓸 지연 시간입니다.
+    """
+    APPS = {cls._prog_id: cls for cls in (FakeHwp, FakeWord, FakePowerPoint)}
+
+    def __init__(self, latency=0.0, latencies=None):
+        self.latency = latency
+        self.latencies = dict(latencies or {})
+        self.apps = []
+
+    def __call__(self, prog_id):
+        app_class = self.APPS.get(prog_id)
+        if app_class is None:
+            raise FakeComError(f"알 수 없는 ProgID: {prog_id}")
+        app = app_class(self.latency, self.latencies)
+        self.apps.append(app)
+        return app
+
+    @property
+    def calls(self):
+        """모든 인스턴스의 멤버별 왕복 횟수 (collections.Counter)."""
+        total = collections.Counter()
+        for app in self.apps:
+            total.update(app._calls)
+        return total
+
+    def total_calls(self):
+        return sum(self.calls.values())
@@ -1,27 +1,24 @@
 import os
 import time
-import win32com.client
-from win32com.client import dynamic
-import pythoncom
-import pandas as pd
+import com_factory
 import tempfile
 import uuid
 import traceback
 import shutil
 import image_utils
-
-try:
-    from PIL import Image
-except ImportError:
-    Image = None
+import image_pipeline
+import row_values
+import template_inspector
+import job_trace
+import com_probe
 
 def ensure_hwp_app():
     """기존 HWP 인스턴스를 얻거나 새로 띄운다."""
     try:
-        return win32com.client.GetActiveObject("HWPFrame.HwpObject")
+        return com_factory.get_active("HWPFrame.HwpObject")
     except Exception:
         try:
-            return win32com.client.DispatchEx("HWPFrame.HwpObject")
+            return com_factory.dispatch("HWPFrame.HwpObject")
         except Exception as err:
             print(f"DEBUG: HWP 인스턴스 확보 실패: {err}")
             raise
@@ -30,9 +27,10 @@ def get_hwp_instance():
     """HWP 인스턴스를 가져오거나 생성합니다."""
     hwp = None
     try:
-        hwp = ensure_hwp_app()
-        print("DEBUG: 새 HWP 인스턴스를 생성했습니다.")
-        time.sleep(2)
+        with job_trace.span('acquire'):
+            hwp = ensure_hwp_app()
+            print("DEBUG: 새 HWP 인스턴스를 생성했습니다.")
+            time.sleep(2)
     except Exception as e:
         raise Exception(f"HWP 인스턴스 생성 실패: {e}")
     
@@ -54,7 +52,8 @@ def get_hwp_instance():
         except Exception as e:
             print(f"DEBUG: HWP 메시지 모드 설정: {e}")
 
-    return hwp
+    # 계측이 켜져 있으면 COM 호출 횟수·지연 시간을 기록하는 프록시로 감쌈
+    return com_probe.wrap(hwp, 'hwp')
 
 
 def get_file_format(file_path):
@@ -81,42 +80,42 @@ def _move_cursor_to_document_end(hwp):
 
 
 def _get_image_size_mm(image_path):
-    """이미지 원본 크기를 mm 단위로 계산합니다."""
-    if Image is None:
-        print("DEBUG: Pillow 미설치 - 이미지 크기 계산 생략")
-        return None, None
+    """이미지 원본 크기를 mm 단위로 계산합니다 (image_utils 메타데이터 캐시 사용)."""
+    width_mm, height_mm = image_utils.get_image_size_mm(image_path)
+    if width_mm is None:
+        print(f"DEBUG: 원본 이미지 크기 계산 실패: {image_path}")
+    else:
+        print(f"DEBUG: 원본 이미지 크기(mm) - {width_mm} x {height_mm}")
+    return width_mm, height_mm
 
-    try:
-        with Image.open(image_path) as img:
-            dpi_x, dpi_y = img.info.get("dpi", (96, 96))
-            dpi_x = dpi_x or 96
-            dpi_y = dpi_y or 96
-            width_mm = int(round((img.width / dpi_x) * 25.4))
-            height_mm = int(round((img.height / dpi_y) * 25.4))
-            print(f"DEBUG: 원본 이미지 크기(mm) - {width_mm} x {height_mm}")
-            return width_mm, height_mm
-    except Exception as err:
-        print(f"DEBUG: 원본 이미지 크기 계산 실패: {err}")
-        return None, None
 
+def insert_image_to_hwp(hwp, image_path, prepared=None):
+    """HWP 문서의 현재 커서 위치에 이미지를 삽입합니다.
 
-def insert_image_to_hwp(hwp, image_path):
-    """HWP 문서의 현재 커서 위치에 이미지를 삽입합니다."""
+    prepared가 있으면 ImagePrefetcher가 미리 검증·복사·측정한 결과를 그대로 사용합니다.
+    """
     temp_path = None
     try:
-        is_valid, message = image_utils.validate_image_path(image_path)
-        if not is_valid:
-            print(f"WARNING: 이미지 삽입 실패 - {message}")
-            return False
-
-        abs_path = os.path.abspath(image_path)
-        fd, temp_path = tempfile.mkstemp(suffix=os.path.splitext(abs_path)[1] or ".img")
-        os.close(fd)
-        shutil.copy2(abs_path, temp_path)
-        win_path = temp_path.replace('/', '\\')
+        if prepared is not None:
+            if not prepared['valid']:
+                print(f"WARNING: 이미지 삽입 실패 - {prepared['message']}")
+                return False
+            win_path = prepared['path'].replace('/', '\\')
+            width_mm, height_mm = prepared['size_mm']
+        else:
+            is_valid, message = image_utils.validate_image_path(image_path)
+            if not is_valid:
+                print(f"WARNING: 이미지 삽입 실패 - {message}")
+                return False
+
+            abs_path = image_utils.normalize_image_path(image_path)
+            fd, temp_path = tempfile.mkstemp(suffix=os.path.splitext(abs_path)[1] or ".img")
+            os.close(fd)
+            image_utils.copy_image_file(abs_path, temp_path)
+            win_path = temp_path.replace('/', '\\')
+            width_mm, height_mm = _get_image_size_mm(abs_path)
         size_option = 3  # 표 비율 유지
 
-        width_mm, height_mm = _get_image_size_mm(abs_path)
         if width_mm is None or height_mm is None:
             width_mm = 0
             height_mm = 0
@@ -171,7 +170,7 @@ def _put_field_text(hwp, field_name, field_value):
     return False
 
 
-def _fill_image_field(hwp, field_name, image_path):
+def _fill_image_field(hwp, field_name, image_path, prepared=None):
     """필드 위치에서 이미지를 삽입한다."""
     placeholder = f"__HWP_IMAGE__{field_name}_{uuid.uuid4().hex}__"
 
@@ -212,23 +211,41 @@ def _fill_image_field(hwp, field_name, image_path):
         print(f"DEBUG: 이미지 플레이스홀더 삭제 실패: {err}")
         return False
 
-    return insert_image_to_hwp(hwp, image_path)
+    with job_trace.span('image'):
+        return insert_image_to_hwp(hwp, image_path, prepared)
+
+
+# 아직 템플릿 필드를 읽지 않았음을 나타내는 값 (None은 '읽지 못함 - 모든 열을 채움')
+_FIELDS_NOT_READ = object()
+
+
+def get_template_fields(hwp):
+    """열린 문서의 필드(누름틀·셀 필드) 이름 집합 (가져오지 못하면 None - 모든 열을 채움)."""
+    try:
+        return set(template_inspector.hwp_field_names(hwp.GetFieldList(0, 0)))
+    except Exception as err:
+        print(f"DEBUG: GetFieldList 실패 - 모든 열을 채웁니다: {err}")
+        return None
+
 
+def fill_fields_with_find_replace(hwp, row, prepared_images=None, fields=None):
+    """PutFieldText 기반으로 필드를 채우고, 이미지 필드는 플레이스홀더 기반으로 삽입한다.
 
-def fill_fields_with_find_replace(hwp, dataframe_row):
-    """PutFieldText 기반으로 필드를 채우고, 이미지 필드는 플레이스홀더 기반으로 삽입한다."""
+    row는 row_values.MergeRow(열 단위로 미리 변환한 셀 문자열과 이미지 판별 결과),
+    prepared_images는 ImagePrefetcher가 준비한 {셀 값: 준비 결과} dict입니다.
+    fields(템플릿 필드 이름 집합)를 주면 템플릿에 없는 열은 PutFieldText를 부르지 않습니다.
+    """
+    prepared_images = prepared_images or {}
     filled = 0
+    columns = [(column, value) for column, value in row.items() if fields is None or column in fields]
     print("DEBUG: PutFieldText 기반 필드 채우기 시작")
-    print(f"DEBUG: 채울 컬럼: {list(dataframe_row.index)}")
+    print(f"DEBUG: 채울 컬럼: {[column for column, _ in columns]}")
 
     image_queue = []
 
-    for column in dataframe_row.index:
+    for column, field_value in columns:
         try:
-            raw_value = dataframe_row[column]
-            field_value = "" if pd.isna(raw_value) else str(raw_value)
-
-            if field_value and image_utils.is_image_file(field_value):
+            if row.is_image(column):
                 image_queue.append((column, field_value))
                 continue
 
@@ -245,7 +262,7 @@ def fill_fields_with_find_replace(hwp, dataframe_row):
 
     for column, image_path in image_queue:
         try:
-            if _fill_image_field(hwp, column, image_path):
+            if _fill_image_field(hwp, column, image_path, prepared_images.get(image_path)):
                 print(f"DEBUG: '{column}' 필드 이미지 삽입 완료")
                 filled += 1
             else:
@@ -258,6 +275,18 @@ def fill_fields_with_find_replace(hwp, dataframe_row):
     return filled
 
 
+def _log_template_fields(fields, columns):
+    """템플릿 필드와 데이터 열 비교 결과를 기록합니다."""
+    if fields is None:
+        return
+    unused = [column for column in columns if column not in fields]
+    missing = sorted(fields - set(columns))
+    if unused:
+        print(f"DEBUG: 템플릿에 없는 열은 건너뜀: {unused}")
+    if missing:
+        print(f"WARNING: 데이터에 없는 필드 (비어 있게 됨): {missing}")
+
+
 def remove_all_fields(hwp, progress_callback=None):
     """문서 내의 모든 누름틀(Click-Here) 필드를 삭제합니다. (내용은 유지)"""
     try:
@@ -315,11 +344,16 @@ def remove_all_fields(hwp, progress_callback=None):
         print(f"DEBUG: 전체 필드 삭제 로직 중 오류: {e}")
 
 
-def process_hwp_template(dataframe, template_file_path, output_type, progress_callback, save_path=None):
-    """HWP 템플릿을 처리합니다."""
+def process_hwp_template(dataframe, template_file_path, output_type, progress_callback, save_path=None, image_options=None,
+                         output_sink=None):
+    """HWP 템플릿을 처리합니다. image_options는 image_pipeline의 이미지 축소 옵션입니다.
+
+    output_sink(output_archive.ArchiveWriter)를 넘기면 개별 문서를 폴더 대신 ZIP에 넣습니다.
+    """
     hwp = None
 
     try:
+        dataframe = image_pipeline.prepare_dataframe_images(dataframe, image_options)
         hwp = get_hwp_instance()
         if hwp is None:
             raise Exception("한글 COM 객체를 가져오는 데 실패했습니다.")
@@ -330,7 +364,7 @@ def process_hwp_template(dataframe, template_file_path, output_type, progress_ca
         file_format = get_file_format(template_file_path)
         
         if output_type == 'individual':
-            return process_individual(hwp, dataframe, template_file_path, progress_callback)
+            return process_individual(hwp, dataframe, template_file_path, progress_callback, output_sink)
         elif output_type == 'combined':
             if not save_path:
                 raise ValueError("통합 저장 경로가 지정되지 않았습니다.")
@@ -343,6 +377,8 @@ def process_hwp_template(dataframe, template_file_path, output_type, progress_ca
         print(traceback.format_exc())
         raise
     finally:
+        image_utils.log_image_cache_stats("HWP")
+        image_utils.close_image_archives()
         if hwp:
             try:
                 print("DEBUG: HWP 인스턴스 종료 시작...")
@@ -369,8 +405,19 @@ def process_hwp_template(dataframe, template_file_path, output_type, progress_ca
                 print(f"DEBUG: HWP 종료 시퀀스 중 오류 (무시): {e}")
 
 
-def process_individual(hwp, dataframe, template_file_path, progress_callback):
-    """개별 문서로 저장합니다."""
+def _move_to_sink(output_sink, row, path, attempts=3):
+    """저장한 문서를 ZIP으로 옮깁니다 (한글이 파일을 아직 잡고 있으면 잠시 기다렸다 다시 시도)."""
+    for attempt in range(attempts):
+        try:
+            return output_sink.add_file(row, path)
+        except OSError as e:
+            print(f"DEBUG: 문서를 ZIP에 넣기 실패 (시도 {attempt+1}/{attempts}): {e}")
+            time.sleep(0.5)
+    raise Exception(f"저장한 문서를 ZIP에 넣을 수 없습니다 (행 {row.index+1}): {path}")
+
+
+def process_individual(hwp, dataframe, template_file_path, progress_callback, output_sink=None):
+    """개별 문서로 저장합니다 (output_sink가 있으면 임시 파일로 저장해 ZIP에 넣음)."""
     output_dir = os.path.dirname(template_file_path)
     base_name = os.path.splitext(os.path.basename(template_file_path))[0]
     ext = os.path.splitext(template_file_path)[1]
@@ -378,12 +425,15 @@ def process_individual(hwp, dataframe, template_file_path, progress_callback):
     file_format = get_file_format(template_file_path)
 
     print(f"DEBUG: 개별 문서 {total_rows}개 생성 시작")
+    fields = _FIELDS_NOT_READ  # 템플릿 필드 이름 (첫 문서를 연 뒤 한 번만 가져옴)
+    saved = None  # ZIP에 넣을 (행, 임시 파일) - 한글이 문서를 닫아 파일 잠금을 푼 뒤에 옮김
 
-    for index, row in dataframe.iterrows():
+    # 파일 이름은 행 인덱스, 진행률은 처리 순서 기준 (행 일부만 넘겨받아도 0-100%)
+    for position, (index, row, prepared_images) in enumerate(image_pipeline.ImagePrefetcher(row_values.prepare_rows(dataframe), stage=True)):
         try:
             # 진행률 업데이트
             if progress_callback:
-                progress_callback.emit(int(((index + 1) / total_rows) * 100))
+                progress_callback.emit(int(((position + 1) / total_rows) * 100))
 
             # 기존 문서 닫기 및 인스턴스 유효성 체크
             try:
@@ -397,7 +447,13 @@ def process_individual(hwp, dataframe, template_file_path, progress_callback):
                 except:
                     pass
 
+            # 이전 행 문서를 닫은 뒤 ZIP으로 옮김 (실패하면 COM 재연결이 아니라 작업 오류로 처리)
+            if saved:
+                pending, saved = saved, None
+                _move_to_sink(output_sink, *pending)
+
             # 문서 열기 (재시도 로직 추가)
+            open_span = job_trace.begin('open', index)
             abs_template = os.path.abspath(template_file_path)
             opened = False
             for attempt in range(3):
@@ -415,28 +471,40 @@ def process_individual(hwp, dataframe, template_file_path, progress_callback):
                         except:
                             pass
                 time.sleep(0.8)
+            job_trace.end(open_span)
 
             if not opened:
                 raise Exception(f"템플릿 파일을 열 수 없습니다 (3회 시도): {template_file_path}")
 
             time.sleep(0.3)
 
-            filled = fill_fields_with_find_replace(hwp, row)
+            with job_trace.span('fill', index):
+                if fields is _FIELDS_NOT_READ:
+                    fields = get_template_fields(hwp)
+                    _log_template_fields(fields, row.names)
+                filled = fill_fields_with_find_replace(hwp, row, prepared_images, fields)
             
-            if index == 0 and filled == 0:
+            if position == 0 and filled == 0:
                 print("\n⚠️  첫 번째 문서에서 필드가 하나도 채워지지 않았습니다.")
                 print("    템플릿 문서를 확인하고 수정한 후 다시 시도하세요.\n")
             
-            # 저장 전 누름틀(필드) 삭제
-            remove_all_fields(hwp, progress_callback)
+            # 저장 전 누름틀(필드) 삭제 (개별 저장에서는 95-99% 진행률을 보내지 않음)
+            with job_trace.span('remove_fields', index):
+                remove_all_fields(hwp)
             
             # 저장
-            output_path = os.path.join(output_dir, f"{base_name}_row_{index+1}{ext}")
+            if output_sink is not None:
+                output_path = output_sink.temp_path(row)
+            else:
+                output_path = os.path.join(output_dir, f"{base_name}_row_{index+1}{ext}")
             abs_output_path = os.path.abspath(output_path)
             
-            result = hwp.SaveAs(abs_output_path, file_format, "")
+            with job_trace.span('save', index):
+                result = hwp.SaveAs(abs_output_path, file_format, "")
             if not result:
                 raise Exception(f"문서 저장 실패: {abs_output_path}")
+            if output_sink is not None:
+                saved = (row, abs_output_path)
             
             print(f"DEBUG: 문서 저장 완료 ({index+1}/{total_rows})")
             
@@ -448,6 +516,8 @@ def process_individual(hwp, dataframe, template_file_path, progress_callback):
         hwp.Clear(1)
     except:
         pass
+    if saved:
+        _move_to_sink(output_sink, *saved)
     
     return f"INDIVIDUAL_DONE|{output_dir}|{total_rows}"
 
@@ -460,10 +530,11 @@ def process_combined_safe(hwp, dataframe, template_file_path, progress_callback,
     file_format = get_file_format(template_file_path)
 
     print(f"DEBUG: Stage 1 - 임시 폴더에 {total_rows}개의 HWP 파일 생성: {temp_dir}")
+    fields = _FIELDS_NOT_READ  # 템플릿 필드 이름 (첫 문서를 연 뒤 한 번만 가져옴)
 
     try:
         # Stage 1: 개별 파일 생성
-        for index, row in dataframe.iterrows():
+        for index, row, prepared_images in image_pipeline.ImagePrefetcher(row_values.prepare_rows(dataframe), stage=True):
             try:
                 # 진행률 업데이트 (0-50%)
                 if progress_callback:
@@ -483,6 +554,7 @@ def process_combined_safe(hwp, dataframe, template_file_path, progress_callback,
                         pass
 
                 # 문서 열기 (재시도 로직 추가하여 안정성 확보)
+                open_span = job_trace.begin('open', index)
                 abs_template = os.path.abspath(template_file_path)
                 opened = False
                 for attempt in range(3):
@@ -506,13 +578,18 @@ def process_combined_safe(hwp, dataframe, template_file_path, progress_callback,
                                 pass
                     
                     time.sleep(0.8) # 실패 시 충분히 대기
+                job_trace.end(open_span)
 
                 if not opened:
                     raise Exception(f"템플릿 파일을 열 수 없습니다 (3회 시도): {template_file_path}")
 
                 time.sleep(0.3)
 
-                filled = fill_fields_with_find_replace(hwp, row)
+                with job_trace.span('fill', index):
+                    if fields is _FIELDS_NOT_READ:
+                        fields = get_template_fields(hwp)
+                        _log_template_fields(fields, row.names)
+                    filled = fill_fields_with_find_replace(hwp, row, prepared_images, fields)
                 
                 if index == 0 and filled == 0:
                     print("\n⚠️  첫 번째 문서에서 필드가 하나도 채워지지 않았습니다.")
@@ -522,7 +599,8 @@ def process_combined_safe(hwp, dataframe, template_file_path, progress_callback,
                 temp_path = os.path.join(temp_dir, f"temp_{index:04d}.hwp")
                 abs_temp_path = os.path.abspath(temp_path)
                 
-                result = hwp.SaveAs(abs_temp_path, "HWP", "")
+                with job_trace.span('save', index):
+                    result = hwp.SaveAs(abs_temp_path, "HWP", "")
                 if not result:
                     raise Exception(f"임시 파일 저장 실패: {abs_temp_path}")
                 
@@ -537,6 +615,7 @@ def process_combined_safe(hwp, dataframe, template_file_path, progress_callback,
 
         # Stage 2: 파일 병합
         print(f"DEBUG: Stage 2 - {len(file_paths)}개 파일 병합 시작")
+        merge_span = job_trace.begin('merge')
         
         if not file_paths:
             raise Exception("생성된 임시 파일이 없습니다.")
@@ -679,13 +758,17 @@ def process_combined_safe(hwp, dataframe, template_file_path, progress_callback,
                 # 오류 발생 시에도 계속 진행
                 continue
         
+        job_trace.end(merge_span)
+
         # 모든 작업 완료 후 누름틀(필드) 삭제 (최종본 깔끔하게 정리)
-        remove_all_fields(hwp, progress_callback)
+        with job_trace.span('remove_fields'):
+            remove_all_fields(hwp, progress_callback)
         
         # 최종 파일 저장
         abs_save_path = os.path.abspath(save_path)
         save_format = get_file_format(save_path)
-        result = hwp.SaveAs(abs_save_path, save_format, "")
+        with job_trace.span('save'):
+            result = hwp.SaveAs(abs_save_path, save_format, "")
         if not result:
             raise Exception(f"최종 파일 저장 실패: {abs_save_path}")
         
@@ -0,0 +1,277 @@
+import os
+import time
+import hashlib
+import shutil
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from PIL import Image, ImageOps
+import image_utils
+import row_values
+
+# 기본 변환 옵션 (삽입 상자 크기는 pt 단위, 1pt = 1/72 inch)
+DEFAULT_IMAGE_OPTIONS = {
+    'enabled': False,
+    'box_pt': (450, 450),
+    'dpi': 200,
+    'quality': 85,
+}
+
+# 문서에 그대로 넣어도 되는 형식 (그 외 WEBP, TIFF 등은 JPEG/PNG로 변환)
+_PASSTHROUGH_FORMATS = {'JPEG', 'PNG', 'BMP', 'GIF'}
+
+# 변환 방식이 바뀌면 올려서 이전 캐시 결과를 무시
+_PIPELINE_VERSION = 1
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def default_cache_dir():
+    """변환 결과를 저장할 사용자별 캐시 폴더를 반환합니다."""
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'YongMerge', 'image_cache')
+
+
+def resolve_image_options(options=None):
+    """사용자 옵션을 기본값과 합칩니다."""
+    resolved = dict(DEFAULT_IMAGE_OPTIONS)
+    if options:
+        resolved.update({k: v for k, v in options.items() if v is not None})
+    resolved.setdefault('cache_dir', None)
+    resolved['cache_dir'] = resolved['cache_dir'] or default_cache_dir()
+    return resolved
+
+
+def _box_pixels(box_pt, dpi):
+    return max(1, int(round(box_pt[0] / 72 * dpi))), max(1, int(round(box_pt[1] / 72 * dpi)))
+
+
+def _file_sha256(file_path):
+    digest = hashlib.sha256()
+    with image_utils.open_image_file(file_path) as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def needs_processing(file_path, box_px):
+    """상자보다 크거나, 회전 정보가 있거나, 문서에 바로 넣기 어려운 형식이면 True.
+
+    크기 제한(10MB)만 넘는 이미지는 원본을 넣을 수 없으므로 항상 변환합니다.
+    """
+    info = image_utils.get_image_info(file_path)
+    if info.get('oversize'):
+        return True
+    if not info['valid']:
+        return False
+    return (
+        info['width'] > box_px[0]
+        or info['height'] > box_px[1]
+        or info['orientation'] != 1
+        or info['format'] not in _PASSTHROUGH_FORMATS
+    )
+
+
+def prepare_image(file_path, box_px, dpi, quality, cache_dir):
+    """이미지를 상자 크기로 축소·재압축하여 캐시 경로를 반환합니다 (프로세스 풀 작업 함수).
+
+    캐시 파일 이름은 원본 내용의 SHA-256과 변환 옵션으로 정해지므로
+    경로나 파일명이 달라도 같은 내용이면 다시 변환하지 않습니다.
+    """
+    digest = _file_sha256(file_path)
+    key = f"{digest}_{box_px[0]}x{box_px[1]}_{dpi}_{quality}_v{_PIPELINE_VERSION}"
+    sub_dir = os.path.join(cache_dir, digest[:2])
+
+    for ext in ('.jpg', '.png'):
+        cached_path = os.path.join(sub_dir, key + ext)
+        if os.path.exists(cached_path):
+            return cached_path, True
+
+    with image_utils.open_image_file(file_path) as f, Image.open(f) as img:
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail(box_px, Image.LANCZOS)
+
+        # 투명도가 있으면 PNG, 그 외에는 JPEG
+        has_alpha = img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info)
+        if has_alpha:
+            img = img.convert('RGBA')
+            ext, save_kwargs = '.png', {'format': 'PNG', 'optimize': True}
+        else:
+            img = img.convert('RGB')
+            ext, save_kwargs = '.jpg', {'format': 'JPEG', 'quality': quality, 'optimize': True}
+
+        os.makedirs(sub_dir, exist_ok=True)
+        cached_path = os.path.join(sub_dir, key + ext)
+        # 다른 프로세스와 겹쳐도 깨진 파일이 남지 않도록 임시 파일에 쓴 뒤 교체
+        fd, temp_path = tempfile.mkstemp(suffix=ext, dir=sub_dir)
+        os.close(fd)
+        try:
+            img.save(temp_path, dpi=(dpi, dpi), **save_kwargs)
+            os.replace(temp_path, cached_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    return cached_path, False
+
+
+def prepare_images(file_paths, options=None, max_workers=None):
+    """여러 이미지를 프로세스 풀에서 변환하고 {원본 경로: 변환 경로}와 통계를 반환합니다.
+
+    변환이 필요 없는 이미지와 변환에 실패한 이미지는 원본 경로를 그대로 사용합니다.
+    """
+    options = resolve_image_options(options)
+    box_px = _box_pixels(options['box_pt'], options['dpi'])
+    start = time.perf_counter()
+
+    mapping = {}
+    targets = []
+    for path in dict.fromkeys(file_paths):
+        if needs_processing(path, box_px):
+            targets.append(path)
+        else:
+            mapping[path] = path
+
+    stats = {'images': len(mapping) + len(targets), 'processed': 0, 'cache_hits': 0, 'failed': 0,
+             'original_bytes': 0, 'prepared_bytes': 0, 'seconds': 0.0}
+    if targets:
+        args = (box_px, options['dpi'], options['quality'], options['cache_dir'])
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {path: executor.submit(prepare_image, path, *args) for path in targets}
+                results = {}
+                for path, future in futures.items():
+                    try:
+                        results[path] = future.result()
+                    except Exception as e:
+                        print(f"DEBUG: 이미지 변환 실패 (원본 사용): {path} - {e}")
+                        results[path] = None
+        except Exception as e:
+            # 프로세스 풀을 쓸 수 없는 환경이면 현재 프로세스에서 순서대로 처리
+            print(f"DEBUG: 프로세스 풀 사용 불가, 순차 처리로 전환: {e}")
+            results = {}
+            for path in targets:
+                try:
+                    results[path] = prepare_image(path, *args)
+                except Exception as err:
+                    print(f"DEBUG: 이미지 변환 실패 (원본 사용): {path} - {err}")
+                    results[path] = None
+
+        for path, result in results.items():
+            if result is None:
+                mapping[path] = path
+                stats['failed'] += 1
+                continue
+            prepared_path, from_cache = result
+            mapping[path] = prepared_path
+            stats['processed'] += 1
+            stats['cache_hits'] += int(from_cache)
+            stats['original_bytes'] += image_utils.get_image_info(path)['file_size']
+            stats['prepared_bytes'] += os.path.getsize(prepared_path)
+
+    stats['seconds'] = time.perf_counter() - start
+    print(f"DEBUG: 이미지 전처리 - {stats['images']}개 중 {stats['processed']}개 변환 "
+          f"(캐시 {stats['cache_hits']}개, 실패 {stats['failed']}개), "
+          f"{stats['original_bytes'] / 1048576:.1f}MB → {stats['prepared_bytes'] / 1048576:.1f}MB, {stats['seconds']:.2f}초")
+    return mapping, stats
+
+
+def prepare_dataframe_images(dataframe, options=None, max_workers=None):
+    """DataFrame의 이미지 경로를 변환된 이미지 경로로 바꾼 사본을 반환합니다.
+
+    options의 enabled가 False이면 원본 DataFrame을 그대로 반환합니다.
+    """
+    options = resolve_image_options(options)
+    if not options['enabled']:
+        return dataframe
+
+    image_columns = []
+    paths = []
+    for col in dataframe.columns:
+        values = dataframe[col]
+        mask = values.map(lambda v: isinstance(v, str) and image_utils.is_image_file(v))
+        if mask.any():
+            image_columns.append(col)
+            paths.extend(values[mask].tolist())
+    if not paths:
+        return dataframe
+
+    mapping, _ = prepare_images(paths, options, max_workers)
+    prepared = dataframe.copy()
+    for col in image_columns:
+        prepared[col] = prepared[col].map(lambda v: mapping.get(v, v) if isinstance(v, str) else v)
+    return prepared
+
+
+class ImagePrefetcher:
+    """행 i를 COM으로 채우는 동안 i+1..i+depth 행의 이미지를 스레드 풀에서 미리 준비합니다.
+
+    dataframe은 DataFrame 또는 row_values.MergeRows이며, 반복하면 (index, row, prepared_images)를
+    행 순서대로 돌려줍니다. row는 row_values.MergeRow(열 단위로 미리 변환한 셀 문자열)이고 prepared_images는
+    {셀 값: 준비 결과} dict입니다. 준비 결과에는 검증 결과, 삽입할 파일 경로,
+    가로/세로 비율과 mm 크기가 들어 있어 COM 루프는 준비된 파일을 삽입만 하면 됩니다.
+    stage=True이면 이미지를 임시 폴더에 복사해 두고 반복이 끝나면 삭제합니다.
+    ZIP 참조('archive.zip!/멤버')는 COM이 파일 이름을 요구하므로 stage와 관계없이 임시 폴더로 추출합니다.
+    """
+
+    def __init__(self, dataframe, depth=4, stage=False, max_workers=2):
+        self.rows = row_values.prepare_rows(dataframe)
+        self.depth = max(1, depth)
+        self.stage = stage
+        self.max_workers = max_workers
+        self.wait_seconds = 0.0
+        self._stage_dir = None
+        self._stage_lock = threading.Lock()
+
+    def _stage_file(self, abs_path):
+        """COM에 넘길 복사본을 만듭니다 (같은 원본은 한 번만 복사, ZIP 멤버는 추출)."""
+        with self._stage_lock:
+            if self._stage_dir is None:
+                self._stage_dir = tempfile.mkdtemp(prefix="yongmerge_img_")
+        name = hashlib.sha1(os.path.normcase(abs_path).encode('utf-8')).hexdigest()[:16]
+        staged_path = os.path.join(self._stage_dir, name + (os.path.splitext(abs_path)[1] or ".img"))
+        if not os.path.exists(staged_path):
+            fd, temp_path = tempfile.mkstemp(dir=self._stage_dir)
+            os.close(fd)
+            image_utils.copy_image_file(abs_path, temp_path)
+            os.replace(temp_path, staged_path)
+        return staged_path
+
+    def prepare(self, value):
+        """셀 값 하나를 검증·측정(·복사)합니다."""
+        info = image_utils.get_image_info(value)
+        prepared = {'source': value, 'path': None, 'valid': info['valid'], 'message': info['message'],
+                    'aspect_ratio': info.get('aspect_ratio'), 'size_mm': info.get('size_mm', (None, None))}
+        if info['valid']:
+            abs_path = image_utils.normalize_image_path(value)
+            stage = self.stage or image_utils.is_archive_path(abs_path)
+            prepared['path'] = self._stage_file(abs_path) if stage else abs_path
+        return prepared
+
+    def _prepare_row(self, values):
+        return {value: self.prepare(value) for value in dict.fromkeys(values)}
+
+    def __iter__(self):
+        # 행마다 이미지 경로로 보이는 셀 값 (prepare_rows가 열 단위로 판별)
+        image_values = [row.image_values() for row in self.rows]
+        pending = deque()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            next_row = 0
+            for position, row in enumerate(self.rows):
+                # 현재 행 + depth개 행까지 미리 예약
+                while next_row < len(image_values) and next_row <= position + self.depth:
+                    pending.append(executor.submit(self._prepare_row, image_values[next_row]))
+                    next_row += 1
+                start = time.perf_counter()
+                prepared_images = pending.popleft().result()
+                self.wait_seconds += time.perf_counter() - start
+                yield row.index, row, prepared_images
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+            print(f"DEBUG: 이미지 미리 준비 종료 - COM 루프 대기 {self.wait_seconds:.2f}초")
+            if self._stage_dir:
+                shutil.rmtree(self._stage_dir, ignore_errors=True)
+                self._stage_dir = None
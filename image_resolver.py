@@ -0,0 +1,136 @@
+import os
+import re
+import posixpath
+import time
+import pandas as pd
+import image_utils
+
+# 패턴 안의 {필드명} 자리
+_FIELD_RE = re.compile(r'\{([^{}]+)\}')
+
+# 폴더 색인 캐시: 정규화 경로 -> (폴더 수정 시각, 색인)
+_index_cache = {}
+
+
+def split_pattern(pattern, base_dir=None):
+    """'photos/{학번}.*' 형식의 패턴을 (폴더, 파일 이름 템플릿, 확장자 무관 여부)로 나눕니다.
+
+    상대 경로 폴더는 base_dir 기준으로 해석합니다. 'photos.zip!/{학번}.*'처럼 ZIP 안의 폴더도 쓸 수 있습니다.
+    """
+    pattern = pattern.strip().replace('\\', '/')
+    directory, _, name_template = pattern.rpartition('/')
+    if _FIELD_RE.search(directory):
+        raise ValueError("필드({...})는 파일 이름 부분에만 사용할 수 있습니다.")
+    if not _FIELD_RE.search(name_template):
+        raise ValueError("패턴에 {필드명}이 하나 이상 필요합니다.")
+    any_ext = name_template.endswith('.*')
+    if any_ext:
+        name_template = name_template[:-2]
+    directory = directory or '.'
+    if not os.path.isabs(directory):
+        directory = os.path.join(base_dir or os.getcwd(), directory)
+    return os.path.normpath(directory), name_template, any_ext
+
+
+def pattern_fields(pattern):
+    """패턴에서 참조하는 필드 이름 목록."""
+    return _FIELD_RE.findall(pattern)
+
+
+def _split_archive_directory(directory):
+    """'photos.zip!' 또는 'photos.zip!/2023' 형식이면 (ZIP 경로, 내부 폴더)를, 아니면 (None, None)을 반환합니다."""
+    if directory.lower().endswith('.zip!'):
+        return directory[:-1], ''
+    archive_path, member_dir = image_utils.split_archive_path(directory)
+    if archive_path is None:
+        return None, None
+    return archive_path, member_dir.strip('/')
+
+
+def _list_directory_images(directory):
+    """(파일 이름, 경로) 목록 - ZIP 안의 폴더이면 'archive.zip!/멤버' 참조를 돌려줍니다."""
+    archive_path, member_dir = _split_archive_directory(directory)
+    if archive_path is not None:
+        member_dir = member_dir.lower()
+        files = []
+        for ref in image_utils.list_archive_images(archive_path):
+            member = image_utils.split_archive_path(ref)[1]
+            if posixpath.dirname(member).lower() == member_dir:
+                files.append((posixpath.basename(member), ref))
+        return files
+    with os.scandir(directory) as entries:
+        return [(e.name, e.path) for e in entries if e.is_file() and image_utils.is_image_file(e.name)]
+
+
+def build_directory_index(directory):
+    """폴더(또는 ZIP 안의 폴더)를 한 번 훑어 이미지 파일 색인을 만듭니다 (수정 시각이 같으면 재사용).
+
+    반환값은 {'names': {소문자 파일명: 경로}, 'stems': {소문자 확장자 제외 이름: 경로}} 입니다.
+    """
+    key = os.path.normcase(os.path.abspath(directory))
+    archive_path, _ = _split_archive_directory(directory)
+    mtime = os.stat(archive_path or directory).st_mtime_ns
+    cached = _index_cache.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    start = time.perf_counter()
+    names = {}
+    stems = {}
+    # 같은 이름의 파일이 여러 확장자로 있으면 이름순으로 첫 파일 사용
+    for name, path in sorted(_list_directory_images(directory), key=lambda item: item[0].lower()):
+        lower = name.lower()
+        names[lower] = path
+        stems.setdefault(os.path.splitext(lower)[0], path)
+    index = {'names': names, 'stems': stems}
+    _index_cache[key] = (mtime, index)
+    print(f"DEBUG: 이미지 폴더 색인 - {directory}: {len(names)}개 ({time.perf_counter() - start:.3f}초)")
+    return index
+
+
+def _key_text(series):
+    """셀 값을 파일 이름용 문자열로 변환합니다 (20231234.0 → '20231234', 빈 값 → '')."""
+    def to_text(value):
+        if value is None or (isinstance(value, float) and pd.isna(value)):
+            return ""
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return str(value).strip()
+    return series.map(to_text)
+
+
+def build_pattern_keys(dataframe, name_template):
+    """행마다 파일 이름 템플릿을 채운 문자열 Series를 만듭니다 (참조 필드가 비어 있으면 빈 문자열)."""
+    parts = _FIELD_RE.split(name_template)
+    keys = pd.Series([""] * len(dataframe), index=dataframe.index, dtype=object)
+    missing = pd.Series(False, index=dataframe.index)
+    for i, part in enumerate(parts):
+        if i % 2 == 0:
+            keys = keys + part
+            continue
+        if part not in dataframe.columns:
+            raise ValueError(f"패턴의 필드가 데이터에 없습니다: {part}")
+        texts = _key_text(dataframe[part])
+        missing |= texts.eq("")
+        keys = keys + texts
+    return keys.where(~missing, "")
+
+
+def resolve_image_pattern(dataframe, pattern, base_dir=None):
+    """패턴으로 행마다 이미지 파일 경로를 찾습니다.
+
+    반환값은 (경로 Series, 일치하지 않은 [(행 위치, 파일 이름), ...]) 입니다.
+    찾지 못했거나 키가 비어 있는 행의 경로는 None입니다.
+    """
+    directory, name_template, any_ext = split_pattern(pattern, base_dir)
+    keys = build_pattern_keys(dataframe, name_template)
+    index = build_directory_index(directory)
+
+    lookup = index['stems'] if any_ext else index['names']
+    resolved = keys.str.lower().map(lookup)
+    resolved = resolved.astype(object).where(resolved.notna(), None)
+
+    unmatched_mask = keys.ne("") & resolved.isna()
+    positions = unmatched_mask.to_numpy().nonzero()[0]
+    unmatched = [(int(pos), keys.iat[pos] + ('.*' if any_ext else '')) for pos in positions]
+    return resolved, unmatched
@@ -1,6 +1,10 @@
 import os
+import shutil
+import tempfile
+import threading
+import zipfile
+from contextlib import contextmanager
 from pathlib import Path
-from PIL import Image
 
 # 지원하는 이미지 파일 확장자
 SUPPORTED_IMAGE_FORMATS = {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tiff', '.tif', '.webp'}
@@ -17,31 +21,302 @@ def is_image_file(file_path):
     except:
         return False
 
-def validate_image_path(file_path):
-    """이미지 파일의 경로 유효성 및 실제 이미지 여부를 검증합니다."""
+# 파일 크기 제한 (10MB)
+MAX_IMAGE_FILE_SIZE = 10 * 1024 * 1024
+
+# EXIF Orientation 태그 번호
+_EXIF_ORIENTATION_TAG = 0x0112
+
+# 이미지 메타데이터 캐시: 정규화 경로 -> 메타데이터 (파일 크기와 수정 시각이 바뀌면 다시 읽음)
+_image_info_cache = {}
+_image_info_lock = threading.Lock()
+_image_cache_stats = {'hits': 0, 'misses': 0}
+
+
+# ZIP 안의 이미지 참조 구분자: 'C:/photos.zip!/2023/20231234.jpg'
+ARCHIVE_SEPARATOR = '!/'
+
+# ZIP 색인 캐시: 정규화 경로 -> (ZIP 크기와 수정 시각, 열린 ZipFile, {소문자 멤버 이름: ZipInfo})
+_archive_cache = {}
+_archive_lock = threading.Lock()
+
+
+def _invalid_info(message):
+    return {'valid': False, 'message': message}
+
+
+def split_archive_path(file_path):
+    """'archive.zip!/path/inside.jpg'를 (ZIP 경로, 멤버 이름)으로 나눕니다. ZIP 참조가 아니면 (None, None)."""
     if not file_path or not isinstance(file_path, str):
-        return False, "파일 경로가 비어있습니다."
+        return None, None
+    lower = file_path.lower()
+    for separator in ('.zip!/', '.zip!\\'):
+        pos = lower.find(separator)
+        if pos != -1:
+            split_at = pos + 4
+            return file_path[:split_at], file_path[split_at + 2:].replace('\\', '/')
+    return None, None
+
+
+def is_archive_path(file_path):
+    """ZIP 안의 이미지를 가리키는 참조인지 확인합니다."""
+    return split_archive_path(file_path)[0] is not None
+
+
+def make_archive_path(archive_path, member):
+    return f"{archive_path}{ARCHIVE_SEPARATOR}{member}"
+
+
+def _get_archive(archive_path):
+    """ZIP의 중앙 디렉터리를 한 번만 읽어 (ZipFile, 멤버 색인)을 반환합니다.
+
+    ZIP 파일이 바뀌면(크기, 수정 시각) 다시 엽니다. 열린 ZipFile은 스레드 간에 공유합니다.
+    """
+    stat = os.stat(archive_path)
+    key = os.path.normcase(os.path.abspath(archive_path))
+    signature = (stat.st_size, stat.st_mtime_ns)
+    with _archive_lock:
+        cached = _archive_cache.get(key)
+        if cached and cached[0] == signature:
+            return cached[1], cached[2], signature
+        if cached:
+            cached[1].close()
+        archive = zipfile.ZipFile(archive_path)
+        members = {info.filename.lower(): info for info in archive.infolist() if not info.is_dir()}
+        _archive_cache[key] = (signature, archive, members)
+        return archive, members, signature
+
+
+def _archive_member(file_path):
+    """ZIP 참조를 (ZipFile, ZipInfo, ZIP 서명)으로 엽니다. 멤버가 없으면 FileNotFoundError."""
+    archive_path, member = split_archive_path(file_path)
+    archive, members, signature = _get_archive(archive_path)
+    info = members.get(member.lower())
+    if info is None:
+        raise FileNotFoundError(f"압축 파일 안에 없습니다: {member}")
+    return archive, info, signature
+
+
+def list_archive_images(archive_path):
+    """ZIP 안의 이미지 멤버를 'archive.zip!/멤버' 참조 목록으로 반환합니다 (이름순)."""
+    _, members, _ = _get_archive(archive_path)
+    names = sorted((info.filename for info in members.values() if is_image_file(info.filename)), key=str.lower)
+    return [make_archive_path(archive_path, name) for name in names]
+
+
+def expand_image_archives(file_paths):
+    """선택한 경로 중 .zip 파일을 그 안의 이미지 참조들로 펼칩니다 (순서 유지)."""
+    expanded = []
+    for path in file_paths:
+        if path.lower().endswith('.zip') and os.path.isfile(path):
+            try:
+                expanded.extend(list_archive_images(path))
+            except (OSError, zipfile.BadZipFile) as e:
+                print(f"WARNING: 압축 파일을 읽을 수 없습니다: {path} - {e}")
+                expanded.append(path)
+        else:
+            expanded.append(path)
+    return expanded
+
+
+def open_image_file(file_path):
+    """이미지를 바이너리 읽기용으로 엽니다. ZIP 참조는 압축을 풀지 않고 멤버를 스트림으로 엽니다."""
+    if is_archive_path(file_path):
+        archive, info, _ = _archive_member(file_path)
+        return archive.open(info)
+    return open(file_path, 'rb')
+
+
+def read_image_bytes(file_path):
+    """이미지 파일(또는 ZIP 멤버)의 내용을 bytes로 반환합니다."""
+    with open_image_file(file_path) as f:
+        return f.read()
+
+
+def copy_image_file(file_path, dest_path):
+    """이미지를 디스크의 dest_path로 복사합니다 (ZIP 참조는 해당 멤버만 추출)."""
+    if not is_archive_path(file_path):
+        shutil.copy2(file_path, dest_path)
+        return dest_path
+    with open_image_file(file_path) as src, open(dest_path, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    return dest_path
+
+
+@contextmanager
+def local_image_path(file_path):
+    """파일 이름이 필요한 API(COM 등)에 넘길 디스크 경로를 제공합니다.
+
+    일반 파일은 절대 경로를 그대로 쓰고, ZIP 참조는 임시 파일로 추출한 뒤 사용이 끝나면 삭제합니다.
+    """
+    if not is_archive_path(file_path):
+        yield os.path.abspath(file_path)
+        return
+    fd, temp_path = tempfile.mkstemp(suffix=os.path.splitext(file_path)[1] or ".img")
+    os.close(fd)
+    try:
+        yield copy_image_file(file_path, temp_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _source_signature(file_path):
+    """캐시 키, 변경 감지용 서명, 파일 크기를 반환합니다. 읽을 수 없으면 (None, 오류 메시지, None)."""
+    if is_archive_path(file_path):
+        archive_path, member = split_archive_path(file_path)
+        if not os.path.isfile(archive_path):
+            return None, f"파일이 존재하지 않습니다: {archive_path}", None
+        try:
+            _, info, archive_signature = _archive_member(file_path)
+        except FileNotFoundError as e:
+            return None, str(e), None
+        except (OSError, zipfile.BadZipFile) as e:
+            return None, f"압축 파일을 읽을 수 없습니다: {e}", None
+        key = os.path.normcase(os.path.abspath(archive_path)) + ARCHIVE_SEPARATOR + member.lower()
+        return key, archive_signature + (info.CRC,), info.file_size
 
     if not os.path.exists(file_path):
-        return False, f"파일이 존재하지 않습니다: {file_path}"
+        return None, f"파일이 존재하지 않습니다: {file_path}", None
 
     if not os.path.isfile(file_path):
-        return False, f"파일이 아닙니다: {file_path}"
+        return None, f"파일이 아닙니다: {file_path}", None
 
-    # 실제 이미지로 열 수 있는지 확인 (verify 대신 open 시도)
     try:
-        with Image.open(file_path) as img:
-            img.load() # 실제 데이터 로드 시도
-        return True, "유효한 이미지 파일입니다."
+        stat = os.stat(file_path)
+    except OSError as e:
+        return None, f"파일 정보를 읽을 수 없습니다: {e}", None
+    return os.path.normcase(os.path.abspath(file_path)), (stat.st_size, stat.st_mtime_ns), stat.st_size
+
+
+def _read_image_info(file_path, file_size, deep):
+    """이미지 헤더를 한 번 읽어 형식, 픽셀 크기, DPI, EXIF 방향을 추출합니다.
+
+    MAX_IMAGE_FILE_SIZE보다 큰 파일도 헤더는 읽어 두고 oversize=True로 표시합니다 (valid는 False).
+    원본을 그대로 넣을 수는 없지만 image_pipeline에서 축소하면 쓸 수 있기 때문입니다.
+    """
+    info = {
+        'valid': False,
+        'message': "",
+        'file_size': file_size,
+        'format': None,
+        'width': None,
+        'height': None,
+        'dpi': (96, 96),
+        'orientation': 1,
+        'size_mm': (None, None),
+        'aspect_ratio': None,
+        'deep_checked': deep,
+        'oversize': False,
+    }
+    too_large = file_size > MAX_IMAGE_FILE_SIZE
+    size_message = f"파일 크기가 너무 큽니다 (10MB 제한): {file_size / (1024*1024):.1f}MB"
+
+    # PIL은 처음 이미지를 읽을 때 로드 (프로그램 시작 시간 단축)
+    from PIL import Image
+
+    # Image.open은 헤더만 읽음 (ZIP 멤버는 필요한 만큼만 압축 해제)
+    try:
+        with open_image_file(file_path) as f, Image.open(f) as img:
+            info['format'] = img.format
+            info['width'], info['height'] = img.size
+            dpi_x, dpi_y = img.info.get("dpi", (96, 96))
+            info['dpi'] = (dpi_x or 96, dpi_y or 96)
+            try:
+                info['orientation'] = img.getexif().get(_EXIF_ORIENTATION_TAG, 1) or 1
+            except Exception:
+                pass
+            if deep and not too_large:
+                img.load() # 실제 데이터 로드 시도 (손상된 파일까지 검출)
     except Exception as e:
-        return False, f"이미지 파일을 읽을 수 없습니다: {e}"
+        info['message'] = size_message if too_large else f"이미지 파일을 읽을 수 없습니다: {e}"
+        return info
+    if too_large:
+        info['oversize'] = True
+        info['message'] = size_message
+        return info
+
+    info['valid'] = True
+    info['message'] = "유효한 이미지 파일입니다."
+    dpi_x, dpi_y = info['dpi']
+    info['size_mm'] = (int(round((info['width'] / dpi_x) * 25.4)), int(round((info['height'] / dpi_y) * 25.4)))
+    info['aspect_ratio'] = info['width'] / info['height'] if info['height'] else None
+    return info
+
+
+def get_image_info(file_path, deep=False):
+    """이미지 메타데이터를 반환합니다 (경로, 파일 크기, 수정 시각 기준 캐시).
+
+    반환값은 valid, message, file_size, format, width, height, dpi, orientation,
+    size_mm, aspect_ratio 키를 가진 dict입니다. 'archive.zip!/멤버' 형식의 ZIP 참조도 받습니다.
+    deep=True이면 픽셀 데이터까지 디코딩하며, 이전에 헤더만 확인한 항목은 다시 검사합니다.
+    """
+    if not file_path or not isinstance(file_path, str):
+        return _invalid_info("파일 경로가 비어있습니다.")
+
+    key, signature, file_size = _source_signature(file_path)
+    if key is None:
+        return _invalid_info(signature)
+
+    with _image_info_lock:
+        cached = _image_info_cache.get(key)
+        if cached and cached[0] == signature and (not deep or cached[1]['deep_checked'] or not cached[1]['valid']):
+            _image_cache_stats['hits'] += 1
+            return cached[1]
+        _image_cache_stats['misses'] += 1
+
+    info = _read_image_info(file_path, file_size, deep)
+    with _image_info_lock:
+        _image_info_cache[key] = (signature, info)
+    return info
+
+
+def get_image_cache_stats():
+    """메타데이터 캐시 적중/실패 횟수와 항목 수를 반환합니다."""
+    with _image_info_lock:
+        return dict(_image_cache_stats, entries=len(_image_info_cache))
+
+
+def clear_image_cache():
+    """메타데이터 캐시와 통계를 초기화합니다."""
+    with _image_info_lock:
+        _image_info_cache.clear()
+        _image_cache_stats['hits'] = 0
+        _image_cache_stats['misses'] = 0
+
+
+def close_image_archives():
+    """열어 둔 ZIP 파일을 모두 닫습니다 (작업이 끝난 뒤 ZIP 파일 잠금 해제)."""
+    with _archive_lock:
+        for _, archive, _ in _archive_cache.values():
+            archive.close()
+        _archive_cache.clear()
+
+
+def log_image_cache_stats(label):
+    stats = get_image_cache_stats()
+    print(f"DEBUG: [{label}] 이미지 메타데이터 캐시 - 적중 {stats['hits']}회, 실패 {stats['misses']}회, 항목 {stats['entries']}개")
+
+
+def validate_image_path(file_path, deep=False):
+    """이미지 파일의 경로 유효성 및 실제 이미지 여부를 검증합니다.
+
+    기본값은 헤더만 읽어 형식을 확인하며, deep=True이면 픽셀 데이터까지 모두 디코딩합니다.
+    """
+    info = get_image_info(file_path, deep)
+    return info['valid'], info['message']
+
+
+def get_image_size_mm(file_path):
+    """이미지 원본 크기를 DPI 기준 mm 단위로 반환합니다. 읽을 수 없으면 (None, None)."""
+    info = get_image_info(file_path)
+    return info['size_mm'] if info['valid'] else (None, None)
 
-    # 파일 크기 체크 (10MB 제한)
-    file_size = os.path.getsize(file_path)
-    if file_size > 10 * 1024 * 1024:
-        return False, f"파일 크기가 너무 큽니다 (10MB 제한): {file_size / (1024*1024):.1f}MB"
 
-    return True, "유효한 이미지 파일입니다."
+def get_image_aspect_ratio(file_path):
+    """이미지의 가로/세로 비율을 반환합니다. 읽을 수 없으면 None."""
+    info = get_image_info(file_path)
+    return info['aspect_ratio'] if info['valid'] else None
 
 def get_image_display_name(file_path):
     """이미지 파일의 표시 이름을 반환합니다."""
@@ -50,7 +325,10 @@ def get_image_display_name(file_path):
     return f"📷 {Path(file_path).name}"
 
 def normalize_image_path(file_path):
-    """이미지 경로를 정규화합니다."""
+    """이미지 경로를 정규화합니다 (ZIP 참조는 ZIP 경로만 절대 경로로 바꿈)."""
     if not file_path:
         return ""
-    return os.path.abspath(file_path)
\ No newline at end of file
+    archive_path, member = split_archive_path(file_path)
+    if archive_path is not None:
+        return make_archive_path(os.path.abspath(archive_path), member)
+    return os.path.abspath(file_path)
@@ -0,0 +1,179 @@
+import os
+import csv
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+# 엔진 단계 (요약 출력 순서)
+PHASES = ('acquire', 'open', 'fill', 'image', 'remove_fields', 'save', 'merge')
+
+# 스레드별 현재 작업 추적기 (엔진 함수에 인자를 추가하지 않고 span을 기록)
+_local = threading.local()
+
+
+def _percentile(sorted_values, q):
+    """정렬된 값의 q(0-100) 백분위수 (선형 보간)."""
+    if not sorted_values:
+        return 0.0
+    pos = (len(sorted_values) - 1) * q / 100
+    lower = int(pos)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (pos - lower)
+
+
+class JobTrace:
+    """병합 작업의 행별·단계별 소요 시간을 단조 시계(perf_counter)로 기록합니다.
+
+    span은 중첩될 수 있으며(fill 안의 image 등) 요약은 하위 span을 뺀 단독 시간(self_seconds)으로
+    계산하므로 단계별 시간의 합이 실제 경과 시간과 같습니다.
+    """
+
+    def __init__(self, **meta):
+        self.meta = meta
+        self.wall_start = time.time()
+        self._start = time.perf_counter()
+        self.spans = []
+        self._lock = threading.Lock()
+        self._stacks = threading.local()
+
+    def _stack(self):
+        if not hasattr(self._stacks, 'frames'):
+            self._stacks.frames = []
+        return self._stacks.frames
+
+    def begin(self, phase, row=None):
+        """단계 시작 - end()에 넘길 frame을 반환합니다. row가 없으면 바깥 span의 행을 사용."""
+        stack = self._stack()
+        if row is None and stack:
+            row = stack[-1]['row']
+        frame = {'phase': phase, 'row': None if row is None else int(row),
+                 'start': time.perf_counter(), 'child': 0.0}
+        stack.append(frame)
+        return frame
+
+    def end(self, frame):
+        end = time.perf_counter()
+        stack = self._stack()
+        if frame in stack:
+            # 예외로 닫히지 않은 안쪽 span이 있으면 함께 정리
+            while stack and stack[-1] is not frame:
+                stack.pop()
+            stack.pop()
+        seconds = end - frame['start']
+        if stack:
+            stack[-1]['child'] += seconds
+        span = {
+            'phase': frame['phase'],
+            'row': frame['row'],
+            'start': round(frame['start'] - self._start, 6),
+            'seconds': round(seconds, 6),
+            'self_seconds': round(max(0.0, seconds - frame['child']), 6),
+            'pid': os.getpid(),
+        }
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    @contextmanager
+    def span(self, phase, row=None):
+        frame = self.begin(phase, row)
+        try:
+            yield
+        finally:
+            self.end(frame)
+
+    def extend(self, spans, wall_start):
+        """다른 프로세스에서 기록한 span을 시작 시각 차이만큼 옮겨 합칩니다."""
+        offset = wall_start - self.wall_start
+        with self._lock:
+            for span in spans:
+                self.spans.append(dict(span, start=round(span['start'] + offset, 6)))
+
+    def elapsed(self):
+        return time.perf_counter() - self._start
+
+    def summary(self):
+        """{단계: {count, total, p50, p95, max}} (초, 단독 시간 기준)."""
+        by_phase = {}
+        with self._lock:
+            for span in self.spans:
+                by_phase.setdefault(span['phase'], []).append(span['self_seconds'])
+        ordered = [p for p in PHASES if p in by_phase] + sorted(p for p in by_phase if p not in PHASES)
+        result = {}
+        for phase in ordered:
+            values = sorted(by_phase[phase])
+            result[phase] = {
+                'count': len(values),
+                'total': round(sum(values), 4),
+                'p50': round(_percentile(values, 50), 4),
+                'p95': round(_percentile(values, 95), 4),
+                'max': round(values[-1], 4),
+            }
+        return result
+
+    def to_dict(self):
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s['start'])
+        return {
+            'meta': self.meta,
+            'started_at': self.wall_start,
+            'total_seconds': round(self.elapsed(), 4),
+            'summary': self.summary(),
+            'spans': spans,
+        }
+
+    def write(self, base_path):
+        """base_path.json(전체)과 base_path.csv(span 목록)를 쓰고 두 경로를 반환합니다."""
+        data = self.to_dict()
+        json_path = base_path + '.json'
+        csv_path = base_path + '.csv'
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        with open(csv_path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=['phase', 'row', 'start', 'seconds', 'self_seconds', 'pid'])
+            writer.writeheader()
+            writer.writerows(data['spans'])
+        print(f"DEBUG: 작업 추적 저장 - {json_path} ({len(data['spans'])}개 구간)")
+        return json_path, csv_path
+
+
+def activate(trace):
+    """현재 스레드의 엔진 호출이 trace에 기록되도록 설정합니다 (None이면 해제)."""
+    _local.trace = trace
+
+
+def current():
+    return getattr(_local, 'trace', None)
+
+
+@contextmanager
+def span(phase, row=None):
+    """현재 스레드에 활성화된 추적기에 단계를 기록합니다 (없으면 아무것도 하지 않음)."""
+    trace = current()
+    if trace is None:
+        yield
+        return
+    with trace.span(phase, row):
+        yield
+
+
+def begin(phase, row=None):
+    """긴 코드 블록용 - end()와 짝을 이룹니다. 추적기가 없으면 None."""
+    trace = current()
+    return (trace, trace.begin(phase, row)) if trace is not None else None
+
+
+def end(token):
+    if token is not None:
+        trace, frame = token
+        trace.end(frame)
+
+
+def format_summary(summary, phase_label=None):
+    """요약을 '단계  p50 / p95 (횟수)' 줄들로 만듭니다."""
+    lines = []
+    for phase, stats in summary.items():
+        label = phase_label(phase) if phase_label else phase
+        lines.append(f"{label}: {stats['p50']:.2f}s / {stats['p95']:.2f}s (x{stats['count']})")
+    return "\n".join(lines)
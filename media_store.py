@@ -0,0 +1,183 @@
+import os
+import re
+import time
+import hashlib
+import posixpath
+import tempfile
+import zipfile
+
+# 문서 패키지 안의 미디어 폴더 (docx, pptx, xlsx, hwpx)
+_OOXML_MEDIA_DIRS = ('word/media/', 'ppt/media/', 'xl/media/')
+_HWPX_MEDIA_DIR = 'BinData/'
+
+_RELS_TARGET_RE = re.compile(r'(Target=")([^"]+)(")')
+_HPF_ITEM_RE = re.compile(r'<(?:\w+:)?item\b[^>]*?/>')
+_ATTR_RE = r'\b{}="([^"]*)"'
+
+
+class MediaStore:
+    """내용 해시(SHA-256) 기준 미디어 저장소 - 같은 바이트는 한 번만 저장합니다.
+
+    add()는 처음 보는 내용이면 제안한 이름을 그대로 등록하고,
+    이미 있는 내용이면 먼저 등록된 이름을 돌려줍니다.
+    """
+
+    def __init__(self):
+        self._names = {}
+        self.references = 0
+        self.referenced_bytes = 0
+        self.stored_bytes = 0
+
+    def add(self, data, name):
+        self.references += 1
+        self.referenced_bytes += len(data)
+        digest = hashlib.sha256(data).hexdigest()
+        existing = self._names.get(digest)
+        if existing is not None:
+            return existing
+        self._names[digest] = name
+        self.stored_bytes += len(data)
+        return name
+
+    def __len__(self):
+        return len(self._names)
+
+    def report(self):
+        unique = len(self._names)
+        return {
+            'parts': self.references,
+            'unique': unique,
+            'referenced_bytes': self.referenced_bytes,
+            'stored_bytes': self.stored_bytes,
+            'ratio': (self.references / unique) if unique else 1.0,
+        }
+
+
+def _rewrite_package(file_path, drop, transform):
+    """패키지(zip)를 임시 파일로 다시 쓰고 원본과 교체합니다 (멤버 순서와 압축 방식 유지)."""
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(suffix=os.path.splitext(file_path)[1], dir=directory)
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(file_path) as src, zipfile.ZipFile(temp_path, 'w') as dst:
+            for info in src.infolist():
+                if info.filename in drop:
+                    continue
+                data = transform(info.filename, src.read(info))
+                dst.writestr(info, data, compress_type=info.compress_type)
+        os.replace(temp_path, file_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _collect_duplicates(archive, names):
+    store = MediaStore()
+    duplicates = {}
+    for name in names:
+        canonical = store.add(archive.read(name), name)
+        if canonical != name:
+            duplicates[name] = canonical
+    return store, duplicates
+
+
+def _dedupe_ooxml(file_path):
+    with zipfile.ZipFile(file_path) as archive:
+        media = [n for n in archive.namelist() if n.startswith(_OOXML_MEDIA_DIRS) and not n.endswith('/')]
+        store, duplicates = _collect_duplicates(archive, media)
+    if not duplicates:
+        return store
+
+    def fix_target(rels_name, match):
+        target = match.group(2)
+        if '://' in target:
+            return match.group(0)
+        # 관계 파일(foo/_rels/bar.xml.rels)의 기준 폴더는 foo/
+        base_dir = posixpath.dirname(posixpath.dirname(rels_name))
+        part = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join(base_dir, target))
+        canonical = duplicates.get(part)
+        if canonical is None:
+            return match.group(0)
+        new_target = '/' + canonical if target.startswith('/') else posixpath.relpath(canonical, base_dir or '.')
+        return match.group(1) + new_target + match.group(3)
+
+    def transform(name, data):
+        if name.endswith('.rels'):
+            text = data.decode('utf-8')
+            return _RELS_TARGET_RE.sub(lambda m: fix_target(name, m), text).encode('utf-8')
+        if name == '[Content_Types].xml':
+            text = data.decode('utf-8')
+            for part in duplicates:
+                text = re.sub(r'<Override[^>]*PartName="/{}"[^>]*/>'.format(re.escape(part)), '', text)
+            return text.encode('utf-8')
+        return data
+
+    _rewrite_package(file_path, set(duplicates), transform)
+    return store
+
+
+def _dedupe_hwpx(file_path):
+    with zipfile.ZipFile(file_path) as archive:
+        names = archive.namelist()
+        if 'Contents/content.hpf' not in names:
+            return None
+        manifest = archive.read('Contents/content.hpf').decode('utf-8')
+        # BinData 파일 경로 -> 매니페스트 item id
+        item_ids = {}
+        for item in _HPF_ITEM_RE.findall(manifest):
+            href = re.search(_ATTR_RE.format('href'), item)
+            item_id = re.search(_ATTR_RE.format('id'), item)
+            if href and item_id and href.group(1).startswith(_HWPX_MEDIA_DIR):
+                item_ids[href.group(1)] = item_id.group(1)
+        media = [n for n in names if n in item_ids]
+        store, duplicates = _collect_duplicates(archive, media)
+    if not duplicates:
+        return store
+
+    id_map = {item_ids[dup]: item_ids[canonical] for dup, canonical in duplicates.items()}
+    ref_re = re.compile(r'(binaryItemIDRef=")({})(")'.format('|'.join(re.escape(i) for i in id_map)))
+
+    def drop_item(match):
+        item_id = re.search(_ATTR_RE.format('id'), match.group(0))
+        return '' if item_id and item_id.group(1) in id_map else match.group(0)
+
+    def transform(name, data):
+        if name == 'Contents/content.hpf':
+            return _HPF_ITEM_RE.sub(drop_item, data.decode('utf-8')).encode('utf-8')
+        if name.startswith('Contents/') and name.endswith('.xml'):
+            text = data.decode('utf-8')
+            return ref_re.sub(lambda m: m.group(1) + id_map[m.group(2)] + m.group(3), text).encode('utf-8')
+        return data
+
+    _rewrite_package(file_path, set(duplicates), transform)
+    return store
+
+
+def dedupe_package_media(file_path):
+    """저장된 docx/pptx/xlsx/hwpx 파일에서 내용이 같은 미디어를 하나로 합칩니다.
+
+    모든 참조를 첫 번째 미디어 파트로 돌리고 나머지 복사본은 삭제합니다.
+    지원하지 않는 형식(.hwp, .doc, .ppt 등)이면 None을 반환합니다.
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext not in ('.docx', '.docm', '.pptx', '.pptm', '.xlsx', '.xlsm', '.hwpx'):
+        return None
+
+    start = time.perf_counter()
+    size_before = os.path.getsize(file_path)
+    try:
+        store = _dedupe_hwpx(file_path) if ext == '.hwpx' else _dedupe_ooxml(file_path)
+    except (OSError, zipfile.BadZipFile, UnicodeDecodeError) as e:
+        print(f"WARNING: 미디어 중복 제거 실패 (원본 유지): {e}")
+        return None
+    if store is None:
+        return None
+
+    report = store.report()
+    report['size_before'] = size_before
+    report['size_after'] = os.path.getsize(file_path)
+    report['saved_bytes'] = size_before - report['size_after']
+    report['seconds'] = time.perf_counter() - start
+    print(f"DEBUG: 미디어 중복 제거 - 파트 {report['parts']}개 → {report['unique']}개 "
+          f"(중복률 {report['ratio']:.1f}배), {report['saved_bytes'] / 1048576:.1f}MB 절감, {report['seconds']:.2f}초")
+    return report
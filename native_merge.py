@@ -0,0 +1,587 @@
+"""문서 프로그램(COM) 없이 .docx/.pptx/.hwpx 템플릿을 채우는 네이티브 엔진.
+
+자리 표시자가 있는 XML 파트를 한 번만 분석해 '미리 이스케이프한 바이트 조각'과 '값 자리(slot)'의 목록으로
+컴파일하고(template_cache에 저장), 행마다 XML을 다시 파싱하지 않고 b"".join 한 번으로 파트를 만듭니다.
+자리 표시자가 없는 zip 멤버(스타일, 테마, 글꼴, 미디어 등)는 템플릿 zip의 압축된 바이트를 풀지 않고 그대로 복사하며,
+값 자리가 있는 파트만 새로 압축합니다.
+압축 정책(store, fast, default, max)으로 속도와 파일 크기 중 무엇을 우선할지 정하며,
+값 자리가 있는 파트의 압축은 스레드 풀에서 여러 행을 동시에 처리합니다 (zlib는 압축 중 GIL을 놓음).
+
+채우는 대상은 COM 엔진과 같습니다.
+- Word: 본문·머리글·바닥글·각주·미주의 '{{열}}', '{열}' (run으로 나뉜 자리 표시자 포함)
+- PowerPoint: 슬라이드의 '{{열}}', '{열}'
+- 한글(HWPX): 누름틀 - 값을 넣은 뒤 COM 엔진의 remove_all_fields처럼 누름틀은 지우고 내용만 남김
+문서는 메모리에서 (행 키, 파일 이름, bytes)로 만들어 반환하며(iter_documents),
+개별 파일 저장과 ZIP 하나(output_archive)로 저장하는 방식은 모두 이 결과를 씁니다.
+텍스트 값만 넣을 수 있으므로 이미지 값, 표 셀 필드(HWPX), 통합본은 지원하지 않으며
+이때 UnsupportedTemplate을 발생시켜 COM 엔진이 처리하게 합니다.
+"""
+import io
+import os
+import re
+import zlib
+import struct
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from xml.sax.saxutils import unescape as _xml_unescape
+
+import job_trace
+import output_archive
+import row_values
+import template_cache
+import template_inspector
+
+# 템플릿 확장자별 형식 (바이너리 .doc/.ppt/.hwp는 지원하지 않음)
+FORMATS = {'.docx': 'word', '.pptx': 'ppt', '.hwpx': 'hwpx'}
+
+# 형식별로 자리 표시자를 찾을 XML 파트
+_PART_RES = {
+    'word': template_inspector._WORD_PART_RE,
+    'ppt': template_inspector._SLIDE_PART_RE,
+    'hwpx': template_inspector._SECTION_PART_RE,
+}
+
+# XML을 태그와 텍스트로 나눔 (OOXML/HWPX 파트에는 CDATA가 없음)
+_TOKEN_RE = re.compile(r"<[^>]*>|[^<]+")
+_TAG_RE = re.compile(r"<(/?)(?:([\w.-]+):)?([\w.-]+)")
+# 문단 텍스트의 자리 표시자 (XML 이스케이프된 상태에서 찾음, '{{x}}'가 '{x}'보다 우선)
+_PLACEHOLDER_RE = re.compile(r"\{\{([^{}<>\r\n]+)\}\}|\{([^{}<>\r\n]+)\}")
+
+# zip 로컬 파일 헤더 (zipfile.structFileHeader와 같은 형식)
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_LOCAL_HEADER_SIGNATURE = b"PK\003\004"
+# 범용 비트 플래그 3: 크기와 CRC를 데이터 뒤의 데이터 기술자에 씀
+_FLAG_DATA_DESCRIPTOR = 0x08
+
+# 압축 정책 -> (zip 압축 방식, zlib 수준)
+# store: 압축하지 않음 (가장 빠름, 나중에 따로 묶을 때), fast/default: 값 자리가 있는 파트를 수준 1/6으로 압축하고
+# 나머지 멤버는 템플릿 그대로, max: 모든 멤버를 수준 9로 (메일로 보낼 때처럼 파일 크기 우선)
+COMPRESSION_POLICIES = {
+    'store': (zipfile.ZIP_STORED, None),
+    'fast': (zipfile.ZIP_DEFLATED, 1),
+    'default': (zipfile.ZIP_DEFLATED, 6),
+    'max': (zipfile.ZIP_DEFLATED, 9),
+}
+DEFAULT_COMPRESSION = 'default'
+
+
+class UnsupportedTemplate(Exception):
+    """네이티브 엔진으로 처리할 수 없는 템플릿이나 데이터 (COM 엔진으로 처리)."""
+
+
+def template_format(template_path):
+    """네이티브 엔진이 다룰 수 있는 템플릿이면 'word', 'ppt', 'hwpx', 아니면 None."""
+    return FORMATS.get(os.path.splitext(template_path)[1].lower())
+
+
+# --- 컴파일 ---
+#
+# 파트는 다음 항목의 목록으로 컴파일됩니다 (pickle로 캐시에 저장할 수 있는 튜플).
+#   bytes                                    그대로 쓰는 XML 조각
+#   ('slot', 이름, 대체값, 앞, 뒤, 줄바꿈)    열이 있으면 앞 + 값 + 뒤, 없으면 대체값(원래 자리 표시자)
+#   ('hidden', 이름, 원문)                    열이 있으면 버리고, 없으면 원문 (여러 run에 걸친 자리 표시자의 나머지)
+
+def _attr(tag, name):
+    match = re.search(r'\s' + re.escape(name) + r'="([^"]*)"', tag)
+    return _xml_unescape(match.group(1)) if match else None
+
+
+def _preserve_space(tag):
+    """값 앞뒤 공백이 사라지지 않도록 w:t에 xml:space="preserve"를 붙입니다."""
+    if 'xml:space=' in tag:
+        return tag
+    return tag[:-1] + ' xml:space="preserve">'
+
+
+class _Paragraph:
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.nodes = []  # (out 위치, 텍스트, 여는 태그 위치)
+
+
+class _PartCompiler:
+    def __init__(self, fmt, xml):
+        self.fmt = fmt
+        self.tokens = _TOKEN_RE.findall(xml)
+        self.out = []
+        self.cell_fields = []
+
+    def _newline(self, prefix):
+        p = f"{prefix}:" if prefix else ""
+        if self.fmt == 'word':
+            return f'</{p}t><{p}br/><{p}t xml:space="preserve">'
+        if self.fmt == 'hwpx':
+            return f"<{p}lineBreak/>"
+        return None  # PowerPoint는 run 밖의 a:br이 필요해 줄바꿈 문자를 그대로 둠
+
+    def _skip_ctrl(self, i, prefix):
+        """i번째 <ctrl> 태그부터 짝이 맞는 </ctrl>까지 건너뛴 다음 위치를 반환합니다."""
+        depth = 0
+        while i < len(self.tokens):
+            m = _TAG_RE.match(self.tokens[i])
+            if m and m.group(3) == 'ctrl' and m.group(2) == prefix:
+                if m.group(1):
+                    depth -= 1
+                elif not self.tokens[i].endswith('/>'):
+                    depth += 1
+                if depth == 0:
+                    return i + 1
+            i += 1
+        return i
+
+    def _field_ctrl(self, i):
+        """HWPX <ctrl> 다음 태그가 누름틀 시작/끝이면 ('begin', 이름) / ('end', None)."""
+        if i + 1 >= len(self.tokens):
+            return None
+        m = _TAG_RE.match(self.tokens[i + 1])
+        if not m or m.group(1):
+            return None
+        if m.group(3) == 'fieldBegin':
+            kind = (_attr(self.tokens[i + 1], 'type') or 'CLICK_HERE').upper()
+            if kind in template_inspector._CLICK_HERE_TYPES:
+                return 'begin', _attr(self.tokens[i + 1], 'name') or ''
+        elif m.group(3) == 'fieldEnd':
+            return 'end', None
+        return None
+
+    def compile(self):
+        stack = []          # 열린 문단 (글상자 안 문단처럼 중첩될 수 있음)
+        text_open = None    # 열린 텍스트 요소(<w:t> 등)의 out 위치
+        field = None        # 열린 누름틀 이름 (HWPX)
+        tokens = self.tokens
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            if token[0] != '<':
+                if text_open is not None and stack:
+                    if field is not None:
+                        self.out.append(('hidden', field, token))
+                    else:
+                        stack[-1].nodes.append((len(self.out), token, text_open))
+                        self.out.append(token)
+                else:
+                    self.out.append(token)
+                i += 1
+                continue
+
+            m = _TAG_RE.match(token)
+            closing, prefix, local = (m.group(1), m.group(2), m.group(3)) if m else ('', None, '')
+            if local == 'ctrl' and not closing and self.fmt == 'hwpx':
+                found = self._field_ctrl(i)
+                if found:
+                    kind, name = found
+                    p = f"{prefix}:" if prefix else ""
+                    if kind == 'begin':
+                        field = name
+                        self.out.append(('slot', name, '', f"<{p}t>", f"</{p}t>", self._newline(prefix)))
+                    else:
+                        field = None
+                    i = self._skip_ctrl(i, prefix)
+                    continue
+            if local == 'tc' and not closing and self.fmt == 'hwpx':
+                name = _attr(token, 'name')
+                if name:
+                    self.cell_fields.append(name)
+
+            if local == 'p' and not token.endswith('/>'):
+                if not closing:
+                    stack.append(_Paragraph(prefix))
+                elif stack and stack[-1].prefix == prefix:
+                    self._resolve(stack.pop())
+            elif local == 't' and stack and prefix == stack[-1].prefix:
+                if closing:
+                    text_open = None
+                elif not token.endswith('/>'):
+                    text_open = len(self.out)
+            self.out.append(token)
+            i += 1
+        return self.out
+
+    def _resolve(self, paragraph):
+        """문단 텍스트(run을 이어 붙인 것)에서 자리 표시자를 찾아 텍스트 노드를 slot/hidden으로 바꿉니다."""
+        if self.fmt == 'hwpx' or not paragraph.nodes:
+            return  # HWPX는 COM 엔진처럼 누름틀만 채움
+        text = "".join(node_text for _, node_text, _ in paragraph.nodes)
+        matches = list(_PLACEHOLDER_RE.finditer(text))
+        if not matches:
+            return
+        newline = self._newline(paragraph.prefix)
+        start = 0
+        for out_index, node_text, open_index in paragraph.nodes:
+            end = start + len(node_text)
+            items, pos = [], start
+            for match in matches:
+                s, e = max(match.start(), start), min(match.end(), end)
+                if s >= e:
+                    continue
+                if s > pos:
+                    items.append(text[pos:s])
+                name = _xml_unescape(match.group(1) if match.group(1) is not None else match.group(2))
+                if match.start() >= start:
+                    items.append(('slot', name, text[s:e], '', '', newline))
+                    if self.fmt == 'word':
+                        self.out[open_index] = _preserve_space(self.out[open_index])
+                else:
+                    items.append(('hidden', name, text[s:e]))
+                pos = e
+            if items:
+                if pos < end:
+                    items.append(text[pos:end])
+                self.out[out_index] = items
+            start = end
+
+
+def _encode_items(out):
+    """문자열 조각은 이어 붙여 UTF-8 바이트로, slot/hidden은 그대로 둔 항목 목록."""
+    items, pending = [], []
+    for item in out:
+        for piece in (item if isinstance(item, list) else (item,)):
+            if isinstance(piece, str):
+                pending.append(piece)
+            else:
+                if pending:
+                    items.append("".join(pending).encode('utf-8'))
+                    pending = []
+                items.append(piece)
+    if pending:
+        items.append("".join(pending).encode('utf-8'))
+    return items
+
+
+def compile_part(fmt, xml_bytes):
+    """XML 파트 하나를 (항목 목록, 표 셀 필드 이름 목록)으로 컴파일합니다."""
+    compiler = _PartCompiler(fmt, xml_bytes.decode('utf-8'))
+    return _encode_items(compiler.compile()), compiler.cell_fields
+
+
+def compile_archive(archive, fmt):
+    """템플릿 zip을 컴파일한 dict (parts: {파트 이름: 항목 목록}, cell_fields)."""
+    part_re = _PART_RES[fmt]
+    parts, cell_fields = {}, []
+    for name in archive.namelist():
+        if not part_re.match(name):
+            continue
+        items, cells = compile_part(fmt, archive.read(name))
+        cell_fields.extend(cells)
+        if any(not isinstance(item, bytes) for item in items):
+            parts[name] = items
+    return {'format': fmt, 'parts': parts,
+            'cell_fields': list(dict.fromkeys(cell_fields))}
+
+
+def _build_compiled(path):
+    fmt = template_format(path)
+    with zipfile.ZipFile(path) as archive:
+        return compile_archive(archive, fmt)
+
+
+def compile_template(template_path):
+    """템플릿을 컴파일합니다 (결과는 template_cache의 'segments' 항목으로 재사용)."""
+    if template_format(template_path) is None:
+        raise UnsupportedTemplate(f"네이티브 엔진이 지원하지 않는 형식입니다: {os.path.basename(template_path)}")
+    try:
+        if not zipfile.is_zipfile(template_path):
+            raise UnsupportedTemplate(f"zip 형식 템플릿이 아닙니다: {os.path.basename(template_path)}")
+        compiled = template_cache.get(template_path, 'segments', _build_compiled)
+    except (OSError, zipfile.BadZipFile, KeyError, UnicodeDecodeError) as e:
+        raise UnsupportedTemplate(f"템플릿을 분석할 수 없습니다: {e}")
+    return compiled
+
+
+# --- zip 멤버 복사 ---
+
+def read_raw_members(path, skip=()):
+    """zip 멤버를 순서대로 [(ZipInfo, 압축된 데이터)]로 읽습니다 (압축을 풀지 않음, skip에 든 멤버는 데이터 None)."""
+    members = []
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as f:
+        for info in archive.infolist():
+            if info.filename in skip:
+                members.append((info, None))
+                continue
+            f.seek(info.header_offset)
+            header = _LOCAL_HEADER.unpack(f.read(_LOCAL_HEADER.size))
+            if header[0] != _LOCAL_HEADER_SIGNATURE:
+                raise zipfile.BadZipFile(f"로컬 파일 헤더가 올바르지 않습니다: {info.filename}")
+            # 로컬 헤더 뒤의 파일 이름과 추가 필드를 건너뜀
+            f.seek(header[10] + header[11], os.SEEK_CUR)
+            members.append((info, f.read(info.compress_size)))
+    return members
+
+
+def _member_info(info):
+    member = zipfile.ZipInfo(info.filename, info.date_time)
+    member.compress_type = info.compress_type
+    member.external_attr = info.external_attr
+    member.create_system = info.create_system
+    return member
+
+
+def compress(data, method, level=None):
+    """zip 멤버 데이터를 method(ZIP_STORED/ZIP_DEFLATED)로 압축합니다 (raw deflate, zip 헤더 없음)."""
+    if method == zipfile.ZIP_STORED:
+        return data
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION if level is None else level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+
+def encode_member(info, data, method, level=None):
+    """압축하지 않은 data를 info 이름의 멤버로 압축해 (ZipInfo, 압축된 데이터)를 반환합니다."""
+    member = _member_info(info)
+    member.compress_type = method
+    member.CRC = zlib.crc32(data)
+    member.file_size = len(data)
+    return member, compress(data, method, level)
+
+
+def apply_policy(members, method, level, archive):
+    """템플릿에서 복사할 멤버 [(ZipInfo, 압축된 데이터 또는 None)]를 압축 정책에 맞춥니다 (실행마다 한 번).
+
+    store는 압축을 풀어 두고, max는 다시 압축해 더 작아지는 멤버만 바꿉니다.
+    템플릿에서 압축하지 않은 멤버(HWPX의 mimetype 등)는 그대로 둡니다.
+    """
+    prepared = []
+    for info, raw in members:
+        if raw is not None and info.compress_type != zipfile.ZIP_STORED:
+            if method == zipfile.ZIP_STORED:
+                info, raw = encode_member(info, archive.read(info.filename), method)
+            elif level is not None and level >= 9:
+                member, data = encode_member(info, archive.read(info.filename), method, level)
+                if len(data) < len(raw):
+                    info, raw = member, data
+        prepared.append((info, raw))
+    return prepared
+
+
+def write_raw_member(out, info, data):
+    """압축된 데이터를 풀거나 다시 압축하지 않고 out(쓰기 모드 ZipFile)에 멤버로 추가합니다.
+
+    zipfile에는 압축된 바이트를 그대로 쓰는 공개 API가 없어 writestr과 같은 방식으로
+    로컬 헤더를 쓰고 중앙 디렉터리 목록(filelist)을 갱신합니다.
+    """
+    member = _member_info(info)
+    member.flag_bits = info.flag_bits & ~_FLAG_DATA_DESCRIPTOR
+    member.CRC = info.CRC
+    member.file_size = info.file_size
+    member.compress_size = len(data)
+    member.header_offset = out.fp.tell()
+    out.fp.write(member.FileHeader())
+    out.fp.write(data)
+    out.filelist.append(member)
+    out.NameToInfo[member.filename] = member
+    out.start_dir = out.fp.tell()
+    out._didModify = True
+
+
+# --- 행 렌더링 ---
+
+class BoundPart:
+    """열 위치를 정해 둔 파트 - 행마다 값 자리만 채워 b"".join 한 번으로 XML을 만듭니다.
+
+    pieces는 바이트 조각 목록(값 자리는 None), slots는 [(pieces 위치, 열 위치, 줄바꿈), ...]입니다.
+    """
+
+    def __init__(self, items, positions):
+        pieces, slots, pending = [], [], []
+        for item in items:
+            if isinstance(item, bytes):
+                pending.append(item)
+                continue
+            kind, name = item[0], item[1]
+            column = positions.get(name)
+            if kind == 'hidden':
+                if column is None:
+                    pending.append(item[2].encode('utf-8'))
+                continue
+            _, _, fallback, before, after, newline = item
+            if column is None:
+                pending.append(fallback.encode('utf-8'))
+                continue
+            pending.append(before.encode('utf-8'))
+            pieces.append(b"".join(pending))
+            pending = [after.encode('utf-8')]
+            slots.append((len(pieces), column, newline))
+            pieces.append(None)
+        pieces.append(b"".join(pending))
+        self.pieces = pieces
+        self.slots = slots
+        self.names = list(dict.fromkeys(item[1] for item in items
+                                        if not isinstance(item, bytes) and item[1] in positions))
+
+
+class NativeMerge:
+    """컴파일한 템플릿과 병합 데이터로 행마다 문서 파일을 만듭니다.
+
+    compression은 COMPRESSION_POLICIES의 이름, threads는 값 자리가 있는 파트를 압축할 스레드 수입니다
+    (None이면 CPU 수에 맞춤, 1이면 스레드를 쓰지 않음).
+    """
+
+    def __init__(self, template_path, dataframe, compiled=None, compression=None, threads=None):
+        policy = compression or DEFAULT_COMPRESSION
+        if policy not in COMPRESSION_POLICIES:
+            raise ValueError(f"지원하지 않는 압축 정책입니다: {policy}")
+        self.compression = policy
+        self.method, self.level = COMPRESSION_POLICIES[policy]
+        self.threads = max(1, threads if threads else min(4, os.cpu_count() or 1))
+        self.template_path = os.path.abspath(template_path)
+        self.rows = row_values.prepare_rows(dataframe)
+        self.compiled = compiled or compile_template(self.template_path)
+        self.format = self.compiled['format']
+        positions = self.rows.positions
+
+        cells = [name for name in self.compiled['cell_fields'] if name in positions]
+        if cells:
+            raise UnsupportedTemplate(f"표 셀 필드는 네이티브 엔진이 지원하지 않습니다: {cells}")
+        self.parts = {name: BoundPart(items, positions) for name, items in self.compiled['parts'].items()}
+        used = {name for part in self.parts.values() for name in part.names}
+        images = [name for name in self.rows.image_columns() if name in used]
+        if images:
+            raise UnsupportedTemplate(f"이미지 값은 네이티브 엔진이 지원하지 않습니다: {images}")
+
+        try:
+            # 자리 표시자가 없는 멤버는 압축된 바이트를 한 번 읽어(정책에 맞춰 한 번 변환) 모든 출력에 그대로 씀
+            with zipfile.ZipFile(self.template_path) as archive:
+                self.members = apply_policy(read_raw_members(self.template_path, skip=self.parts),
+                                            self.method, self.level, archive)
+        except (OSError, zipfile.BadZipFile, struct.error, zlib.error) as e:
+            raise UnsupportedTemplate(f"템플릿 zip을 읽을 수 없습니다: {e}")
+        self._encoded = {}
+        # 스레드에서 읽기만 하도록 값 바이트를 미리 변환
+        for part in self.parts.values():
+            for _, column, newline in part.slots:
+                self._column_bytes(column, newline)
+
+    def _column_bytes(self, column, newline):
+        """열 하나의 행별 값을 XML에 바로 넣을 바이트로 (처음 요청할 때 열 전체를 한 번에 변환)."""
+        key = (column, newline)
+        encoded = self._encoded.get(key)
+        if encoded is None:
+            encoded = []
+            for value in self.rows.escaped_column(column):
+                if newline and ('\n' in value or '\r' in value):
+                    value = value.replace('\r\n', '\n').replace('\r', '\n').replace('\n', newline)
+                encoded.append(value.encode('utf-8'))
+            self._encoded[key] = encoded
+        return encoded
+
+    def render_part(self, name, position):
+        """position번째 행으로 채운 파트 XML (바이트)."""
+        part = self.parts[name]
+        pieces = list(part.pieces)
+        for index, column, newline in part.slots:
+            pieces[index] = self._column_bytes(column, newline)[position]
+        return b"".join(pieces)
+
+    def encode_parts(self, position):
+        """position번째 행의 값 자리가 있는 파트를 채우고 압축해 {파트 이름: (ZipInfo, 압축된 데이터)}로 반환합니다."""
+        return {info.filename: encode_member(info, self.render_part(info.filename, position), self.method, self.level)
+                for info, raw in self.members if raw is None}
+
+    def _pipeline(self, work, positions=None, max_pending=None):
+        """(행 위치, work(행 위치))를 행 순서대로 반환합니다.
+
+        압축하는 정책이고 threads가 2 이상이면 스레드 풀에서 앞선 행들을 미리 처리합니다.
+        미리 처리해 두는 행은 max_pending개(기본 threads의 4배)로 제한해 메모리 사용량을 일정하게 유지합니다.
+        """
+        positions = range(len(self.rows)) if positions is None else positions
+        if self.threads < 2 or self.method == zipfile.ZIP_STORED:
+            for position in positions:
+                yield position, work(position)
+            return
+        depth = max(1, max_pending or self.threads * 4)
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            try:
+                for position in positions:
+                    pending.append((position, executor.submit(work, position)))
+                    if len(pending) >= depth:
+                        done, future = pending.popleft()
+                        yield done, future.result()
+                while pending:
+                    done, future = pending.popleft()
+                    yield done, future.result()
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
+    def iter_encoded(self, positions=None, max_pending=None):
+        """(행 위치, encode_parts 결과)를 행 순서대로 반환합니다."""
+        return self._pipeline(self.encode_parts, positions, max_pending)
+
+    def write_document(self, position, path, parts=None):
+        """position번째 행의 문서를 path(경로 또는 파일 객체)에 zip으로 씁니다 (멤버 순서는 템플릿과 같게).
+
+        값 자리가 있는 파트(parts: encode_parts 결과, 없으면 여기서 만듦)만 압축하고
+        나머지 멤버는 압축 정책에 맞춰 준비해 둔 바이트를 그대로 복사합니다.
+        """
+        if parts is None:
+            parts = self.encode_parts(position)
+        with zipfile.ZipFile(path, 'w') as out:
+            for info, raw in self.members:
+                if raw is None:
+                    info, raw = parts[info.filename]
+                write_raw_member(out, info, raw)
+
+    def document_bytes(self, position):
+        """position번째 행의 문서를 파일에 쓰지 않고 메모리에서 만들어 bytes로 반환합니다."""
+        buffer = io.BytesIO()
+        self.write_document(position, buffer)
+        return buffer.getvalue()
+
+    def iter_documents(self, name_pattern=None, max_pending=None, progress_callback=None):
+        """행마다 (행 키, 파일 이름, 문서 bytes)를 행 순서대로 반환합니다 (디스크에 쓰지 않음).
+
+        행 키는 DataFrame의 인덱스 값, 파일 이름은 name_pattern('{열}' 패턴, output_archive.FileNamer)으로 정하며
+        패턴이 없으면 '<템플릿 이름>_row_<번호><확장자>'입니다.
+        미리 만들어 두는 문서는 max_pending개로 제한하므로 행 수와 관계없이 메모리 사용량이 일정합니다.
+        progress_callback의 진행률은 호출한 쪽이 문서를 받아 처리를 마친 뒤에 보냅니다.
+        """
+        namer = output_archive.FileNamer(self.template_path, self.rows.names, name_pattern)
+        total_rows = len(self.rows)
+        last_percent = -1
+        documents = self._pipeline(self.document_bytes, max_pending=max_pending)
+        for done in range(total_rows):
+            index = self.rows.index[done]
+            with job_trace.span('fill', index):
+                position, data = next(documents)
+            row = self.rows.row(position)
+            yield row.index, namer.name(row), data
+            percent = int(((done + 1) / total_rows) * 100)
+            if progress_callback and percent != last_percent:
+                progress_callback.emit(percent)
+                last_percent = percent
+        print(f"DEBUG: 네이티브 엔진으로 {total_rows}개 문서 생성 ({self.format}, 채우는 파트 {len(self.parts)}개, "
+              f"압축 {self.compression}, 스레드 {self.threads}개)")
+
+    def process_individual(self, progress_callback=None):
+        """행마다 템플릿 폴더에 '<이름>_row_<번호><확장자>'를 만들고 결과 메시지를 반환합니다."""
+        output_dir = os.path.dirname(self.template_path)
+        for index, filename, data in self.iter_documents(progress_callback=progress_callback):
+            with job_trace.span('save', index):
+                with open(os.path.join(output_dir, filename), 'wb') as f:
+                    f.write(data)
+        return f"INDIVIDUAL_DONE|{output_dir}|{len(self.rows)}"
+
+    def process_archive(self, archive_path, name_pattern=None, progress_callback=None):
+        """모든 문서를 파일로 쓰지 않고 ZIP 하나(archive_path)에 바로 넣고 결과 메시지를 반환합니다.
+
+        ZIP 안의 파일 이름은 name_pattern('{열}' 패턴)으로 정합니다.
+        압축하지 않는 정책(store)이면 ZIP에 넣을 때 압축합니다.
+        """
+        with output_archive.ArchiveWriter(archive_path, compress=self.method == zipfile.ZIP_STORED) as archive:
+            for index, filename, data in self.iter_documents(name_pattern, progress_callback=progress_callback):
+                with job_trace.span('save', index):
+                    archive.add_bytes(filename, data)
+        return f"ARCHIVE_DONE|{archive.path}|{archive.count}"
+
+
+def open_merge(template_path, dataframe, output_type='individual', options=None):
+    """네이티브 엔진으로 처리할 수 있으면 NativeMerge를, 아니면 UnsupportedTemplate을 발생시킵니다.
+
+    options는 {'compression': 압축 정책, 'threads': 압축 스레드 수} (값이 None이면 기본값)입니다.
+    """
+    if output_type not in ('individual', 'archive'):
+        raise UnsupportedTemplate("통합본은 네이티브 엔진이 지원하지 않습니다")
+    options = options or {}
+    return NativeMerge(template_path, dataframe, compression=options.get('compression'),
+                       threads=options.get('threads'))
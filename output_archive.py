@@ -0,0 +1,146 @@
+"""개별 문서를 파일마다 폴더에 두지 않고 ZIP 하나로 바로 묶어 저장합니다.
+
+문서가 만들어질 때마다 ZIP에 추가하므로 행이 많아도 폴더에 파일이 쌓이지 않습니다.
+네이티브 엔진은 만든 바이트를 그대로 넣고, 파일로 저장해야 하는 COM 엔진은 임시 파일에 저장한 뒤
+바로 ZIP에 옮기고 지웁니다. ZIP64를 쓰므로 문서 수·전체 크기 제한이 없습니다.
+ZIP 안의 파일 이름은 '{이름}_{학번}'처럼 열 이름을 쓴 패턴으로 정합니다.
+"""
+import os
+import re
+import time
+import shutil
+import tempfile
+import zipfile
+
+import placeholders
+
+# 파일 이름에 쓸 수 없는 문자 (Windows 기준)
+_INVALID_NAME_RE = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+_MAX_NAME_LENGTH = 150
+
+
+def default_archive_path(template_path):
+    """ZIP 기본 저장 경로 (템플릿 폴더의 '<이름>_documents.zip')."""
+    base = os.path.splitext(os.path.abspath(template_path))[0]
+    return f"{base}_documents.zip"
+
+
+def sanitize_name(name):
+    """파일 이름에 쓸 수 없는 문자를 '_'로 바꾸고 너무 길면 자릅니다."""
+    name = _INVALID_NAME_RE.sub("_", name).strip().rstrip(". ")
+    return name[:_MAX_NAME_LENGTH]
+
+
+def pattern_columns(pattern, columns):
+    """파일 이름 패턴이 쓰는 열 이름 목록 (템플릿이 쓰지 않아도 열 정리에서 남겨야 함)."""
+    if not pattern:
+        return []
+    return placeholders.PlaceholderScanner([str(column) for column in columns]).names(pattern)
+
+
+class FileNamer:
+    """행 값으로 문서 파일 이름을 만듭니다.
+
+    pattern의 '{열}' (또는 '{{열}}')은 그 행의 값으로, 같은 이름의 열이 없는 '{row}'는 행 번호로 바꿉니다.
+    pattern이 없거나 결과가 비면 개별 저장과 같은 '<템플릿 이름>_row_<번호>'를 씁니다.
+    이름이 겹치면 '_2', '_3'을 붙입니다.
+    """
+
+    def __init__(self, template_path, names, pattern=None, ext=None):
+        self.base_name, template_ext = os.path.splitext(os.path.basename(template_path))
+        self.ext = ext or template_ext
+        self.pattern = pattern or None
+        scanner = placeholders.PlaceholderScanner(list(names) + ['row'])
+        self._scanner = scanner
+        self._fields = scanner.names(self.pattern) if self.pattern else []
+        self._used = set()
+
+    def name(self, row):
+        """row(row_values.MergeRow)의 파일 이름 (확장자 포함, 같은 이름이 나오면 번호를 붙임)."""
+        number = str(row.index + 1)
+        stem = ""
+        if self.pattern:
+            values = {name: row.get(name, number if name == 'row' else "") for name in self._fields}
+            stem = sanitize_name(self._scanner.substitute(self.pattern, values))
+        if not stem:
+            stem = f"{self.base_name}_row_{number}"
+        candidate, counter = stem, 1
+        while (candidate + self.ext).lower() in self._used:
+            counter += 1
+            candidate = f"{stem}_{counter}"
+        self._used.add((candidate + self.ext).lower())
+        return candidate + self.ext
+
+
+class ArchiveWriter:
+    """문서를 만들 때마다 ZIP 하나에 추가합니다 (with 문으로 사용, 실패하면 만들던 ZIP을 지움).
+
+    문서 파일(.docx, .hwp 등)은 이미 압축되어 있으므로 기본으로 압축 없이 넣습니다 (compress=True면 deflate).
+    namer(FileNamer)는 저장된 파일을 옮기는 add_file에서 ZIP 안의 이름을 정할 때 씁니다.
+    """
+
+    def __init__(self, path, namer=None, compress=False):
+        self.path = os.path.abspath(path)
+        self.namer = namer
+        self.compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        self.count = 0
+        self._temp_path = self.path + ".part"
+        self._temp_dir = None
+        self._archive = zipfile.ZipFile(self._temp_path, 'w', self.compress_type, allowZip64=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def add_bytes(self, name, data):
+        """메모리에서 만든 문서를 name으로 추가합니다."""
+        self._archive.writestr(zipfile.ZipInfo(name, time.localtime()[:6]), data, self.compress_type)
+        self.count += 1
+
+    def temp_path(self, row):
+        """COM 엔진이 문서를 저장할 임시 경로 (add_file로 ZIP에 옮기면 지워짐)."""
+        if self._temp_dir is None:
+            self._temp_dir = tempfile.mkdtemp(prefix="yongmerge_archive_")
+        return os.path.join(self._temp_dir, f"row_{row.index + 1}{self.namer.ext}")
+
+    def add_file(self, row, path):
+        """저장된 문서 파일을 ZIP에 옮기고(원본 삭제) ZIP 안의 이름을 반환합니다.
+
+        파일을 먼저 열어 보므로 문서 프로그램이 아직 잠그고 있으면 ZIP에 아무것도 쓰지 않고 OSError가 나며,
+        같은 행으로 다시 시도해도 이름이 겹치지 않습니다. ZIP에 넣은 뒤 원본 삭제에 실패하면 close에서 지웁니다.
+        """
+        with open(path, 'rb') as source:
+            name = self.namer.name(row)
+            info = zipfile.ZipInfo.from_file(path, name)
+            info.compress_type = self.compress_type
+            with self._archive.open(info, 'w') as target:
+                shutil.copyfileobj(source, target, 1024 * 1024)
+        self.count += 1
+        try:
+            os.remove(path)
+        except OSError as e:
+            print(f"DEBUG: ZIP에 넣은 임시 파일 삭제 실패 (작업 끝에 정리): {e}")
+        return name
+
+    def close(self):
+        self._archive.close()
+        os.replace(self._temp_path, self.path)
+        self._cleanup()
+
+    def abort(self):
+        try:
+            self._archive.close()
+        finally:
+            if os.path.exists(self._temp_path):
+                os.remove(self._temp_path)
+            self._cleanup()
+
+    def _cleanup(self):
+        if self._temp_dir:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+            self._temp_dir = None
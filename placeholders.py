@@ -0,0 +1,65 @@
+"""템플릿 자리 표시자('{{필드}}', '{필드}') 검색.
+
+열 이름 목록을 정규식 하나로 미리 컴파일해 텍스트를 한 번만 훑어 모든 자리 표시자를 찾습니다.
+같은 위치에서는 긴 형식이 우선이므로 '{{x}}' 안의 '{x}'를 따로 찾지 않습니다.
+"""
+import re
+
+
+def _name(match):
+    # 1번 그룹: '{{이름}}', 2번 그룹: '{이름}'
+    return match.group(1) if match.group(1) is not None else match.group(2)
+
+
+def format_placeholder(name, short=False):
+    """필드 이름을 문서에 넣을 자리 표시자로 만듭니다 (short=True면 '{필드}')."""
+    return f"{{{name}}}" if short else f"{{{{{name}}}}}"
+
+
+class PlaceholderScanner:
+    """열 이름 집합으로 컴파일한 자리 표시자 검색기.
+
+    columns의 각 항목은 str()로 바꾼 이름으로 찾으며, column(name)으로 원래 열 키를 돌려받습니다.
+    """
+
+    def __init__(self, columns):
+        self.columns = {}
+        for column in columns:
+            self.columns.setdefault(str(column), column)
+        if self.columns:
+            # 이름이 서로의 앞부분인 경우에도 항상 같은 결과가 나오도록 긴 이름부터 시도
+            names = "|".join(re.escape(name) for name in sorted(self.columns, key=len, reverse=True))
+            self.pattern = re.compile(r"\{(?:\{(" + names + r")\}\}|(" + names + r")\})")
+        else:
+            self.pattern = None
+
+    def column(self, name):
+        return self.columns[name]
+
+    def finditer(self, text):
+        """(시작, 끝, 이름, 자리 표시자) 를 나타나는 순서대로 반환합니다."""
+        if self.pattern is None or not text:
+            return
+        for match in self.pattern.finditer(text):
+            yield match.start(), match.end(), _name(match), match.group(0)
+
+    def names(self, text):
+        """텍스트에 들어 있는 필드 이름 (나타나는 순서, 중복 제거)."""
+        return list(dict.fromkeys(name for _, _, name, _ in self.finditer(text)))
+
+    def tokens(self, text):
+        """텍스트에 들어 있는 [(자리 표시자, 이름), ...] - 긴 형식('{{x}}')이 앞에 오도록 정렬.
+
+        문자열 찾아 바꾸기로 차례로 교체할 때 '{x}'를 먼저 바꿔 '{{x}}'가 깨지는 일을 막습니다.
+        """
+        found = dict((token, name) for _, _, name, token in self.finditer(text))
+        return sorted(found.items(), key=lambda item: len(item[0]) - len(item[1]), reverse=True)
+
+    def substitute(self, text, values):
+        """자리 표시자를 values[이름]으로 한 번에 바꿉니다 (values에 없는 이름은 그대로 둠)."""
+        if self.pattern is None or not text:
+            return text
+
+        def replace(match):
+            return values.get(_name(match), match.group(0))
+        return self.pattern.sub(replace, text)
@@ -1,54 +1,70 @@
 import os
 import time
-import win32com.client
-import pandas as pd
+import com_factory
 import tempfile
 import image_utils
+import image_pipeline
+import job_trace
+import placeholders
+import row_values
+import com_probe
 import shutil
-from PIL import Image
 
 def get_ppt_instance():
     """PowerPoint 인스턴스를 기존 작업에 방해되지 않게 독립적으로 생성합니다."""
     print("DEBUG: PowerPoint 인스턴스 확보 중...")
     try:
-        # DispatchEx를 사용하여 기존 창과 분리된 새 프로세스 생성
-        ppt = win32com.client.DispatchEx("PowerPoint.Application")
+        # DispatchEx(com_factory.dispatch)를 사용하여 기존 창과 분리된 새 프로세스 생성
+        with job_trace.span('acquire'):
+            ppt = com_factory.dispatch("PowerPoint.Application")
         print("DEBUG: 독립적인 PowerPoint 프로세스를 생성했습니다.")
     except Exception as e:
         raise Exception(f"PowerPoint 실행 실패: {e}")
     
     ppt.Visible = True
-    return ppt
+    # 계측이 켜져 있으면 COM 호출 횟수·지연 시간을 기록하는 프록시로 감쌈
+    return com_probe.wrap(ppt, 'ppt')
 
-def insert_image_to_ppt_from_shape(slide, rectangle_shape, image_path):
-    """도형(사각형)의 위치와 크기에 맞춰 이미지를 삽입합니다."""
+def insert_image_to_ppt_from_shape(slide, rectangle_shape, image_path, prepared=None):
+    """도형(사각형)의 위치와 크기에 맞춰 이미지를 삽입합니다.
+
+    prepared가 있으면 ImagePrefetcher가 미리 검증·측정한 결과를 사용합니다.
+    """
     try:
-        is_valid, message = image_utils.validate_image_path(image_path)
-        if not is_valid: return False
+        if prepared is not None:
+            if not prepared['valid']: return False
+            abs_path = prepared['path']
+            img_ratio = prepared['aspect_ratio']
+        else:
+            is_valid, message = image_utils.validate_image_path(image_path)
+            if not is_valid: return False
+            if image_utils.is_archive_path(image_path):
+                # ZIP 안의 이미지는 임시 파일로 추출해서 삽입
+                with image_utils.local_image_path(image_path) as local_path:
+                    return insert_image_to_ppt_from_shape(slide, rectangle_shape, local_path)
+            abs_path = os.path.abspath(image_path)
+            img_ratio = None
 
-        abs_path = os.path.abspath(image_path)
         left = rectangle_shape.Left
         top = rectangle_shape.Top
         width = rectangle_shape.Width
         height = rectangle_shape.Height
 
-        # 원본 비율 유지 계산
+        # 원본 비율 유지 계산 (검증 시 읽은 메타데이터 캐시 사용)
         try:
-            with Image.open(abs_path) as img:
-                img_w, img_h = img.size
-                img_ratio = img_w / img_h
-                rect_ratio = width / height
-
-                if img_ratio > rect_ratio:
-                    final_w = width
-                    final_h = width / img_ratio
-                else:
-                    final_h = height
-                    final_w = height * img_ratio
-
-                # 중앙 정렬
-                final_left = left + (width - final_w) / 2
-                final_top = top + (height - final_h) / 2
+            img_ratio = img_ratio or image_utils.get_image_aspect_ratio(abs_path)
+            rect_ratio = width / height
+
+            if img_ratio > rect_ratio:
+                final_w = width
+                final_h = width / img_ratio
+            else:
+                final_h = height
+                final_w = height * img_ratio
+
+            # 중앙 정렬
+            final_left = left + (width - final_w) / 2
+            final_top = top + (height - final_h) / 2
         except:
             final_left, final_top, final_w, final_h = left, top, width, height
 
@@ -61,8 +77,9 @@ def insert_image_to_ppt_from_shape(slide, rectangle_shape, image_path):
         print(f"ERROR: PPT 이미지 삽입 오류: {e}")
         return False
 
-def process_ppt_template(dataframe, template_file_path, output_type, progress_callback, save_path=None, image_width=None, image_height=None, debug_mode=False):
-    """PPT 자동화 메인 로직"""
+def process_ppt_template(dataframe, template_file_path, output_type, progress_callback, save_path=None, image_width=None, image_height=None, debug_mode=False, image_options=None, output_sink=None):
+    """PPT 자동화 메인 로직 (output_sink가 있으면 개별 문서를 ZIP에 넣음)"""
+    dataframe = image_pipeline.prepare_dataframe_images(dataframe, image_options)
     ppt = get_ppt_instance()
     
     try:
@@ -70,10 +87,12 @@ def process_ppt_template(dataframe, template_file_path, output_type, progress_ca
         ppt.DisplayAlerts = 0
 
         if output_type == 'individual':
-            return process_individual_ppt(ppt, dataframe, template_file_path, progress_callback)
+            return process_individual_ppt(ppt, dataframe, template_file_path, progress_callback, output_sink)
         elif output_type == 'combined':
             return process_combined_ppt(ppt, dataframe, template_file_path, progress_callback, save_path)
     finally:
+        image_utils.log_image_cache_stats("PPT")
+        image_utils.close_image_archives()
         # 개별 작업 시에는 프로세스 종료, 통합본일 경우 사용자가 볼 수 있게 유지할지 여부 판단
         if output_type == 'individual':
             try: ppt.Quit()
@@ -82,44 +101,59 @@ def process_ppt_template(dataframe, template_file_path, output_type, progress_ca
             # 통합본 저장 후에는 Visible 유지 (사용자 확인용)
             pass
 
-def process_individual_ppt(ppt, dataframe, template_file_path, progress_callback):
+def fill_presentation(pres, scanner, row, prepared_images):
+    """슬라이드의 텍스트 상자마다 자리 표시자를 한 번에 찾아 값으로 바꾸고, 이미지 자리는 그림으로 교체합니다."""
+    for slide in pres.Slides:
+        shapes_to_delete = []
+        for shape in slide.Shapes:
+            if not (shape.HasTextFrame and shape.TextFrame.HasText):
+                continue
+            txt = shape.TextFrame.TextRange.Text
+            names = scanner.names(txt)
+            if not names:
+                continue
+            values = {name: row.get(name) for name in names}
+            images = [values[name] for name in names if row.is_image(name)]
+            if images:
+                for image_path in images:
+                    with job_trace.span('image'):
+                        insert_image_to_ppt_from_shape(slide, shape, image_path, prepared_images.get(image_path))
+                shapes_to_delete.append(shape)
+            else:
+                shape.TextFrame.TextRange.Text = scanner.substitute(txt, values)
+
+        for s in shapes_to_delete:
+            try: s.Delete()
+            except: pass
+
+def process_individual_ppt(ppt, dataframe, template_file_path, progress_callback, output_sink=None):
     output_dir = os.path.dirname(template_file_path)
     base_name = os.path.splitext(os.path.basename(template_file_path))[0]
     total_rows = len(dataframe)
+    rows = row_values.prepare_rows(dataframe)
+    scanner = placeholders.PlaceholderScanner(rows.names)
 
-    for index, row in dataframe.iterrows():
-        if progress_callback: progress_callback.emit(int(((index + 1) / total_rows) * 100))
+    # 파일 이름은 행 인덱스, 진행률은 처리 순서 기준
+    for position, (index, row, prepared_images) in enumerate(image_pipeline.ImagePrefetcher(rows)):
+        if progress_callback: progress_callback.emit(int(((position + 1) / total_rows) * 100))
         
         abs_path = os.path.abspath(template_file_path)
-        pres = ppt.Presentations.Open(abs_path, Untitled=-1, WithWindow=False)
+        with job_trace.span('open', index):
+            pres = ppt.Presentations.Open(abs_path, Untitled=-1, WithWindow=False)
         
         try:
-            for slide in pres.Slides:
-                shapes_to_delete = []
-                for shape in slide.Shapes:
-                    if shape.HasTextFrame and shape.TextFrame.HasText:
-                        txt = shape.TextFrame.TextRange.Text
-                        new_txt = txt
-                        for col in dataframe.columns:
-                            field_val = str(row[col]) if pd.notna(row[col]) else ""
-                            for p in [f'{{{{{col}}}}}', f'{{{col}}}']:
-                                if p in txt:
-                                    if image_utils.is_image_file(field_val):
-                                        insert_image_to_ppt_from_shape(slide, shape, field_val)
-                                        shapes_to_delete.append(shape)
-                                    else:
-                                        new_txt = new_txt.replace(p, field_val)
-                        
-                        if shape not in shapes_to_delete:
-                            shape.TextFrame.TextRange.Text = new_txt
-                
-                for s in shapes_to_delete:
-                    try: s.Delete()
-                    except: pass
+            with job_trace.span('fill', index):
+                fill_presentation(pres, scanner, row, prepared_images)
             
-            output_file = os.path.join(output_dir, f"{base_name}_row_{index+1}.pptx")
-            pres.SaveAs(os.path.abspath(output_file))
-            pres.Close()
+            if output_sink is not None:
+                output_file = output_sink.temp_path(row)
+            else:
+                output_file = os.path.join(output_dir, f"{base_name}_row_{index+1}.pptx")
+            with job_trace.span('save', index):
+                pres.SaveAs(os.path.abspath(output_file))
+                pres.Close()
+                if output_sink is not None:
+                    output_sink.add_file(row, os.path.abspath(output_file))
         except Exception as e:
             print(f"ERROR: 행 {index+1} 처리 중 오류: {e}")
             try: pres.Close()
@@ -129,44 +163,30 @@ def process_individual_ppt(ppt, dataframe, template_file_path, progress_callback
 
 def process_combined_ppt(ppt, dataframe, template_file_path, progress_callback, save_path):
     total_rows = len(dataframe)
+    rows = row_values.prepare_rows(dataframe)
+    scanner = placeholders.PlaceholderScanner(rows.names)
     temp_dir = tempfile.mkdtemp()
     temp_files = []
 
     try:
         # Stage 1: 임시 파일 생성
-        for index, row in dataframe.iterrows():
+        for index, row, prepared_images in image_pipeline.ImagePrefetcher(rows):
             if progress_callback: progress_callback.emit(int(((index + 1) / total_rows) * 50))
             abs_path = os.path.abspath(template_file_path)
-            pres = ppt.Presentations.Open(abs_path, Untitled=-1, WithWindow=False)
+            with job_trace.span('open', index):
+                pres = ppt.Presentations.Open(abs_path, Untitled=-1, WithWindow=False)
             
-            # (텍스트/이미지 교체 로직은 위와 동일)
-            for slide in pres.Slides:
-                shapes_to_delete = []
-                for shape in slide.Shapes:
-                    if shape.HasTextFrame and shape.TextFrame.HasText:
-                        txt = shape.TextFrame.TextRange.Text
-                        new_txt = txt
-                        for col in dataframe.columns:
-                            field_val = str(row[col]) if pd.notna(row[col]) else ""
-                            for p in [f'{{{{{col}}}}}', f'{{{col}}}']:
-                                if p in txt:
-                                    if image_utils.is_image_file(field_val):
-                                        insert_image_to_ppt_from_shape(slide, shape, field_val)
-                                        shapes_to_delete.append(shape)
-                                    else:
-                                        new_txt = new_txt.replace(p, field_val)
-                        if shape not in shapes_to_delete:
-                            shape.TextFrame.TextRange.Text = new_txt
-                for s in shapes_to_delete:
-                    try: s.Delete()
-                    except: pass
+            with job_trace.span('fill', index):
+                fill_presentation(pres, scanner, row, prepared_images)
             
             t_path = os.path.join(temp_dir, f"temp_{index:04d}.pptx")
-            pres.SaveAs(os.path.abspath(t_path))
-            pres.Close()
+            with job_trace.span('save', index):
+                pres.SaveAs(os.path.abspath(t_path))
+                pres.Close()
             temp_files.append(t_path)
 
         # Stage 2: 병합
+        merge_span = job_trace.begin('merge')
         combined_pres = ppt.Presentations.Add(WithWindow=True)
         for i, f in enumerate(temp_files):
             if progress_callback: progress_callback.emit(50 + int((i / len(temp_files)) * 50))
@@ -175,8 +195,12 @@ def process_combined_ppt(ppt, dataframe, template_file_path, progress_callback,
                 s.Copy()
                 combined_pres.Slides.Paste(combined_pres.Slides.Count + 1)
             src.Close()
+        job_trace.end(merge_span)
         
-        combined_pres.SaveAs(os.path.abspath(save_path))
+        with job_trace.span('save'):
+            combined_pres.SaveAs(os.path.abspath(save_path))
+            # 저장 후 닫아서 파일 잠금 해제 (미디어 중복 제거 후 완료 처리에서 다시 열림)
+            combined_pres.Close()
         return f"COMBINED_DONE|{save_path}|{len(temp_files)}"
     finally:
         shutil.rmtree(temp_dir, ignore_errors=True)
\ No newline at end of file
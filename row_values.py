@@ -0,0 +1,114 @@
+"""병합할 셀 값을 열 단위로 한 번에 준비합니다.
+
+엔진이 행마다 pandas Series(iterrows)를 만들고 셀마다 pd.notna/str/is_image_file을 부르는 대신,
+prepare_rows()가 열마다 한 번 변환한 문자열(NaN은 "")과 이미지 판별 결과를 행 튜플로 넘겨줍니다.
+"""
+import re
+from xml.sax.saxutils import escape as _xml_escape
+
+import image_utils
+
+# 이미지 경로로 보는 확장자 (image_utils.is_image_file과 같은 목록)
+_IMAGE_EXTENSIONS = tuple(image_utils.SUPPORTED_IMAGE_FORMATS)
+
+# XML 1.0에서 쓸 수 없는 제어 문자 (탭·줄바꿈 제외)
+_INVALID_XML_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+
+def column_texts(series):
+    """열을 엔진에 넣을 문자열 목록과 이미지 경로로 보이는 행 위치(확장자 기준)로 바꿉니다 (NaN/None은 "")."""
+    texts = series.where(series.notna(), "").astype(str)
+    is_image = texts.str.lower().str.endswith(_IMAGE_EXTENSIONS).to_numpy(dtype=bool)
+    return texts.tolist(), is_image.nonzero()[0].tolist()
+
+
+class MergeRow:
+    """MergeRows의 한 행 - 필드 이름으로 값과 이미지 여부를 찾습니다."""
+    __slots__ = ('index', 'position', 'values', 'image_positions', '_rows')
+
+    def __init__(self, rows, position):
+        self._rows = rows
+        self.position = position
+        self.index = rows.index[position]
+        self.values = rows.values[position]
+        self.image_positions = rows.images[position]
+
+    @property
+    def names(self):
+        return self._rows.names
+
+    def get(self, name, default=""):
+        column = self._rows.positions.get(name)
+        return default if column is None else self.values[column]
+
+    def is_image(self, name):
+        column = self._rows.positions.get(name)
+        return column is not None and column in self.image_positions
+
+    def items(self):
+        return zip(self._rows.names, self.values)
+
+    def image_values(self):
+        return [self.values[column] for column in self.image_positions]
+
+    def escaped(self, name):
+        """XML 본문에 바로 넣을 수 있게 &, <, >를 바꾸고 XML에 쓸 수 없는 제어 문자를 뺀 값."""
+        return self._rows.escaped_column(self._rows.positions[name])[self.position]
+
+
+class MergeRows:
+    """열 단위로 변환한 병합 데이터.
+
+    values[i]는 i번째 행의 셀 문자열 튜플, images[i]는 그 행에서 값이 이미지 경로인 열 위치 튜플입니다.
+    """
+
+    def __init__(self, names, index, values, images):
+        self.names = names
+        self.index = index
+        self.values = values
+        self.images = images
+        self.positions = {}
+        for column, name in enumerate(names):
+            self.positions.setdefault(name, column)
+        self._escaped = {}
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        for position in range(len(self.values)):
+            yield MergeRow(self, position)
+
+    def row(self, position):
+        return MergeRow(self, position)
+
+    def image_columns(self):
+        """이미지 경로가 하나라도 있는 열 이름."""
+        used = set()
+        for positions in self.images:
+            used.update(positions)
+        return [self.names[column] for column in sorted(used)]
+
+    def escaped_column(self, column):
+        """열 하나의 XML 이스케이프 값 목록 (처음 요청할 때 열 전체를 한 번에 변환)."""
+        escaped = self._escaped.get(column)
+        if escaped is None:
+            escaped = self._escaped[column] = [_INVALID_XML_RE.sub("", _xml_escape(row[column]))
+                                               for row in self.values]
+        return escaped
+
+
+def prepare_rows(dataframe):
+    """DataFrame을 MergeRows로 바꿉니다 (이미 MergeRows이면 그대로 반환)."""
+    if isinstance(dataframe, MergeRows):
+        return dataframe
+    columns = []
+    images = [[] for _ in range(len(dataframe))]
+    for column in range(dataframe.shape[1]):
+        texts, image_rows = column_texts(dataframe.iloc[:, column])
+        columns.append(texts)
+        for i in image_rows:
+            images[i].append(column)
+    return MergeRows([str(column) for column in dataframe.columns], list(dataframe.index),
+                     list(zip(*columns)) if columns else [() for _ in range(len(dataframe))],
+                     [tuple(positions) for positions in images])
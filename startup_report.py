@@ -0,0 +1,62 @@
+"""프로그램 시작 시간 측정 도구.
+
+    python startup_report.py [--top 20]
+
+main_app.py를 `python -X importtime main_app.py --startup-check`로 실행하여 첫 창이 뜰 때까지의
+시간과 모듈별 import 시간(하위 모듈 포함 누적)을 출력합니다. 목표 시간을 넘으면 종료 코드 1을 반환합니다.
+"""
+import os
+import re
+import sys
+import argparse
+import subprocess
+
+_IMPORT_LINE_RE = re.compile(r'^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|( *)(\S+)')
+_STARTUP_LINE_RE = re.compile(r'첫 창 표시 ([\d.]+)초')
+
+
+def parse_importtime(text):
+    """-X importtime 출력을 [(모듈 이름, 누적 마이크로초, 단독 마이크로초, 깊이), ...]로 바꿉니다."""
+    modules = []
+    for line in text.splitlines():
+        match = _IMPORT_LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append((name, int(cumulative_us), int(self_us), len(indent) // 2))
+    return modules
+
+
+def top_level_imports(modules, limit=20):
+    """실행한 스크립트가 직접 import한 모듈을 누적 시간이 긴 순서로 반환합니다."""
+    direct = [(name, cumulative_us) for name, cumulative_us, _, depth in modules if depth == 0]
+    return sorted(direct, key=lambda item: item[1], reverse=True)[:limit]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="YongMerge 시작 시간과 모듈별 import 시간 측정")
+    parser.add_argument('--top', type=int, default=20, help="출력할 모듈 수")
+    args = parser.parse_args(argv)
+
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main_app.py')
+    # 자식 프로세스 출력(한글 포함)을 UTF-8로 고정
+    env = dict(os.environ, PYTHONIOENCODING='utf-8')
+    proc = subprocess.run([sys.executable, '-X', 'importtime', script, '--startup-check'],
+                          capture_output=True, text=True, encoding='utf-8', errors='replace', env=env)
+    modules = parse_importtime(proc.stderr)
+    startup = _STARTUP_LINE_RE.search(proc.stdout)
+
+    print("모듈별 import 시간 (하위 모듈 포함):")
+    for name, cumulative_us in top_level_imports(modules, limit=args.top):
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+    print(f"import 합계: {sum(m[1] for m in modules if m[3] == 0) / 1000:.1f} ms")
+    if startup:
+        print(f"첫 창 표시: {startup.group(1)}초 ({'목표 이내' if proc.returncode == 0 else '목표 초과'})")
+    else:
+        print("첫 창 표시 시간을 측정하지 못했습니다.")
+        print(proc.stderr[-2000:], file=sys.stderr)
+        return 2
+    return proc.returncode
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""템플릿 분석 결과(필드 목록, 파트별 자리 표시자, 미디어 목록 등)의 디스크 캐시.
+
+템플릿의 경로·크기·수정 시각으로 내용 해시(SHA-256)를 찾고, 해시와 항목 종류로 저장한 결과를 재사용합니다.
+내용이 같으면 경로가 달라도 재사용하며 프로그램을 다시 시작해도 유지됩니다.
+전체 크기가 한도를 넘으면 가장 오래 쓰지 않은 항목부터 지웁니다(LRU).
+"""
+import os
+import json
+import pickle
+import shutil
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+# 저장 형식이나 분석 방식이 바뀌면 올려서 이전 결과를 무시
+CACHE_VERSION = 1
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# 경로 -> 내용 해시 색인에 남길 최대 경로 수
+_INDEX_LIMIT = 1000
+# 현재 프로세스 메모리에 둘 최근 항목 수
+_MEMORY_LIMIT = 32
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+_cache_dir = None
+_max_bytes = DEFAULT_MAX_BYTES
+_lock = threading.Lock()
+_memory = OrderedDict()
+# 이번 실행의 적중/생성 횟수
+stats = {'memory_hits': 0, 'disk_hits': 0, 'builds': 0}
+
+
+def default_cache_dir():
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'YongMerge', 'template_cache')
+
+
+def configure(cache_dir=None, max_bytes=None):
+    """캐시 폴더와 크기 한도(바이트)를 바꿉니다 (None이면 기본값)."""
+    global _cache_dir, _max_bytes
+    with _lock:
+        _cache_dir = cache_dir
+        _max_bytes = DEFAULT_MAX_BYTES if max_bytes is None else int(max_bytes)
+        _memory.clear()
+
+
+def cache_dir():
+    return _cache_dir or default_cache_dir()
+
+
+def _index_path():
+    return os.path.join(cache_dir(), 'index.json')
+
+
+def _load_index():
+    try:
+        with open(_index_path(), encoding='utf-8') as f:
+            index = json.load(f)
+        return index if isinstance(index, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint(path):
+    """템플릿 지문 (경로, 크기, 수정 시각, 내용 해시).
+
+    경로·크기·수정 시각이 색인과 같으면 파일을 다시 읽지 않고 저장된 해시를 씁니다.
+    """
+    path = os.path.normcase(os.path.abspath(path))
+    st = os.stat(path)
+    with _lock:
+        index = _load_index()
+        entry = index.get(path)
+        if entry and entry.get('size') == st.st_size and entry.get('mtime_ns') == st.st_mtime_ns:
+            return dict(entry, path=path)
+    sha256 = _file_sha256(path)
+    entry = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': sha256}
+    with _lock:
+        index = _load_index()
+        index.pop(path, None)
+        index[path] = entry
+        # 오래된 경로부터 정리 (dict는 넣은 순서 유지)
+        for stale in list(index)[:max(0, len(index) - _INDEX_LIMIT)]:
+            del index[stale]
+        try:
+            _write_atomic(_index_path(), json.dumps(index, ensure_ascii=False).encode('utf-8'))
+        except OSError as e:
+            print(f"DEBUG: 템플릿 캐시 색인 저장 실패: {e}")
+    return dict(entry, path=path)
+
+
+def _entry_path(key):
+    return os.path.join(cache_dir(), key[:2], key + '.pickle')
+
+
+def _evict():
+    """캐시 파일 전체 크기가 한도를 넘으면 최근에 쓰지 않은 파일부터 지웁니다."""
+    entries = []
+    for root, _, names in os.walk(cache_dir()):
+        for name in names:
+            if name.endswith('.pickle'):
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= _max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def get(path, kind, build):
+    """템플릿 path의 kind 항목을 캐시에서 찾고, 없으면 build(path)로 만들어 저장한 뒤 반환합니다.
+
+    build의 결과는 pickle로 저장할 수 있는 값이어야 합니다 (dict, list, bytes 등).
+    """
+    key = f"{fingerprint(path)['sha256']}_{kind}_v{CACHE_VERSION}"
+    with _lock:
+        if key in _memory:
+            _memory.move_to_end(key)
+            stats['memory_hits'] += 1
+            return _memory[key]
+
+    entry_path = _entry_path(key)
+    try:
+        with open(entry_path, 'rb') as f:
+            value = pickle.load(f)
+        os.utime(entry_path)  # 최근 사용 시각 갱신 (LRU)
+        stats['disk_hits'] += 1
+    except FileNotFoundError:
+        value = _build_and_store(path, kind, build, entry_path)
+    except Exception as e:
+        print(f"DEBUG: 템플릿 캐시 항목을 읽지 못해 다시 분석합니다 ({kind}): {e}")
+        value = _build_and_store(path, kind, build, entry_path)
+
+    with _lock:
+        _memory[key] = value
+        while len(_memory) > _MEMORY_LIMIT:
+            _memory.popitem(last=False)
+    return value
+
+
+def _build_and_store(path, kind, build, entry_path):
+    value = build(path)
+    stats['builds'] += 1
+    try:
+        _write_atomic(entry_path, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        _evict()
+    except OSError as e:
+        print(f"DEBUG: 템플릿 캐시 저장 실패 ({kind}): {e}")
+    return value
+
+
+def clear():
+    """메모리와 디스크의 캐시를 모두 지웁니다."""
+    with _lock:
+        _memory.clear()
+    shutil.rmtree(cache_dir(), ignore_errors=True)
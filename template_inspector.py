@@ -0,0 +1,178 @@
+"""템플릿에 실제로 들어 있는 필드 목록 추출.
+
+.docx/.pptx/.hwpx는 문서 프로그램 없이 zip 안의 XML을 읽어 필드를 찾습니다.
+.hwp(바이너리)처럼 읽을 수 없는 형식은 None을 반환하며, 이때는 엔진이 템플릿을 연 뒤
+COM(GetFieldList, 본문·도형 텍스트)으로 같은 정보를 얻습니다.
+분석 결과는 template_cache에 저장되어 같은 템플릿을 다시 고르거나 실행할 때 재사용됩니다.
+"""
+import os
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+import template_cache
+
+# 텍스트 자리 표시자 ('{{필드}}'는 필드로, '{필드}'는 데이터 열과 이름이 같을 때만 필드로 인정)
+_DOUBLE_RE = re.compile(r"\{\{([^{}\r\n]+)\}\}")
+_SINGLE_RE = re.compile(r"(?<!\{)\{([^{}\r\n]+)\}(?!\})")
+
+_WORD_PART_RE = re.compile(r"word/(document|header\d*|footer\d*|footnotes|endnotes)\.xml$")
+_SLIDE_PART_RE = re.compile(r"ppt/slides/slide\d+\.xml$")
+_SECTION_PART_RE = re.compile(r"Contents/section\d+\.xml$")
+_MEDIA_PART_RE = re.compile(r"(word/media|ppt/media|BinData)/")
+
+# 한글 누름틀 종류 (HWPX의 fieldBegin type)
+_CLICK_HERE_TYPES = {'CLICK_HERE', 'CLICKHERE'}
+
+
+def _local(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+class TemplateFields:
+    """템플릿의 필드 이름 - fields는 확실한 필드('{{x}}', 누름틀), short는 '{x}' 형식으로만 쓰인 이름.
+
+    zip에서 읽은 경우 parts({파트 이름: 필드 이름 목록})와 media(미디어 파트 이름·크기·CRC 목록)도 담습니다.
+    """
+
+    def __init__(self, fields, short=(), source='zip', parts=None, media=None):
+        self.fields = list(dict.fromkeys(fields))
+        self.short = [name for name in dict.fromkeys(short) if name not in self.fields]
+        self.source = source
+        self.parts = parts or {}
+        self.media = media or []
+
+    def to_dict(self):
+        return {'fields': self.fields, 'short': self.short, 'source': self.source,
+                'parts': self.parts, 'media': self.media}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['fields'], data['short'], data['source'], data['parts'], data['media'])
+
+    def plan(self, columns):
+        """데이터 열과 비교한 ColumnPlan을 반환합니다."""
+        return ColumnPlan(self, columns)
+
+
+class ColumnPlan:
+    """템플릿 필드와 데이터 열의 비교 결과.
+
+    used: 템플릿이 쓰는 열(데이터 순서), unused_columns: 템플릿에 없는 열,
+    missing_fields: 데이터에 열이 없어 비어 있게 될 필드.
+    """
+
+    def __init__(self, template_fields, columns):
+        names = set(template_fields.fields) | set(template_fields.short)
+        self.columns = list(columns)
+        self.used = [column for column in self.columns if str(column) in names]
+        self.unused_columns = [column for column in self.columns if str(column) not in names]
+        available = {str(column) for column in self.columns}
+        self.missing_fields = [name for name in template_fields.fields if name not in available]
+
+    def prune(self, dataframe, keep=()):
+        """템플릿이 쓰는 열만 남긴 DataFrame (버릴 열이 없으면 그대로 반환).
+
+        keep에 든 열 이름(예: 파일 이름 패턴이 쓰는 열)은 템플릿이 쓰지 않아도 남깁니다.
+        """
+        keep = {str(name) for name in keep}
+        dropped = [column for column in self.unused_columns if str(column) not in keep]
+        if not dropped:
+            return dataframe
+        return dataframe[[column for column in self.columns if column not in dropped]]
+
+    def to_dict(self):
+        return {'used': [str(c) for c in self.used], 'unused_columns': [str(c) for c in self.unused_columns],
+                'missing_fields': list(self.missing_fields)}
+
+
+def text_fields(texts, source='com'):
+    """문단 텍스트 목록에서 '{{x}}', '{x}' 자리 표시자 이름을 찾습니다."""
+    fields, short = [], []
+    for text in texts:
+        if not text or '{' not in text:
+            continue
+        fields.extend(_DOUBLE_RE.findall(text))
+        short.extend(_SINGLE_RE.findall(text))
+    return TemplateFields(fields, short, source)
+
+
+def hwp_field_names(field_list):
+    """한글 GetFieldList 결과('\\x02' 구분)를 필드 이름 목록으로 바꿉니다."""
+    return [name for name in (field_list or "").split("\x02") if name]
+
+
+def _paragraph_texts(xml_bytes):
+    """XML의 문단(w:p, a:p)마다 run 텍스트를 이어 붙여 반환 (run으로 나뉜 자리 표시자도 찾도록)."""
+    texts = []
+    for element in ET.fromstring(xml_bytes).iter():
+        if _local(element.tag) == 'p':
+            texts.append("".join(t.text or "" for t in element.iter() if _local(t.tag) == 't'))
+    return texts
+
+
+def _hwpx_fields(xml_bytes):
+    names = []
+    for element in ET.fromstring(xml_bytes).iter():
+        kind = _local(element.tag)
+        if kind == 'fieldBegin' and element.get('type', 'CLICK_HERE').upper() in _CLICK_HERE_TYPES:
+            names.append(element.get('name', ''))
+        elif kind == 'tc' and element.get('name'):
+            # 표 셀 필드 (PutFieldText로 채울 수 있음)
+            names.append(element.get('name'))
+    return [name for name in names if name]
+
+
+def _scan_archive(archive):
+    names = archive.namelist()
+    media = [{'name': info.filename, 'size': info.file_size, 'crc': info.CRC}
+             for info in archive.infolist() if _MEDIA_PART_RE.match(info.filename)]
+    text_parts = [n for n in names if _WORD_PART_RE.match(n)] or [n for n in names if _SLIDE_PART_RE.match(n)]
+    if text_parts:
+        fields, short, parts = [], [], {}
+        for name in text_parts:
+            found = text_fields(_paragraph_texts(archive.read(name)))
+            if found.fields or found.short:
+                parts[name] = found.fields + found.short
+            fields.extend(found.fields)
+            short.extend(found.short)
+        return TemplateFields(fields, short, 'zip', parts, media)
+    section_parts = sorted(n for n in names if _SECTION_PART_RE.match(n))
+    if section_parts:
+        fields, parts = [], {}
+        for name in section_parts:
+            found = _hwpx_fields(archive.read(name))
+            if found:
+                parts[name] = list(dict.fromkeys(found))
+            fields.extend(found)
+        return TemplateFields(fields, source='zip', parts=parts, media=media)
+    return None
+
+
+def scan_zip(path):
+    """.docx/.pptx/.hwpx 템플릿을 zip으로 읽어 TemplateFields를 반환합니다 (읽을 수 없으면 None)."""
+    try:
+        if not zipfile.is_zipfile(path):
+            return None
+        with zipfile.ZipFile(path) as archive:
+            return _scan_archive(archive)
+    except (OSError, zipfile.BadZipFile, ET.ParseError, KeyError) as e:
+        print(f"DEBUG: 템플릿 필드 검사 실패 ({os.path.basename(path)}): {e}")
+    return None
+
+
+def _build_fields(path):
+    found = scan_zip(path)
+    return found.to_dict() if found is not None else None
+
+
+def inspect_template(path):
+    """문서 프로그램 없이 템플릿 필드를 추출합니다 (지원하지 않는 형식이면 None, 결과는 캐시에서 재사용)."""
+    try:
+        if not zipfile.is_zipfile(path):
+            return None
+        data = template_cache.get(path, 'fields', _build_fields)
+    except OSError as e:
+        print(f"DEBUG: 템플릿 필드 검사 실패 ({os.path.basename(path)}): {e}")
+        return None
+    return TemplateFields.from_dict(data) if data is not None else None
@@ -0,0 +1,57 @@
+import os
+import sys
+import json
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("pandas")
+pytest.importorskip("PIL.Image")
+import benchmark  # noqa: E402
+
+
+def _case(backend, mode, rows=3):
+    return {'backend': backend, 'mode': mode, 'rows': rows, 'fields': 7, 'image_slots': 1,
+            'image_ratio': 1.0, 'images': 2, 'latency': 0.0, 'seed': 1}
+
+
+def test_dataset_is_reproducible_and_honours_image_ratio(tmp_path):
+    images = benchmark.build_images(str(tmp_path), 2)
+    first = benchmark.build_dataset(20, fields=3, image_slots=2, image_ratio=0.5, image_paths=images, seed=7)
+    second = benchmark.build_dataset(20, fields=3, image_slots=2, image_ratio=0.5, image_paths=images, seed=7)
+    assert first.equals(second)
+    assert list(first.columns) == ['F1', 'F2', 'F3', 'IMAGE1', 'IMAGE2']
+    filled = (first[['IMAGE1', 'IMAGE2']] != "").to_numpy().sum()
+    assert 0 < filled < 40
+
+
+def test_word_individual_case_fills_header_and_footer(tmp_path):
+    result = benchmark.run_case(_case('word', 'individual'), str(tmp_path))
+
+    assert result['rows_per_sec'] > 0 and result['output_bytes'] > 0 and result['com_calls'] > 0
+    assert {'open', 'fill', 'save'} <= set(result['phases'])
+    with open(tmp_path / "bench_word_row_1.docx", encoding="utf-8") as f:
+        stories = json.load(f)["stories"]
+    assert [story['type'] for story in stories] == [1, 7, 9]
+    assert not any("{{" in story['text'] for story in stories)
+
+
+def test_ppt_combined_case_and_compare(tmp_path):
+    result = benchmark.run_case(_case('ppt', 'combined'), str(tmp_path))
+    assert result['output_bytes'] == os.path.getsize(tmp_path / "bench_ppt_combined.pptx")
+
+    baseline = {'meta': {'commit': 'a'}, 'results': [dict(result, rows_per_sec=result['rows_per_sec'] / 2)]}
+    table = benchmark.compare(baseline, {'meta': {'commit': 'b'}, 'results': [result]})
+    assert "+100.0%" in table
+
+
+def test_native_cases_compare_compression_policies(tmp_path):
+    sizes = {}
+    for compression in ("store", "max"):
+        case = dict(_case('hwp', 'individual'), engine='native', compression=compression)
+        result = benchmark.run_case(case, str(tmp_path / compression))
+        assert result['com_calls'] == 0 and result['rows_per_sec'] > 0
+        sizes[compression] = result['output_bytes']
+    assert sizes["store"] > sizes["max"] > 0
+    assert benchmark.case_label(dict(case, backend='hwp')) == "hwp/max"
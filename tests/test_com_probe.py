@@ -0,0 +1,92 @@
+import os
+import sys
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import com_probe  # noqa: E402
+
+
+class _TextFrame:
+    HasText = True
+    Text = "{{이름}}"
+
+
+class _Shape:
+    def __init__(self):
+        self.HasTextFrame = True
+        self.TextFrame = _TextFrame()
+
+
+class _Shapes:
+    """COM 컬렉션처럼 순회만 가능한 객체."""
+
+    def __init__(self, items):
+        self._items = items
+
+    def __iter__(self):
+        return iter(self._items)
+
+
+class _App:
+    def __init__(self):
+        self.Visible = False
+        self.Shapes = _Shapes([_Shape(), _Shape()])
+        self.received = None
+
+    def Open(self, path, other=None):
+        self.received = other
+        return _Shape()
+
+
+def test_wrap_is_noop_without_active_stats():
+    com_probe.activate(None)
+    app = _App()
+    assert com_probe.wrap(app, 'app') is app
+
+
+def test_counts_members_by_access_path():
+    stats = com_probe.ComCallStats()
+    com_probe.activate(stats)
+    try:
+        app = com_probe.wrap(_App(), 'ppt')
+    finally:
+        com_probe.activate(None)
+
+    for shape in app.Shapes:
+        assert shape.HasTextFrame and shape.TextFrame.HasText
+    app.Visible = True
+    opened = app.Open("a.pptx", app.Shapes)
+
+    members = stats.members
+    assert members['ppt.Shapes[]']['count'] == 2
+    assert members['ppt.Shapes[].HasTextFrame']['count'] == 2
+    assert members['ppt.Shapes[].TextFrame.HasText']['count'] == 2
+    assert members['ppt.Visible=']['count'] == 1
+    assert members['ppt.Open']['count'] == 1
+    # 인자로 넘긴 프록시는 원래 객체로 풀어서 전달, 반환 객체는 다시 계측
+    assert isinstance(app._obj.received, _Shapes)
+    assert opened.HasTextFrame is True
+    assert 'ppt.Open().HasTextFrame' in stats.members
+    assert sum(members['ppt.Open']['histogram']) == 1
+
+
+def test_top_report_and_merge(tmp_path):
+    stats = com_probe.ComCallStats()
+    for _ in range(3):
+        stats.record('hwp.XHwpWindows.Count', 0.002)
+    stats.record('hwp.Open', 0.5)
+    other = com_probe.ComCallStats()
+    other.record('hwp.Open', 1.5)
+    stats.merge(other.members)
+
+    top = stats.top(1)
+    assert top[0][0] == 'hwp.XHwpWindows.Count'
+    assert stats.members['hwp.Open']['count'] == 2
+    assert stats.members['hwp.Open']['histogram'][-1] == 1
+    assert 'hwp.XHwpWindows.Count' in stats.report(5)
+
+    with open(stats.write(str(tmp_path / "calls.json")), encoding='utf-8') as f:
+        data = json.load(f)
+    assert data['total_calls'] == 5
+    assert data['members'][0]['member'] == 'hwp.XHwpWindows.Count'
@@ -0,0 +1,85 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pd = pytest.importorskip("pandas")
+import data_sources  # noqa: E402
+
+CSV_TEXT = "이름,학번,점수\n홍길동,0012,90\n김철수,0013,\n"
+
+
+def _write(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+    return str(path)
+
+
+@pytest.mark.parametrize("encoding, expected", [
+    ("utf-8-sig", "utf-8-sig"),
+    ("cp949", "cp949"),
+    ("utf-8", "utf-8"),
+])
+def test_detect_csv_encoding(tmp_path, encoding, expected):
+    path = _write(tmp_path / "data.csv", CSV_TEXT.encode(encoding))
+    assert data_sources.detect_csv_encoding(path) == expected
+
+
+@pytest.mark.parametrize("encoding", ["utf-8-sig", "cp949", "utf-8"])
+def test_load_csv_keeps_leading_zeros_and_blank_is_none(tmp_path, encoding):
+    path = _write(tmp_path / "data.csv", CSV_TEXT.encode(encoding))
+    df, info = data_sources.load_data_source(path)
+
+    assert list(df.columns) == ["이름", "학번", "점수"]
+    assert df.values.tolist() == [["홍길동", "0012", "90"], ["김철수", "0013", None]]
+    assert info["format"] == "csv"
+    assert info["encoding"] == encoding
+    assert info["rows"] == 2 and info["columns"] == 3
+    assert info["seconds"] >= 0
+
+
+def test_load_txt_is_tab_delimited(tmp_path):
+    path = _write(tmp_path / "export.txt", "a\tb\n1\t2\n".encode("cp949"))
+    df, _ = data_sources.load_data_source(path)
+    assert list(df.columns) == ["a", "b"]
+    assert df.values.tolist() == [["1", "2"]]
+
+
+@pytest.fixture
+def sqlite_path(tmp_path):
+    path = str(tmp_path / "data.db")
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE "학생 ""명단""" (name TEXT, score INTEGER)')
+    conn.executemany('INSERT INTO "학생 ""명단""" VALUES (?, ?)', [("a", 1), ("b", None), ("c", 3)])
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_sqlite_table_with_quoted_name(sqlite_path):
+    assert data_sources.list_sqlite_tables(sqlite_path) == ['학생 "명단"']
+    df, info = data_sources.load_data_source(sqlite_path, table='학생 "명단"')
+    assert info["format"] == "sqlite"
+    assert df["name"].tolist() == ["a", "b", "c"]
+    assert df["score"].tolist()[1] is None
+
+
+def test_sqlite_query_takes_precedence_over_table(sqlite_path):
+    df, _ = data_sources.load_data_source(
+        sqlite_path, table="ignored", query='SELECT name FROM "학생 ""명단""" WHERE score > 1'
+    )
+    assert df.values.tolist() == [["c"]]
+
+
+def test_sqlite_requires_table_or_query(sqlite_path):
+    with pytest.raises(ValueError):
+        data_sources.load_data_source(sqlite_path)
+
+
+def test_unsupported_format(tmp_path):
+    path = _write(tmp_path / "data.xyz", b"")
+    with pytest.raises(ValueError):
+        data_sources.load_data_source(path)
@@ -0,0 +1,91 @@
+import os
+import sys
+import json
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pd = pytest.importorskip("pandas")
+Image = pytest.importorskip("PIL.Image")
+import com_factory  # noqa: E402
+import fake_com  # noqa: E402
+import yongmerge  # noqa: E402
+
+
+@pytest.fixture
+def fakes(monkeypatch):
+    # 엔진의 고정 대기(time.sleep)는 건너뜀
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    factory = fake_com.FakeComFactory()
+    with com_factory.use_factory(factory):
+        yield factory
+
+
+@pytest.fixture
+def rows(tmp_path):
+    image = tmp_path / "photo.png"
+    Image.new("RGB", (200, 100), "red").save(image)
+    return pd.DataFrame({"이름": ["가", "나", "다"], "IMAGE": [str(image)] * 3})
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_hwp_individual_fills_and_removes_fields(fakes, rows, tmp_path):
+    template = fake_com.write_template(str(tmp_path / "letter.hwp"), "hwp", "안녕 {{이름}} 님 {{IMAGE}}")
+    result = yongmerge.run_merge(template, rows, "individual")
+
+    assert result["count"] == 3
+    segments = _load(tmp_path / "letter_row_2.hwp")["segments"]
+    assert not any("field" in s for s in segments)
+    assert "".join(s.get("text", "") for s in segments) == "안녕 나 님 "
+    assert sum("image" in s for s in segments) == 1
+    assert fakes.calls["Hwp.Open"] == 3
+    assert fakes.calls["Hwp.SaveAs"] == 3
+
+
+def test_word_combined_inserts_files_with_page_breaks(fakes, rows, tmp_path):
+    template = fake_com.write_template(str(tmp_path / "letter.docx"), "word", "안녕 {{이름}} 님\n{{IMAGE}}")
+    result = yongmerge.run_merge(template, rows, "combined")
+
+    story = _load(result["path"])["stories"][0]
+    pages = story["text"].split("\f")
+    assert [page.split("\r")[0] for page in pages] == ["안녕 가 님", "안녕 나 님", "안녕 다 님"]
+    assert len(story["images"]) == 3
+    assert story["text"].count(fake_com.PICTURE_MARK) == 3
+
+
+def test_ppt_individual_replaces_text_and_adds_pictures(fakes, rows, tmp_path):
+    template = fake_com.write_template(str(tmp_path / "deck.pptx"), "ppt", [["{{이름}} 학생", "{{IMAGE}}"]])
+    yongmerge.run_merge(template, rows, "individual")
+
+    shapes = _load(tmp_path / "deck_row_1.pptx")["slides"][0]["shapes"]
+    assert shapes[0]["text"] == "가 학생"
+    # 이미지 자리 텍스트 상자는 지우고 그림을 상자 안에 비율 맞춰 넣음
+    pictures = [s for s in shapes if s["picture"]]
+    # '{{IMAGE}}' 안의 '{IMAGE}'로 그림을 한 번 더 넣지 않음
+    assert len(pictures) == 1 and all(s["text"] is None for s in shapes[1:])
+    assert pictures[0]["width"] == 200.0 and pictures[0]["height"] == 100.0
+
+
+def test_member_latency_and_unknown_prog_id():
+    factory = fake_com.FakeComFactory(latencies={"Word.Documents": 0.02})
+    word = factory("Word.Application")
+    start = time.perf_counter()
+    _ = word.Documents.Count
+    assert time.perf_counter() - start >= 0.02
+    assert factory.calls == {"Word.Documents": 1, "Documents.Count": 1}
+    with pytest.raises(fake_com.FakeComError):
+        factory("Excel.Application")
+
+
+def test_engine_unsupported_without_com_or_factory(monkeypatch):
+    monkeypatch.setattr(com_factory, "_win32", None)
+    monkeypatch.setattr(com_factory, "_factory", None)
+    with pytest.raises(yongmerge.MergeError) as error:
+        yongmerge._load_engine("word")
+    assert error.value.exit_code == yongmerge.EXIT_UNSUPPORTED
@@ -0,0 +1,161 @@
+import os
+import sys
+import zipfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pd = pytest.importorskip("pandas")
+Image = pytest.importorskip("PIL.Image")
+import image_pipeline  # noqa: E402
+import image_utils  # noqa: E402
+
+
+@pytest.fixture
+def options(tmp_path):
+    image_utils.clear_image_cache()
+    # 72pt x 72pt 상자, 100dpi → 100 x 100 px
+    return {'enabled': True, 'box_pt': (72, 72), 'dpi': 100, 'quality': 80, 'cache_dir': str(tmp_path / "cache")}
+
+
+def _save(path, size, fmt="JPEG", mode="RGB", orientation=None):
+    img = Image.new(mode, size, (10, 20, 30) if mode == "RGB" else (10, 20, 30, 128))
+    kwargs = {}
+    if orientation:
+        exif = Image.Exif()
+        exif[0x0112] = orientation
+        kwargs["exif"] = exif
+    img.save(path, fmt, **kwargs)
+    return str(path)
+
+
+def test_large_image_is_downsampled_with_target_dpi(tmp_path, options):
+    src = _save(tmp_path / "big.jpg", (400, 200))
+    mapping, stats = image_pipeline.prepare_images([src], options, max_workers=1)
+    with Image.open(mapping[src]) as img:
+        assert img.size == (100, 50)
+        assert img.format == "JPEG"
+        assert round(img.info["dpi"][0]) == 100
+    assert stats["processed"] == 1 and stats["cache_hits"] == 0
+
+
+def test_exif_orientation_is_applied(tmp_path, options):
+    src = _save(tmp_path / "rotated.jpg", (400, 200), orientation=6)
+    mapping, _ = image_pipeline.prepare_images([src], options, max_workers=1)
+    with Image.open(mapping[src]) as img:
+        assert img.size == (50, 100)
+
+
+def test_small_supported_image_is_passed_through(tmp_path, options):
+    src = _save(tmp_path / "small.png", (40, 40), fmt="PNG")
+    mapping, stats = image_pipeline.prepare_images([src], options, max_workers=1)
+    assert mapping[src] == src
+    assert stats["processed"] == 0
+
+
+def test_oversize_image_is_downsampled_instead_of_dropped(tmp_path, options, monkeypatch):
+    src = _save(tmp_path / "phone.png", (80, 80), fmt="PNG")
+    # 크기 제한만 넘는 이미지: 그대로는 넣을 수 없지만 변환하면 사용
+    monkeypatch.setattr(image_utils, "MAX_IMAGE_FILE_SIZE", 10)
+    assert not image_utils.validate_image_path(src)[0]
+    assert image_pipeline.needs_processing(src, (100, 100))
+
+    mapping, stats = image_pipeline.prepare_images([src], options, max_workers=1)
+    assert mapping[src] != src and stats["processed"] == 1
+    monkeypatch.setattr(image_utils, "MAX_IMAGE_FILE_SIZE", 10 * 1024 * 1024)
+    assert image_utils.validate_image_path(mapping[src])[0]
+
+    bad = tmp_path / "bad.png"
+    bad.write_bytes(b"not an image" * 10)
+    monkeypatch.setattr(image_utils, "MAX_IMAGE_FILE_SIZE", 10)
+    assert not image_pipeline.needs_processing(str(bad), (100, 100))
+
+
+def test_unsupported_format_is_converted_and_keeps_alpha(tmp_path, options):
+    src = _save(tmp_path / "logo.webp", (40, 40), fmt="WEBP", mode="RGBA")
+    mapping, _ = image_pipeline.prepare_images([src], options, max_workers=1)
+    with Image.open(mapping[src]) as img:
+        assert img.format == "PNG"
+        assert img.mode == "RGBA"
+
+
+def test_same_content_reuses_disk_cache(tmp_path, options):
+    first = _save(tmp_path / "a.jpg", (400, 400))
+    second = tmp_path / "copy_of_a.jpg"
+    second.write_bytes(open(first, "rb").read())
+
+    mapping, stats = image_pipeline.prepare_images([first], options, max_workers=1)
+    mapping2, stats2 = image_pipeline.prepare_images([str(second)], options, max_workers=1)
+    assert mapping2[str(second)] == mapping[first]
+    assert stats2["cache_hits"] == 1
+
+
+def test_prepare_dataframe_images(tmp_path, options):
+    src = _save(tmp_path / "big.jpg", (400, 400))
+    df = pd.DataFrame({"이름": ["가", "나"], "IMAGE": [src, None]})
+
+    assert image_pipeline.prepare_dataframe_images(df, dict(options, enabled=False)) is df
+
+    prepared = image_pipeline.prepare_dataframe_images(df, options, max_workers=1)
+    assert prepared.loc[0, "IMAGE"] != src
+    assert prepared.loc[0, "IMAGE"].startswith(options["cache_dir"])
+    assert pd.isna(prepared.loc[1, "IMAGE"])
+    assert df.loc[0, "IMAGE"] == src
+
+
+def test_prefetcher_yields_rows_in_order_with_prepared_images(tmp_path):
+    image_utils.clear_image_cache()
+    logo = _save(tmp_path / "logo.png", (40, 20), fmt="PNG")
+    photo = _save(tmp_path / "photo.jpg", (30, 60))
+    df = pd.DataFrame({
+        "이름": ["가", "나", "다"],
+        "IMAGE": [photo, str(tmp_path / "missing.jpg"), None],
+        "LOGO": [logo, logo, logo],
+    })
+
+    rows = list(image_pipeline.ImagePrefetcher(df, depth=1))
+
+    assert [index for index, _, _ in rows] == [0, 1, 2]
+    first = rows[0][2]
+    assert first[photo]["valid"] and first[photo]["aspect_ratio"] == 0.5
+    assert first[logo]["path"] == os.path.abspath(logo)
+    assert not rows[1][2][str(tmp_path / "missing.jpg")]["valid"]
+    assert list(rows[2][2]) == [logo]
+
+
+def test_prefetcher_stages_each_source_once_and_cleans_up(tmp_path):
+    logo = _save(tmp_path / "logo.png", (40, 20), fmt="PNG")
+    df = pd.DataFrame({"IMAGE": [logo] * 5})
+
+    prefetcher = image_pipeline.ImagePrefetcher(df, stage=True)
+    staged = [prepared[logo]["path"] for _, _, prepared in prefetcher]
+
+    assert len(set(staged)) == 1
+    assert staged[0] != os.path.abspath(logo)
+    assert not os.path.exists(staged[0])
+
+
+def test_prefetcher_stays_within_depth(tmp_path, monkeypatch):
+    df = pd.DataFrame({"IMAGE": [str(tmp_path / f"{i}.jpg") for i in range(10)]})
+    prepared_rows = []
+    original = image_pipeline.ImagePrefetcher._prepare_row
+    monkeypatch.setattr(image_pipeline.ImagePrefetcher, "_prepare_row",
+                        lambda self, values: prepared_rows.append(values) or original(self, values))
+
+    for position, _ in enumerate(image_pipeline.ImagePrefetcher(df, depth=2)):
+        assert len(prepared_rows) <= position + 3
+
+
+def test_prefetcher_extracts_zip_members_for_com(tmp_path):
+    image_utils.clear_image_cache()
+    src = _save(tmp_path / "photo.jpg", (30, 60))
+    with zipfile.ZipFile(tmp_path / "photos.zip", "w") as z:
+        z.write(src, "a/photo.jpg")
+    ref = f"{tmp_path / 'photos.zip'}!/a/photo.jpg"
+
+    rows = [prepared for _, _, prepared in image_pipeline.ImagePrefetcher(pd.DataFrame({"IMAGE": [ref]}))]
+    staged = rows[0][ref]["path"]
+    assert rows[0][ref]["valid"] and rows[0][ref]["aspect_ratio"] == 0.5
+    assert staged.endswith(".jpg") and not os.path.exists(staged)
+    image_utils.close_image_archives()
@@ -0,0 +1,63 @@
+import os
+import sys
+import zipfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pd = pytest.importorskip("pandas")
+import image_resolver  # noqa: E402
+
+
+@pytest.fixture
+def photos(tmp_path):
+    folder = tmp_path / "photos"
+    folder.mkdir()
+    for name in ("20231234.jpg", "20231235.PNG", "20231236.txt", "kim_1.jpeg"):
+        (folder / name).write_bytes(b"x")
+    return folder
+
+
+def test_any_extension_matches_by_stem(tmp_path, photos):
+    df = pd.DataFrame({"학번": ["20231234", "20231235"]})
+    resolved, unmatched = image_resolver.resolve_image_pattern(df, "photos/{학번}.*", str(tmp_path))
+    assert resolved.tolist() == [str(photos / "20231234.jpg"), str(photos / "20231235.PNG")]
+    assert unmatched == []
+
+
+def test_explicit_extension_and_multiple_fields(tmp_path, photos):
+    df = pd.DataFrame({"이름": ["kim", "kim"], "번호": [1, 2]})
+    resolved, unmatched = image_resolver.resolve_image_pattern(df, "photos/{이름}_{번호}.jpeg", str(tmp_path))
+    assert resolved.iat[0] == str(photos / "kim_1.jpeg")
+    assert resolved.iat[1] is None
+    assert unmatched == [(1, "kim_2.jpeg")]
+
+
+def test_float_keys_and_blank_keys(tmp_path, photos):
+    df = pd.DataFrame({"학번": [20231234.0, None, 20231236.0]})
+    resolved, unmatched = image_resolver.resolve_image_pattern(df, "photos/{학번}.*", str(tmp_path))
+    assert resolved.iat[0] == str(photos / "20231234.jpg")
+    assert resolved.iat[1] is None
+    # 이미지가 아닌 파일(.txt)은 색인에 들어가지 않음, 빈 키는 보고하지 않음
+    assert unmatched == [(2, "20231236.*")]
+
+
+def test_invalid_patterns_raise(tmp_path, photos):
+    df = pd.DataFrame({"학번": ["1"]})
+    with pytest.raises(ValueError):
+        image_resolver.resolve_image_pattern(df, "photos/student.jpg", str(tmp_path))
+    with pytest.raises(ValueError):
+        image_resolver.resolve_image_pattern(df, "{학번}/photo.jpg", str(tmp_path))
+    with pytest.raises(ValueError):
+        image_resolver.resolve_image_pattern(df, "photos/{이름}.*", str(tmp_path))
+
+
+def test_pattern_inside_zip_archive(tmp_path):
+    with zipfile.ZipFile(tmp_path / "photos.zip", "w") as z:
+        z.writestr("2023/20231234.jpg", b"x")
+        z.writestr("20231235.jpg", b"x")
+    df = pd.DataFrame({"학번": ["20231234", "20231235"]})
+    resolved, unmatched = image_resolver.resolve_image_pattern(df, "photos.zip!/2023/{학번}.*", str(tmp_path))
+    assert resolved.iat[0] == f"{tmp_path / 'photos.zip'}!/2023/20231234.jpg"
+    assert unmatched == [(1, "20231235.*")]
@@ -0,0 +1,113 @@
+import os
+import sys
+import zipfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+Image = pytest.importorskip("PIL.Image")
+import image_utils  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    image_utils.clear_image_cache()
+    yield
+    image_utils.clear_image_cache()
+
+
+def _save_jpeg(path, size=(300, 200), dpi=(300, 300), orientation=None):
+    img = Image.new("RGB", size, (200, 100, 50))
+    kwargs = {"dpi": dpi}
+    if orientation:
+        exif = Image.Exif()
+        exif[0x0112] = orientation
+        kwargs["exif"] = exif
+    img.save(path, "JPEG", **kwargs)
+    return str(path)
+
+
+def test_get_image_info_reads_header_metadata(tmp_path):
+    path = _save_jpeg(tmp_path / "a.jpg", orientation=6)
+    info = image_utils.get_image_info(path)
+    assert info["valid"]
+    assert info["format"] == "JPEG"
+    assert (info["width"], info["height"]) == (300, 200)
+    assert info["dpi"] == (300, 300)
+    assert info["orientation"] == 6
+
+
+def test_cache_counts_hits_and_misses(tmp_path):
+    path = _save_jpeg(tmp_path / "a.jpg")
+    image_utils.validate_image_path(path)
+    image_utils.get_image_size_mm(path)
+    image_utils.get_image_aspect_ratio(os.path.join(str(tmp_path), ".", "a.jpg"))
+    stats = image_utils.get_image_cache_stats()
+    assert (stats["misses"], stats["hits"], stats["entries"]) == (1, 2, 1)
+
+
+def test_cache_rereads_changed_file(tmp_path):
+    path = _save_jpeg(tmp_path / "a.jpg", size=(300, 200))
+    assert image_utils.get_image_aspect_ratio(path) == 1.5
+    _save_jpeg(tmp_path / "a.jpg", size=(100, 400))
+    os.utime(path, ns=(0, 10**9))
+    assert image_utils.get_image_aspect_ratio(path) == 0.25
+    assert image_utils.get_image_cache_stats()["misses"] == 2
+
+
+def test_image_size_mm_uses_dpi(tmp_path):
+    path = _save_jpeg(tmp_path / "a.jpg", size=(300, 600), dpi=(300, 300))
+    assert image_utils.get_image_size_mm(path) == (25, 51)
+
+
+def test_deep_check_detects_truncated_file(tmp_path):
+    path = _save_jpeg(tmp_path / "full.jpg", size=(800, 600))
+    with open(path, "rb") as f:
+        data = f.read()
+    truncated = tmp_path / "truncated.jpg"
+    truncated.write_bytes(data[: len(data) // 3])
+
+    assert image_utils.validate_image_path(str(truncated))[0]
+    assert not image_utils.validate_image_path(str(truncated), deep=True)[0]
+
+
+def test_size_limit_is_enforced(tmp_path, monkeypatch):
+    path = _save_jpeg(tmp_path / "a.jpg")
+    monkeypatch.setattr(image_utils, "MAX_IMAGE_FILE_SIZE", 10)
+    is_valid, message = image_utils.validate_image_path(path)
+    assert not is_valid
+    assert "10MB" in message
+
+
+def test_invalid_paths(tmp_path):
+    assert not image_utils.validate_image_path("")[0]
+    assert not image_utils.validate_image_path(str(tmp_path / "missing.jpg"))[0]
+    assert not image_utils.validate_image_path(str(tmp_path))[0]
+    bad = tmp_path / "bad.png"
+    bad.write_bytes(b"not an image")
+    assert not image_utils.validate_image_path(str(bad))[0]
+
+
+def test_archive_member_reference(tmp_path):
+    src = tmp_path / "src.png"
+    Image.new("RGB", (40, 20)).save(src, "PNG")
+    archive = tmp_path / "photos.zip"
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as z:
+        z.write(src, "2023/20231234.PNG")
+        z.writestr("readme.txt", "x")
+
+    refs = image_utils.expand_image_archives([str(archive), str(src)])
+    assert refs == [f"{archive}!/2023/20231234.PNG", str(src)]
+
+    ref = refs[0]
+    info = image_utils.get_image_info(ref)
+    assert info["valid"] and (info["width"], info["height"]) == (40, 20)
+    assert image_utils.get_image_info(ref) is info
+    assert image_utils.read_image_bytes(ref) == src.read_bytes()
+    assert not image_utils.get_image_info(f"{archive}!/2023/missing.png")["valid"]
+
+    with image_utils.local_image_path(ref) as local_path:
+        assert open(local_path, "rb").read() == src.read_bytes()
+    assert not os.path.exists(local_path)
+    image_utils.close_image_archives()
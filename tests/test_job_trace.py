@@ -0,0 +1,60 @@
+import os
+import sys
+import csv
+import json
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import job_trace  # noqa: E402
+
+
+def test_nested_spans_record_self_time_and_inherit_row():
+    trace = job_trace.JobTrace()
+    with trace.span('fill', 3):
+        time.sleep(0.02)
+        with trace.span('image'):
+            time.sleep(0.03)
+    image, fill = trace.spans
+    assert image['phase'] == 'image' and image['row'] == 3
+    # 바깥 단계의 단독 시간에서 안쪽 단계 시간이 빠짐
+    assert fill['seconds'] >= image['seconds'] + fill['self_seconds'] - 1e-6
+    assert fill['self_seconds'] < fill['seconds']
+
+
+def test_module_span_is_noop_without_active_trace():
+    job_trace.activate(None)
+    with job_trace.span('save', 0):
+        pass
+    assert job_trace.begin('merge') is None
+    job_trace.end(None)
+
+
+def test_summary_percentiles_and_written_files(tmp_path):
+    trace = job_trace.JobTrace(rows=5)
+    for row, seconds in enumerate([1.0, 2.0, 3.0, 4.0, 5.0]):
+        trace.spans.append({'phase': 'save', 'row': row, 'start': float(row), 'seconds': seconds,
+                            'self_seconds': seconds, 'pid': 1})
+    trace.spans.append({'phase': 'open', 'row': 0, 'start': 0.0, 'seconds': 0.5, 'self_seconds': 0.5, 'pid': 1})
+
+    summary = trace.summary()
+    assert list(summary) == ['open', 'save']
+    assert summary['save']['p50'] == 3.0
+    assert summary['save']['p95'] == 4.8
+    assert summary['save']['count'] == 5
+
+    json_path, csv_path = trace.write(str(tmp_path / "job_trace"))
+    with open(json_path, encoding='utf-8') as f:
+        data = json.load(f)
+    assert data['meta'] == {'rows': 5}
+    assert [s['phase'] for s in data['spans']][:2] == ['save', 'open']
+    with open(csv_path, encoding='utf-8-sig') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 6 and rows[0]['phase'] == 'save'
+
+
+def test_extend_shifts_spans_from_other_processes():
+    trace = job_trace.JobTrace()
+    trace.extend([{'phase': 'fill', 'row': 0, 'start': 1.0, 'seconds': 1.0, 'self_seconds': 1.0, 'pid': 2}],
+                 trace.wall_start + 2.0)
+    assert trace.spans[0]['start'] == 3.0
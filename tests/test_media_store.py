@@ -0,0 +1,107 @@
+import os
+import sys
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import media_store  # noqa: E402
+
+LOGO = b"\x89PNG\r\n\x1a\n" + b"logo" * 2000
+PHOTO = b"\xff\xd8\xff" + b"photo" * 2000
+
+
+def _write_zip(path, members):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        for name, data in members:
+            z.writestr(name, data)
+    return str(path)
+
+
+def _slide_rels(image):
+    return ('<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/image" '
+            f'Target="../media/{image}"/></Relationships>')
+
+
+def test_media_store_returns_first_name_for_same_content():
+    store = media_store.MediaStore()
+    assert store.add(LOGO, "a.png") == "a.png"
+    assert store.add(PHOTO, "b.jpg") == "b.jpg"
+    assert store.add(LOGO, "c.png") == "a.png"
+    report = store.report()
+    assert (report["parts"], report["unique"]) == (3, 2)
+    assert report["stored_bytes"] == len(LOGO) + len(PHOTO)
+
+
+def test_dedupe_pptx_rewrites_relationships(tmp_path):
+    path = _write_zip(tmp_path / "out.pptx", [
+        ("[Content_Types].xml", '<Types><Default Extension="png" ContentType="image/png"/>'
+                                '<Override PartName="/ppt/media/image3.png" ContentType="image/png"/></Types>'),
+        ("ppt/slides/slide1.xml", "<p:sld/>"),
+        ("ppt/slides/_rels/slide1.xml.rels", _slide_rels("image1.png")),
+        ("ppt/slides/slide2.xml", "<p:sld/>"),
+        ("ppt/slides/_rels/slide2.xml.rels", _slide_rels("image2.jpeg")),
+        ("ppt/slides/slide3.xml", "<p:sld/>"),
+        ("ppt/slides/_rels/slide3.xml.rels", _slide_rels("image3.png")),
+        ("ppt/media/image1.png", LOGO),
+        ("ppt/media/image2.jpeg", PHOTO),
+        ("ppt/media/image3.png", LOGO),
+    ])
+
+    report = media_store.dedupe_package_media(path)
+
+    assert (report["parts"], report["unique"]) == (3, 2)
+    with zipfile.ZipFile(path) as z:
+        names = z.namelist()
+        assert "ppt/media/image3.png" not in names
+        assert names[0] == "[Content_Types].xml"
+        assert 'Target="../media/image1.png"' in z.read("ppt/slides/_rels/slide3.xml.rels").decode()
+        assert 'Target="../media/image2.jpeg"' in z.read("ppt/slides/_rels/slide2.xml.rels").decode()
+        assert "image3.png" not in z.read("[Content_Types].xml").decode()
+
+
+def test_dedupe_docx_without_duplicates_keeps_file(tmp_path):
+    path = _write_zip(tmp_path / "out.docx", [
+        ("[Content_Types].xml", "<Types/>"),
+        ("word/_rels/document.xml.rels", '<Relationships><Relationship Id="rId1" Target="media/image1.png"/></Relationships>'),
+        ("word/media/image1.png", LOGO),
+    ])
+    before = open(path, "rb").read()
+    report = media_store.dedupe_package_media(path)
+    assert (report["parts"], report["unique"], report["saved_bytes"]) == (1, 1, 0)
+    assert open(path, "rb").read() == before
+
+
+def test_dedupe_hwpx_rewrites_binary_item_refs(tmp_path):
+    manifest = ('<opf:package><opf:manifest>'
+                '<opf:item id="header" href="Contents/header.xml" media-type="application/xml"/>'
+                '<opf:item id="image1" href="BinData/image1.png" media-type="image/png" isEmbeded="1"/>'
+                '<opf:item id="image2" href="BinData/image2.png" media-type="image/png" isEmbeded="1"/>'
+                '</opf:manifest></opf:package>')
+    section = ('<hs:sec><hc:img binaryItemIDRef="image1"/><hc:img binaryItemIDRef="image2"/>'
+               '<hc:img binaryItemIDRef="image10"/></hs:sec>')
+    path = str(tmp_path / "out.hwpx")
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr("mimetype", "application/hwp+zip", compress_type=zipfile.ZIP_STORED)
+        z.writestr("Contents/content.hpf", manifest, compress_type=zipfile.ZIP_DEFLATED)
+        z.writestr("Contents/section0.xml", section, compress_type=zipfile.ZIP_DEFLATED)
+        z.writestr("BinData/image1.png", LOGO, compress_type=zipfile.ZIP_DEFLATED)
+        z.writestr("BinData/image2.png", LOGO, compress_type=zipfile.ZIP_DEFLATED)
+
+    report = media_store.dedupe_package_media(path)
+
+    assert (report["parts"], report["unique"]) == (2, 1)
+    with zipfile.ZipFile(path) as z:
+        assert z.infolist()[0].filename == "mimetype"
+        assert z.infolist()[0].compress_type == zipfile.ZIP_STORED
+        assert "BinData/image2.png" not in z.namelist()
+        assert 'id="image2"' not in z.read("Contents/content.hpf").decode()
+        sec = z.read("Contents/section0.xml").decode()
+        assert sec.count('binaryItemIDRef="image1"') == 2
+        assert 'binaryItemIDRef="image10"' in sec
+
+
+def test_unsupported_format_is_skipped(tmp_path):
+    path = tmp_path / "out.hwp"
+    path.write_bytes(b"binary hwp")
+    assert media_store.dedupe_package_media(str(path)) is None
@@ -0,0 +1,184 @@
+import io
+import os
+import sys
+import zipfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pd = pytest.importorskip("pandas")
+import native_merge  # noqa: E402
+import template_cache  # noqa: E402
+import yongmerge  # noqa: E402
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+A = 'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"'
+HP = 'xmlns:hp="http://www.hancom.co.kr/hwpml/2011/paragraph"'
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path):
+    template_cache.configure(cache_dir=str(tmp_path / "cache"))
+    yield
+    template_cache.configure()
+
+
+def _zip(path, parts):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, xml in parts.items():
+            archive.writestr(name, xml)
+    return str(path)
+
+
+def _docx(tmp_path):
+    return _zip(tmp_path / "letter.docx", {
+        "[Content_Types].xml": "<Types/>",
+        "word/document.xml": f'<w:document {W}><w:body><w:p><w:r><w:t>{{{{이</w:t></w:r>'
+                             f'<w:r><w:rPr><w:b/></w:rPr><w:t>름}}}}님 {{반}}반 {{{{없음}}}}</w:t></w:r></w:p>'
+                             f'<w:p><w:r><w:t>{{{{메모}}}}</w:t></w:r></w:p></w:body></w:document>',
+        "word/header1.xml": f'<w:hdr {W}><w:p><w:r><w:t>{{{{이름}}}}</w:t></w:r></w:p></w:hdr>',
+        "word/styles.xml": f'<w:styles {W}/>',
+    })
+
+
+def test_docx_compiles_once_and_renders_rows(tmp_path):
+    template = _docx(tmp_path)
+    df = pd.DataFrame({"이름": ["A&B", "나"], "반": ["1", "2"], "메모": ["첫 줄\n둘째 <줄>", None]}, index=[4, 5])
+    merge = native_merge.open_merge(template, df)
+
+    assert sorted(merge.parts) == ["word/document.xml", "word/header1.xml"]
+    first = merge.render_part("word/document.xml", 0).decode("utf-8")
+    assert ('<w:t xml:space="preserve">A&amp;B</w:t></w:r>'
+            '<w:r><w:rPr><w:b/></w:rPr><w:t xml:space="preserve">님 1반 {{없음}}</w:t>') in first
+    assert '첫 줄</w:t><w:br/><w:t xml:space="preserve">둘째 &lt;줄&gt;' in first
+    assert merge.render_part("word/header1.xml", 1) == \
+        f'<w:hdr {W}><w:p><w:r><w:t xml:space="preserve">나</w:t></w:r></w:p></w:hdr>'.encode("utf-8")
+
+    assert merge.process_individual().startswith("INDIVIDUAL_DONE|")
+    output = tmp_path / "letter_row_6.docx"
+    with zipfile.ZipFile(output) as archive, zipfile.ZipFile(template) as source:
+        assert archive.namelist() == source.namelist()
+        assert archive.read("word/styles.xml") == source.read("word/styles.xml")
+        assert '<w:t xml:space="preserve">나</w:t>' in archive.read("word/document.xml").decode("utf-8")
+
+    # 같은 템플릿은 캐시된 컴파일 결과를 재사용
+    builds = template_cache.stats['builds']
+    native_merge.compile_template(template)
+    assert template_cache.stats['builds'] == builds
+
+
+def test_unchanged_members_are_copied_without_recompressing(tmp_path):
+    template = tmp_path / "t.hwpx"
+    with zipfile.ZipFile(template, "w") as archive:
+        archive.writestr("mimetype", "application/hwp+zip", zipfile.ZIP_STORED)
+        archive.writestr("Contents/header.xml", "<hh:head>" + "스타일" * 500 + "</hh:head>", zipfile.ZIP_DEFLATED)
+        archive.writestr("Contents/section0.xml", f'<hp:sec {HP}><hp:p><hp:run><hp:ctrl><hp:fieldBegin name="이름"/>'
+                         f'</hp:ctrl><hp:ctrl><hp:fieldEnd/></hp:ctrl></hp:run></hp:p></hp:sec>', zipfile.ZIP_DEFLATED)
+    merge = native_merge.open_merge(str(template), pd.DataFrame({"이름": ["가"]}))
+
+    source = dict((info.filename, raw) for info, raw in native_merge.read_raw_members(str(template)))
+    output = tmp_path / "out.hwpx"
+    merge.write_document(0, str(output))
+    with zipfile.ZipFile(output) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == ["mimetype", "Contents/header.xml", "Contents/section0.xml"]
+        assert archive.getinfo("mimetype").compress_type == zipfile.ZIP_STORED
+        assert "<hp:t>가</hp:t>" in archive.read("Contents/section0.xml").decode("utf-8")
+    copied = dict((info.filename, raw) for info, raw in native_merge.read_raw_members(str(output)))
+    assert copied["Contents/header.xml"] == source["Contents/header.xml"]
+    assert copied["mimetype"] == source["mimetype"]
+
+
+def test_compression_policies_and_threaded_deflate(tmp_path):
+    template = _docx(tmp_path)
+    df = pd.DataFrame({"이름": [f"이름{i}" for i in range(20)], "반": ["1"] * 20, "메모": ["메모 " * 50] * 20})
+    sizes = {}
+    for policy in native_merge.COMPRESSION_POLICIES:
+        serial = native_merge.NativeMerge(template, df, compression=policy, threads=1)
+        threaded = native_merge.NativeMerge(template, df, compression=policy, threads=4)
+        encoded = list(threaded.iter_encoded())
+        assert [position for position, _ in encoded] == list(range(20))
+        assert {name: data for name, (_, data) in encoded[7][1].items()} == \
+            {name: data for name, (_, data) in serial.encode_parts(7).items()}
+
+        output = tmp_path / f"{policy}.docx"
+        threaded.write_document(7, str(output), encoded[7][1])
+        with zipfile.ZipFile(output) as archive:
+            assert archive.testzip() is None
+            assert "이름7" in archive.read("word/document.xml").decode("utf-8")
+            methods = {info.compress_type for info in archive.infolist()}
+        assert methods == ({zipfile.ZIP_STORED} if policy == "store" else {zipfile.ZIP_DEFLATED})
+        sizes[policy] = os.path.getsize(output)
+    assert sizes["store"] > sizes["fast"] >= sizes["max"]
+    with pytest.raises(ValueError):
+        native_merge.NativeMerge(template, df, compression="zstd")
+
+
+def test_pptx_and_hwpx_fields(tmp_path):
+    pptx = _zip(tmp_path / "t.pptx", {
+        "ppt/slides/slide1.xml": f'<p:sld xmlns:p="p" {A}><a:p><a:r><a:t>{{{{이름}}}} 님</a:t></a:r></a:p></p:sld>',
+    })
+    merge = native_merge.open_merge(pptx, pd.DataFrame({"이름": ["가"]}))
+    assert b"<a:t>\xea\xb0\x80 \xeb\x8b\x98</a:t>" in merge.render_part("ppt/slides/slide1.xml", 0)
+
+    hwpx = _zip(tmp_path / "t.hwpx", {
+        "mimetype": "application/hwp+zip",
+        "Contents/section0.xml": f'<hp:sec {HP}><hp:p><hp:run><hp:ctrl>'
+                                 f'<hp:fieldBegin type="CLICK_HERE" name="이름"><hp:parameters/></hp:fieldBegin>'
+                                 f'</hp:ctrl><hp:t>여기에 입력</hp:t><hp:ctrl><hp:fieldEnd/></hp:ctrl></hp:run>'
+                                 f'<hp:run><hp:ctrl><hp:fieldBegin type="CLICK_HERE" name="비고"/></hp:ctrl>'
+                                 f'<hp:t>기본값</hp:t><hp:ctrl><hp:fieldEnd/></hp:ctrl></hp:run></hp:p></hp:sec>',
+    })
+    merge = native_merge.open_merge(hwpx, pd.DataFrame({"이름": ["가\n나"]}))
+    section = merge.render_part("Contents/section0.xml", 0).decode("utf-8")
+    # 값을 넣고 누름틀은 지움 (데이터에 없는 필드는 원래 내용 유지)
+    assert section == (f'<hp:sec {HP}><hp:p><hp:run><hp:t>가<hp:lineBreak/>나</hp:t><hp:t></hp:t></hp:run>'
+                       f'<hp:run><hp:t>기본값</hp:t></hp:run></hp:p></hp:sec>')
+
+
+def test_unsupported_cases_fall_back_to_com(tmp_path):
+    template = _docx(tmp_path)
+    with pytest.raises(native_merge.UnsupportedTemplate):
+        native_merge.open_merge(template, pd.DataFrame({"이름": ["photo.png"]}))
+    with pytest.raises(native_merge.UnsupportedTemplate):
+        native_merge.open_merge(template, pd.DataFrame({"이름": ["가"]}), "combined")
+    binary = tmp_path / "old.doc"
+    binary.write_bytes(b"binary")
+    with pytest.raises(native_merge.UnsupportedTemplate):
+        native_merge.open_merge(str(binary), pd.DataFrame({"이름": ["가"]}))
+
+    # 헤드리스 API는 문서 프로그램 없이 네이티브 엔진으로 실행
+    result = yongmerge.run_merge(template, pd.DataFrame({"이름": ["가"], "반": ["1"]}))
+    assert result["engine"] == "native" and result["count"] == 1
+    with pytest.raises(yongmerge.MergeError):
+        yongmerge.run_merge(template, pd.DataFrame({"이름": ["가"]}), "combined", engine="native")
+
+
+def test_iter_documents_yields_bytes_without_disk_writes(tmp_path):
+    template = _docx(tmp_path)
+    df = pd.DataFrame({"이름": [f"이름{i}" for i in range(12)], "반": ["1"] * 12, "메모": [""] * 12}, index=range(10, 22))
+    merge = native_merge.NativeMerge(template, df, threads=2)
+    built = []
+    document_bytes = merge.document_bytes
+    merge.document_bytes = lambda position: built.append(position) or document_bytes(position)
+
+    before = sorted(os.listdir(tmp_path))
+    consumed = 0
+    for key, filename, data in merge.iter_documents("{이름}", max_pending=3):
+        consumed += 1
+        # 미리 만들어 두는 문서는 max_pending개까지
+        assert len(built) <= consumed + 3
+        assert filename == f"이름{key - 10}.docx"
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            assert f"이름{key - 10}" in archive.read("word/document.xml").decode("utf-8")
+    assert consumed == 12
+    assert sorted(os.listdir(tmp_path)) == before
+
+    documents = yongmerge.iter_documents(template, df.head(2))
+    assert [(key, name) for key, name, _ in documents] == [(10, "letter_row_11.docx"), (11, "letter_row_12.docx")]
+    # 템플릿이 쓰지 않는 열(학번)도 파일 이름 패턴에 쓸 수 있음
+    ids = df.head(2).assign(학번=["s1", "s2"])
+    assert [name for _, name, _ in yongmerge.iter_documents(template, ids, "{학번}")] == ["s1.docx", "s2.docx"]
+    with pytest.raises(yongmerge.MergeError):
+        yongmerge.iter_documents(template, pd.DataFrame({"이름": ["photo.png"]}))
@@ -0,0 +1,126 @@
+import os
+import sys
+import json
+import time
+import zipfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pd = pytest.importorskip("pandas")
+import com_factory  # noqa: E402
+import fake_com  # noqa: E402
+import output_archive  # noqa: E402
+import row_values  # noqa: E402
+import template_cache  # noqa: E402
+import yongmerge  # noqa: E402
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path):
+    template_cache.configure(cache_dir=str(tmp_path / "cache"))
+    yield
+    template_cache.configure()
+
+
+def test_file_namer_uses_pattern_and_dedupes(tmp_path):
+    rows = row_values.prepare_rows(pd.DataFrame({"이름": ["가", "가", "a/b"], "학번": ["1", "1", "2"]}))
+    namer = output_archive.FileNamer("/x/letter.docx", rows.names, "{이름}_{{학번}}")
+    assert [namer.name(rows.row(i)) for i in range(3)] == ["가_1.docx", "가_1_2.docx", "a_b_2.docx"]
+
+    namer = output_archive.FileNamer("/x/letter.hwp", rows.names, "{row}-{없는열}")
+    assert namer.name(rows.row(2)) == "3-{없는열}.hwp"
+    assert output_archive.FileNamer("/x/letter.hwp", rows.names).name(rows.row(0)) == "letter_row_1.hwp"
+
+
+def test_native_archive_streams_documents_into_one_zip(tmp_path):
+    template = tmp_path / "letter.docx"
+    with zipfile.ZipFile(template, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("word/document.xml", f'<w:document {W}><w:p><w:r><w:t>{{{{이름}}}}</w:t></w:r></w:p></w:document>')
+    df = pd.DataFrame({"이름": ["가", "나", "가"]})
+
+    result = yongmerge.run_merge(str(template), df, "archive", name_pattern="{이름}")
+    assert result["type"] == "ARCHIVE_DONE" and result["engine"] == "native" and result["count"] == 3
+    assert result["path"] == str(tmp_path / "letter_documents.zip")
+    # 개별 파일은 폴더에 만들지 않음
+    assert not any(name.startswith("letter_row_") for name in os.listdir(tmp_path))
+    with zipfile.ZipFile(result["path"]) as archive:
+        assert archive.namelist() == ["가.docx", "나.docx", "가_2.docx"]
+        with zipfile.ZipFile(archive.open("나.docx")) as document:
+            assert ">나<" in document.read("word/document.xml").decode("utf-8")
+
+
+def test_com_archive_moves_saved_files_into_zip(tmp_path, monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    template = fake_com.write_template(str(tmp_path / "deck.pptx"), "ppt", [["{{이름}} 학생"]])
+    df = pd.DataFrame({"이름": ["가", "나"]})
+    output = tmp_path / "out" / "decks.zip"
+    output.parent.mkdir()
+
+    with com_factory.use_factory(fake_com.FakeComFactory()):
+        result = yongmerge.run_merge(template, df, "archive", str(output), jobs=4, engine="com",
+                                     name_pattern="{이름}")
+    assert result["type"] == "ARCHIVE_DONE" and result["jobs"] == 1 and result["count"] == 2
+    assert sorted(os.listdir(output.parent)) == ["decks.zip", "decks_trace.csv", "decks_trace.json"]
+    with zipfile.ZipFile(output) as archive:
+        assert archive.namelist() == ["가.pptx", "나.pptx"]
+        slides = json.loads(archive.read("나.pptx"))["slides"]
+    assert "나 학생" in json.dumps(slides, ensure_ascii=False)
+
+
+def test_name_pattern_columns_survive_column_pruning(tmp_path):
+    # 템플릿은 {{이름}}만 쓰지만 파일 이름 패턴은 학번도 씀
+    template = tmp_path / "letter.docx"
+    with zipfile.ZipFile(template, "w") as archive:
+        archive.writestr("word/document.xml", f'<w:document {W}><w:p><w:r><w:t>{{{{이름}}}}</w:t></w:r></w:p></w:document>')
+    df = pd.DataFrame({"이름": ["가", "나"], "학번": ["11", "12"], "메모": ["x", "y"]})
+
+    result = yongmerge.run_merge(str(template), df, "archive", name_pattern="{학번}_{이름}")
+    with zipfile.ZipFile(result["path"]) as archive:
+        assert archive.namelist() == ["11_가.docx", "12_나.docx"]
+    assert result["fields"]["used"] == ["이름"]
+
+    result = yongmerge.run_merge(str(template), df, "archive", str(tmp_path / "ids.zip"), name_pattern="{학번}")
+    with zipfile.ZipFile(result["path"]) as archive:
+        assert archive.namelist() == ["11.docx", "12.docx"]
+
+
+def test_locked_files_are_retried_without_duplicate_entries(tmp_path, monkeypatch):
+    import hwp_automation
+
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    rows = row_values.prepare_rows(pd.DataFrame({"이름": ["가", "나"]}))
+    namer = output_archive.FileNamer(str(tmp_path / "t.hwp"), rows.names, "{이름}")
+    with output_archive.ArchiveWriter(str(tmp_path / "out.zip"), namer) as archive:
+        first = archive.temp_path(rows.row(0))
+        with open(first, "wb") as f:
+            f.write(b"doc1")
+        # 한글이 아직 파일을 잡고 있으면 ZIP에 쓰지 않고 실패 → 다시 시도
+        real_open, failures = open, []
+
+        def locked_once(path, *args):
+            if not failures:
+                failures.append(path)
+                raise PermissionError("locked")
+            return real_open(path, *args)
+
+        with monkeypatch.context() as m:
+            m.setattr(output_archive, "open", locked_once, raising=False)
+            assert hwp_automation._move_to_sink(archive, rows.row(0), first) == "가.hwp"
+
+        # ZIP에 넣은 뒤 원본 삭제에 실패해도 같은 문서를 다시 넣지 않음
+        second = archive.temp_path(rows.row(1))
+        with open(second, "wb") as f:
+            f.write(b"doc2")
+        with monkeypatch.context() as m:
+            m.setattr(output_archive.os, "remove", lambda path: (_ for _ in ()).throw(PermissionError(path)))
+            assert hwp_automation._move_to_sink(archive, rows.row(1), second) == "나.hwp"
+
+        with pytest.raises(Exception, match="ZIP"):
+            hwp_automation._move_to_sink(archive, rows.row(1), str(tmp_path / "missing.hwp"))
+    with zipfile.ZipFile(tmp_path / "out.zip") as result:
+        assert result.namelist() == ["가.hwp", "나.hwp"]
+        assert result.read("나.hwp") == b"doc2"
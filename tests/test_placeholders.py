@@ -0,0 +1,31 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import placeholders  # noqa: E402
+
+
+def test_longest_form_wins_and_names_are_escaped():
+    scanner = placeholders.PlaceholderScanner(["이름", "a.b", "IMAGE", 3])
+    text = "{{이름}} {이름} {{a.b}} {axb} {{IMAGE}} {3} {{없음}}"
+
+    found = [(name, token) for _, _, name, token in scanner.finditer(text)]
+    assert found == [("이름", "{{이름}}"), ("이름", "{이름}"), ("a.b", "{{a.b}}"),
+                     ("IMAGE", "{{IMAGE}}"), ("3", "{3}")]
+    assert scanner.column("3") == 3
+    assert scanner.names(text) == ["이름", "a.b", "IMAGE", "3"]
+
+
+def test_tokens_put_double_braces_first():
+    scanner = placeholders.PlaceholderScanner(["x"])
+    assert scanner.tokens("{x} 그리고 {{x}} {x}") == [("{{x}}", "x"), ("{x}", "x")]
+
+
+def test_substitute_in_one_pass():
+    scanner = placeholders.PlaceholderScanner(["a", "ab"])
+    # 값 안의 자리 표시자는 다시 바꾸지 않음
+    assert scanner.substitute("{{a}}-{ab}-{c}", {"a": "{ab}", "ab": "2"}) == "{ab}-2-{c}"
+    assert placeholders.PlaceholderScanner([]).substitute("{{a}}", {}) == "{{a}}"
+    assert placeholders.format_placeholder("a") == "{{a}}"
+    assert placeholders.format_placeholder("a", short=True) == "{a}"
@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pd = pytest.importorskip("pandas")
+import row_values  # noqa: E402
+
+
+def test_prepare_rows_converts_columns_once():
+    df = pd.DataFrame({"이름": ["가", None, "A&B"], "번호": [1, 2, 3], "사진": ["a.PNG", "", "없음"]},
+                      index=[10, 11, 12])
+    rows = row_values.prepare_rows(df)
+
+    assert rows.names == ["이름", "번호", "사진"]
+    assert rows.values == [("가", "1", "a.PNG"), ("", "2", ""), ("A&B", "3", "없음")]
+    assert rows.image_columns() == ["사진"]
+    assert row_values.prepare_rows(rows) is rows
+
+    first, second, third = list(rows)
+    assert first.index == 10 and first.get("사진") == "a.PNG" and first.is_image("사진")
+    assert not second.is_image("사진") and not third.is_image("사진")
+    assert first.image_values() == ["a.PNG"] and third.image_values() == []
+    assert second.get("없는 열", None) is None and not second.is_image("없는 열")
+    assert third.escaped("이름") == "A&amp;B"
+
+
+def test_non_string_column_names_and_empty_columns():
+    rows = row_values.prepare_rows(pd.DataFrame(index=range(2)))
+    assert len(rows) == 2 and rows.values == [(), ()]
+
+    rows = row_values.prepare_rows(pd.DataFrame({1: [1.5, float("nan")]}))
+    assert rows.names == ["1"] and [row.get("1") for row in rows] == ["1.5", ""]
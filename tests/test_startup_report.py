@@ -0,0 +1,28 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import startup_report  # noqa: E402
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      3000 |       3100 |   encodings
+import time:       900 |     380000 |     numpy
+import time:      5000 |     520000 |   pandas
+import time:      2000 |      2000 | site
+import time:      4000 |     50000 | PyQt5.QtWidgets
+import time:       300 |     530000 | data_sources
+"""
+
+
+def test_parse_importtime_depths():
+    modules = startup_report.parse_importtime(SAMPLE)
+    assert modules[0] == ("_io", 120, 120, 1)
+    assert ("numpy", 380000, 900, 2) in modules
+    assert modules[-1] == ("data_sources", 530000, 300, 0)
+
+
+def test_top_level_imports_sorted_by_cumulative_time():
+    modules = startup_report.parse_importtime(SAMPLE)
+    assert startup_report.top_level_imports(modules, limit=2) == [("data_sources", 530000), ("PyQt5.QtWidgets", 50000)]
@@ -0,0 +1,58 @@
+import os
+import sys
+import shutil
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import template_cache  # noqa: E402
+
+
+@pytest.fixture
+def cache(tmp_path):
+    template_cache.configure(cache_dir=str(tmp_path / "cache"))
+    yield template_cache
+    template_cache.configure()
+
+
+def test_reuses_across_restarts_and_paths(cache, tmp_path):
+    template = tmp_path / "a.docx"
+    template.write_bytes(b"template-1")
+    builds = []
+
+    def build(path):
+        builds.append(path)
+        return {'fields': ['이름'], 'blob': b'\x00\x01'}
+
+    first = cache.get(str(template), 'fields', build)
+    assert cache.get(str(template), 'fields', build) is first      # 메모리
+    cache.configure(cache_dir=cache.cache_dir())                    # 재시작 흉내
+    assert cache.get(str(template), 'fields', build) == first      # 디스크
+    copy = tmp_path / "copy.docx"
+    shutil.copy(template, copy)
+    assert cache.get(str(copy), 'fields', build) == first          # 같은 내용, 다른 경로
+    assert len(builds) == 1
+
+    template.write_bytes(b"template-2 changed")
+    cache.get(str(template), 'fields', build)
+    assert len(builds) == 2
+    assert cache.fingerprint(str(template))['sha256'] != cache.fingerprint(str(copy))['sha256']
+
+
+def test_evicts_least_recently_used(cache, tmp_path):
+    cache.configure(cache_dir=cache.cache_dir(), max_bytes=2500)
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"t{i}.pptx"
+        path.write_bytes(f"template-{i}".encode())
+        paths.append(str(path))
+        cache.get(paths[-1], 'segments', lambda p: b"x" * 1000)
+        # 파일 시각이 같아도 순서가 정해지도록 사용 시각을 차례로 지정
+        entry = cache._entry_path(f"{cache.fingerprint(paths[-1])['sha256']}_segments_v{cache.CACHE_VERSION}")
+        os.utime(entry, (1000 + i, 1000 + i))
+    cache._evict()
+
+    remaining = [os.path.exists(cache._entry_path(f"{cache.fingerprint(p)['sha256']}_segments_v{cache.CACHE_VERSION}"))
+                 for p in paths]
+    assert remaining == [False, True, True]
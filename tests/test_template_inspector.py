@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+import zipfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import template_cache  # noqa: E402
+import template_inspector  # noqa: E402
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+A = 'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"'
+HP = 'xmlns:hp="http://www.hancom.co.kr/hwpml/2011/paragraph"'
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path):
+    template_cache.configure(cache_dir=str(tmp_path / "cache"))
+    yield
+    template_cache.configure()
+
+
+def _zip(path, parts):
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, xml in parts.items():
+            archive.writestr(name, xml)
+    return str(path)
+
+
+def test_docx_fields_across_runs_headers_and_short_form(tmp_path):
+    path = _zip(tmp_path / "t.docx", {
+        "word/document.xml": f'<w:document {W}><w:body><w:p><w:r><w:t>{{{{이</w:t></w:r>'
+                             f'<w:r><w:t>름}}}} {{반}}</w:t></w:r></w:p></w:body></w:document>',
+        "word/header1.xml": f'<w:hdr {W}><w:p><w:r><w:t>{{{{학교}}}}</w:t></w:r></w:p></w:hdr>',
+        "word/styles.xml": f'<w:styles {W}><w:p><w:r><w:t>{{{{무시}}}}</w:t></w:r></w:p></w:styles>',
+    })
+    fields = template_inspector.inspect_template(path)
+    assert fields.fields == ["이름", "학교"] and fields.short == ["반"]
+    assert fields.parts == {"word/document.xml": ["이름", "반"], "word/header1.xml": ["학교"]}
+    assert template_cache.stats['builds'] >= 1
+
+    plan = fields.plan(["이름", "반", "비고"])
+    assert plan.used == ["이름", "반"]
+    assert plan.unused_columns == ["비고"]
+    assert plan.missing_fields == ["학교"]
+
+
+def test_pptx_and_hwpx_fields(tmp_path):
+    pptx = _zip(tmp_path / "t.pptx", {
+        "ppt/slides/slide1.xml": f'<p:sld xmlns:p="p" {A}><a:p><a:r><a:t>{{{{IMAGE}}}}</a:t></a:r></a:p></p:sld>',
+    })
+    assert template_inspector.inspect_template(pptx).fields == ["IMAGE"]
+
+    hwpx = _zip(tmp_path / "t.hwpx", {
+        "Contents/section0.xml": f'<hp:sec {HP}><hp:p><hp:run><hp:ctrl>'
+                                 f'<hp:fieldBegin type="CLICK_HERE" name="이름"/></hp:ctrl>'
+                                 f'<hp:t>{{{{텍스트}}}}</hp:t></hp:run></hp:p>'
+                                 f'<hp:tbl><hp:tr><hp:tc name="점수"/></hp:tr></hp:tbl></hp:sec>',
+    })
+    assert template_inspector.inspect_template(hwpx).fields == ["이름", "점수"]
+
+    binary = tmp_path / "t.hwp"
+    binary.write_bytes(b"\xd0\xcf\x11\xe0")
+    assert template_inspector.inspect_template(str(binary)) is None
+
+
+def test_hwp_engine_skips_columns_not_in_template(tmp_path, monkeypatch):
+    pd = pytest.importorskip("pandas")
+    import com_factory
+    import fake_com
+    import yongmerge
+
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    template = fake_com.write_template(str(tmp_path / "letter.hwp"), "hwp", "{{이름}} {{학교}}")
+    rows = pd.DataFrame({"이름": ["가", "나"], "비고": ["x", "y"], "메모": ["", ""]})
+    factory = fake_com.FakeComFactory()
+    with com_factory.use_factory(factory):
+        yongmerge.run_merge(template, rows, "individual")
+
+    assert factory.calls["Hwp.PutFieldText"] == 2
@@ -0,0 +1,136 @@
+import os
+import sys
+import json
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pd = pytest.importorskip("pandas")
+import yongmerge  # noqa: E402
+
+
+@pytest.fixture
+def fake_word(monkeypatch):
+    """COM 대신 호출 인자만 기록하는 Word 엔진."""
+    calls = []
+
+    def process_word_template(dataframe, template_path, output_type, progress, save_path=None, image_options=None):
+        calls.append((list(dataframe.index), output_type, save_path, image_options))
+        for position in range(len(dataframe)):
+            progress.emit(int((position + 1) / len(dataframe) * 100))
+        if output_type == 'combined':
+            with open(save_path, "wb") as f:
+                f.write(b"combined")
+            return f"COMBINED_DONE|{save_path}|{len(dataframe)}"
+        return f"INDIVIDUAL_DONE|{os.path.dirname(template_path)}|{len(dataframe)}"
+
+    engine = types.SimpleNamespace(process_word_template=process_word_template)
+    monkeypatch.setattr(yongmerge, "_load_engine", lambda doc_type: engine)
+    return calls
+
+
+@pytest.fixture
+def job_files(tmp_path):
+    template = tmp_path / "letter.docx"
+    template.write_bytes(b"template")
+    data = tmp_path / "data.csv"
+    pd.DataFrame({"이름": ["가", "나", None], "학번": ["1", "2", None]}).to_csv(data, index=False)
+    return str(template), str(data)
+
+
+def _events(text):
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def test_cli_streams_json_progress_and_returns_zero(fake_word, job_files, capsys):
+    template, data = job_files
+    code = yongmerge.main(["run", "--template", template, "--data", data, "--mode", "combined", "--jobs", "8"])
+
+    events = _events(capsys.readouterr().out)
+    assert code == yongmerge.EXIT_OK
+    assert [e["event"] for e in events] == ["start", "progress", "progress", "done"]
+    assert events[0]["rows"] == 2
+    done = events[-1]
+    assert done["type"] == "COMBINED_DONE" and done["count"] == 2
+    # 통합본은 한 문서로 합쳐야 하므로 한 프로세스에서 실행
+    assert done["jobs"] == 1
+    assert done["path"] == os.path.splitext(template)[0] + "_combined.docx"
+    assert fake_word[0][:2] == ([0, 1], "combined")
+    # 단계별 추적은 통합본 옆에 저장
+    assert done["trace"]["files"] == [os.path.splitext(done["path"])[0] + "_trace.json",
+                                      os.path.splitext(done["path"])[0] + "_trace.csv"]
+    assert all(os.path.exists(path) for path in done["trace"]["files"])
+
+
+def test_cli_com_stats_reports_top_members(monkeypatch, job_files, capsys):
+    import com_probe
+
+    def process_word_template(dataframe, template_path, output_type, progress, save_path=None, image_options=None):
+        word = com_probe.wrap(types.SimpleNamespace(Visible=False, Documents=types.SimpleNamespace(Count=0)), 'word')
+        for _ in range(len(dataframe)):
+            _ = word.Documents.Count
+        word.Visible = True
+        return f"INDIVIDUAL_DONE|{os.path.dirname(template_path)}|{len(dataframe)}"
+
+    engine = types.SimpleNamespace(process_word_template=process_word_template)
+    monkeypatch.setattr(yongmerge, "_load_engine", lambda doc_type: engine)
+    template, data = job_files
+    assert yongmerge.main(["run", "--template", template, "--data", data, "--com-stats", "1"]) == yongmerge.EXIT_OK
+
+    calls = _events(capsys.readouterr().out)[-1]["com_calls"]
+    assert calls["total_calls"] == 5
+    assert len(calls["members"]) == 1 and calls["members"][0]["count"] == 2
+    assert calls["file"] == os.path.splitext(template)[0] + "_com_calls.json"
+    assert os.path.exists(calls["file"])
+
+
+def test_cli_exit_codes_for_bad_input(fake_word, job_files, capsys):
+    template, data = job_files
+    assert yongmerge.main(["run", "--template", template + ".txt", "--data", data]) == yongmerge.EXIT_USAGE
+    assert yongmerge.main(["run", "--template", template, "--data", data + ".missing"]) == yongmerge.EXIT_USAGE
+    errors = _events(capsys.readouterr().out)
+    assert errors[-1]["event"] == "error" and errors[-1]["exit_code"] == yongmerge.EXIT_USAGE
+    assert fake_word == []
+
+
+def test_engine_unavailable_returns_unsupported(job_files, monkeypatch, capsys):
+    def unavailable(doc_type):
+        raise yongmerge.MergeError("no COM", yongmerge.EXIT_UNSUPPORTED)
+    monkeypatch.setattr(yongmerge, "_load_engine", unavailable)
+    template, data = job_files
+    assert yongmerge.main(["run", "--template", template, "--data", data]) == yongmerge.EXIT_UNSUPPORTED
+
+
+def test_split_rows_keeps_index_and_order():
+    df = pd.DataFrame({"a": range(10)})
+    chunks = yongmerge._split_rows(df, 3)
+    assert [list(c.index) for c in chunks] == [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]]
+    assert len(yongmerge._split_rows(df.head(2), 4)) == 2
+
+
+def test_parse_result_message_with_media_stats():
+    result = yongmerge.parse_result_message("COMBINED_DONE|/out/a.pptx|30|30|2|1048576")
+    assert result == {"type": "COMBINED_DONE", "path": "/out/a.pptx", "count": 30,
+                      "media": {"parts": 30, "unique": 2, "saved_bytes": 1048576}}
+
+
+@pytest.mark.parametrize("ext, doc_type", [(".hwp", "hwp"), (".pptx", "ppt")])
+def test_hwp_and_ppt_com_jobs_run_in_one_process(tmp_path, monkeypatch, ext, doc_type):
+    # 한글·PowerPoint는 프로세스끼리 같은 인스턴스를 쓰므로 --jobs를 나누지 않음
+    calls = []
+
+    def process(dataframe, template_path, output_type, progress, save_path=None, **kwargs):
+        calls.append(list(dataframe.index))
+        return f"INDIVIDUAL_DONE|{os.path.dirname(template_path)}|{len(dataframe)}"
+
+    engine = types.SimpleNamespace(process_hwp_template=process, process_ppt_template=process)
+    monkeypatch.setattr(yongmerge, "_load_engine", lambda kind: engine)
+    monkeypatch.setattr(yongmerge, "_run_parallel", lambda *args, **kwargs: pytest.fail("parallel run"))
+    template = tmp_path / f"letter{ext}"
+    template.write_bytes(b"template")
+
+    result = yongmerge.run_merge(str(template), pd.DataFrame({"이름": list("가나다라")}), jobs=4)
+    assert calls == [[0, 1, 2, 3]]
+    assert result["jobs"] == 1 and result["jobs_requested"] == 4
@@ -1,19 +1,22 @@
 import os
 import time
-import win32com.client
-import pandas as pd
+import com_factory
 import tempfile
 import image_utils
-import pythoncom
+import placeholders
+import row_values
+import image_pipeline
+import job_trace
+import com_probe
 import shutil
-from PIL import Image
 
 def get_word_instance(visible=False):
     """Word 인스턴스를 기존 작업과 분리하여 독립적으로 생성합니다."""
     print("DEBUG: 독립적인 Word 인스턴스 생성 중...")
     try:
-        # DispatchEx를 사용하여 기존 창에 간섭하지 않는 새 프로세스 생성
-        word = win32com.client.DispatchEx("Word.Application")
+        # DispatchEx(com_factory.dispatch)를 사용하여 기존 창에 간섭하지 않는 새 프로세스 생성
+        with job_trace.span('acquire'):
+            word = com_factory.dispatch("Word.Application")
         print("DEBUG: Word 독립 프로세스 생성 완료.")
     except Exception as e:
         raise Exception(f"Word 실행 실패: {e}")
@@ -25,7 +28,8 @@ def get_word_instance(visible=False):
     except Exception as e:
         print(f"DEBUG: Word 초기 설정 오류(무시): {e}")
 
-    return word
+    # 계측이 켜져 있으면 COM 호출 횟수·지연 시간을 기록하는 프록시로 감쌈
+    return com_probe.wrap(word, 'word')
 
 def safe_open_doc(word, file_path, read_only=True):
     """파일 락에 대비하여 재시도 로직이 포함된 문서 열기"""
@@ -39,39 +43,50 @@ def safe_open_doc(word, file_path, read_only=True):
             time.sleep(0.5)
     raise Exception(f"문서를 열 수 없습니다: {file_path}")
 
-def insert_image_to_word(word_range, image_path, max_width_pt=450):
-    """비율을 유지하며 Word에 이미지 삽입"""
+def insert_image_to_word(word_range, image_path, max_width_pt=450, prepared=None):
+    """비율을 유지하며 Word에 이미지 삽입 (prepared: ImagePrefetcher가 미리 준비한 결과)"""
     try:
-        is_valid, message = image_utils.validate_image_path(image_path)
-        if not is_valid: return False
-            
-        abs_path = os.path.abspath(image_path)
+        if prepared is not None:
+            if not prepared['valid']: return False
+            abs_path = prepared['path']
+        else:
+            is_valid, message = image_utils.validate_image_path(image_path)
+            if not is_valid: return False
+            if image_utils.is_archive_path(image_path):
+                # ZIP 안의 이미지는 임시 파일로 추출해서 삽입
+                with image_utils.local_image_path(image_path) as local_path:
+                    return insert_image_to_word(word_range, local_path, max_width_pt)
+            abs_path = os.path.abspath(image_path)
+
         shape = word_range.InlineShapes.AddPicture(FileName=abs_path, LinkToFile=False, SaveWithDocument=True)
         
         try:
-            with Image.open(abs_path) as img:
-                w, h = img.size
-                ratio = h / w
-                if shape.Width > max_width_pt:
-                    shape.Width = max_width_pt
-                    shape.Height = max_width_pt * ratio
+            # 검증 시 읽은 메타데이터 캐시에서 비율 확인
+            ratio = 1 / ((prepared and prepared['aspect_ratio']) or image_utils.get_image_aspect_ratio(abs_path))
+            if shape.Width > max_width_pt:
+                shape.Width = max_width_pt
+                shape.Height = max_width_pt * ratio
         except: pass
         return True
     except Exception as e:
         print(f"ERROR: 이미지 삽입 오류: {e}")
         return False
 
-def replace_text_in_story_ranges(doc, old_text, new_text):
-    """문서 내 모든 영역(본문, 헤더, 푸터, 텍스트 상자 등)에서 텍스트/이미지 교체"""
+def replace_text_in_story_ranges(doc, old_text, new_text, prepared=None, is_image=None):
+    """문서 내 모든 영역(본문, 헤더, 푸터, 텍스트 상자 등)에서 텍스트/이미지 교체
+
+    is_image를 넘기면(row_values가 열 단위로 판별한 결과) 값마다 다시 판별하지 않습니다.
+    """
     found_any = False
-    is_image = image_utils.is_image_file(new_text)
+    if is_image is None:
+        is_image = image_utils.is_image_file(new_text)
 
     # 1. 모든 StoryRanges (본문, 헤더, 푸터 등) 처리
     for story in doc.StoryRanges:
         current_range = story
         while current_range:
             # 해당 영역 내의 텍스트/이미지 교체
-            if _replace_in_range(doc, current_range, old_text, new_text, is_image):
+            if _replace_in_range(doc, current_range, old_text, new_text, is_image, prepared):
                 found_any = True
             
             # 해당 영역에 포함된 도형(Shapes) 처리 (텍스트 상자 등)
@@ -79,14 +94,36 @@ def replace_text_in_story_ranges(doc, old_text, new_text):
                 if current_range.ShapeRange.Count > 0:
                     for shape in current_range.ShapeRange:
                         if shape.TextFrame.HasText:
-                            if _replace_in_range(doc, shape.TextFrame.TextRange, old_text, new_text, is_image):
+                            if _replace_in_range(doc, shape.TextFrame.TextRange, old_text, new_text, is_image, prepared):
                                 found_any = True
             except: pass
 
             current_range = current_range.NextStoryRange
     return found_any
 
-def _replace_in_range(doc, target_range, old_text, new_text, is_image):
+def find_placeholders(doc, scanner):
+    """문서 내 모든 영역의 텍스트를 한 번씩 읽어 들어 있는 [(자리 표시자, 필드 이름), ...]을 반환합니다."""
+    texts = []
+    for story in doc.StoryRanges:
+        current_range = story
+        while current_range:
+            texts.append(current_range.Text)
+            try:
+                if current_range.ShapeRange.Count > 0:
+                    for shape in current_range.ShapeRange:
+                        if shape.TextFrame.HasText:
+                            texts.append(shape.TextFrame.TextRange.Text)
+            except: pass
+            current_range = current_range.NextStoryRange
+    return scanner.tokens("\r".join(texts))
+
+def fill_document(doc, tokens, row, prepared_images):
+    """템플릿에 있는 자리 표시자만 행 값으로 교체합니다 ('{{x}}'를 '{x}'보다 먼저)."""
+    for token, name in tokens:
+        val = row.get(name)
+        replace_text_in_story_ranges(doc, token, val, prepared_images.get(val), row.is_image(name))
+
+def _replace_in_range(doc, target_range, old_text, new_text, is_image, prepared=None):
     """지정된 범위(Range) 내에서 텍스트 또는 이미지를 교체합니다."""
     found = False
     if is_image:
@@ -99,7 +136,9 @@ def _replace_in_range(doc, target_range, old_text, new_text, is_image):
             find_obj.Wrap = 0 # wdFindStop
             if find_obj.Execute():
                 search_range.Text = ""
-                if insert_image_to_word(search_range, new_text):
+                with job_trace.span('image'):
+                    inserted = insert_image_to_word(search_range, new_text, prepared=prepared)
+                if inserted:
                     found = True
                 # 다음 검색을 위해 범위 조정
                 start_pos = search_range.End
@@ -116,17 +155,20 @@ def _replace_in_range(doc, target_range, old_text, new_text, is_image):
             found = True
     return found
 
-def process_word_template(dataframe, template_file_path, output_type, progress_callback, save_path=None):
-    """메인 프로세스"""
+def process_word_template(dataframe, template_file_path, output_type, progress_callback, save_path=None, image_options=None, output_sink=None):
+    """메인 프로세스 (output_sink가 있으면 개별 문서를 ZIP에 넣음)"""
+    dataframe = image_pipeline.prepare_dataframe_images(dataframe, image_options)
     # 작업 중에는 숨겨서 UI 부하 감소 및 포커스 충돌 방지
     word = get_word_instance(visible=False)
 
     try:
         if output_type == 'individual':
-            return process_individual_word(word, dataframe, template_file_path, progress_callback)
+            return process_individual_word(word, dataframe, template_file_path, progress_callback, output_sink)
         elif output_type == 'combined':
             return process_combined_word(word, dataframe, template_file_path, progress_callback, save_path)
     finally:
+        image_utils.log_image_cache_stats("Word")
+        image_utils.close_image_archives()
         # 작업 완료 후 워드 인스턴스 무조건 종료 (파일 잠금 해제 보장)
         try:
             word.Quit()
@@ -134,24 +176,35 @@ def process_word_template(dataframe, template_file_path, output_type, progress_c
         except:
             pass
 
-def process_individual_word(word, dataframe, template_file_path, progress_callback):
+def process_individual_word(word, dataframe, template_file_path, progress_callback, output_sink=None):
     output_dir = os.path.dirname(template_file_path)
     base_name = os.path.splitext(os.path.basename(template_file_path))[0]
     ext = os.path.splitext(template_file_path)[1]
     total_rows = len(dataframe)
+    rows = row_values.prepare_rows(dataframe)
+    scanner = placeholders.PlaceholderScanner(rows.names)
+    tokens = None  # 템플릿에 있는 자리 표시자 (첫 문서에서 한 번만 검색)
 
-    for index, row in dataframe.iterrows():
-        if progress_callback: progress_callback.emit(int(((index + 1) / total_rows) * 100))
-        doc = safe_open_doc(word, template_file_path)
+    # 파일 이름은 행 인덱스, 진행률은 처리 순서 기준
+    for position, (index, row, prepared_images) in enumerate(image_pipeline.ImagePrefetcher(rows)):
+        if progress_callback: progress_callback.emit(int(((position + 1) / total_rows) * 100))
+        with job_trace.span('open', index):
+            doc = safe_open_doc(word, template_file_path)
         try:
-            for col in dataframe.columns:
-                val = str(row[col]) if pd.notna(row[col]) else ""
-                for p in [f'{{{{{col}}}}}', f'{{{col}}}']:
-                    replace_text_in_story_ranges(doc, p, val)
+            with job_trace.span('fill', index):
+                if tokens is None:
+                    tokens = find_placeholders(doc, scanner)
+                fill_document(doc, tokens, row, prepared_images)
             
-            out_path = os.path.join(output_dir, f"{base_name}_row_{index+1}{ext}")
-            doc.SaveAs(os.path.abspath(out_path))
-            doc.Close(0)
+            if output_sink is not None:
+                out_path = output_sink.temp_path(row)
+            else:
+                out_path = os.path.join(output_dir, f"{base_name}_row_{index+1}{ext}")
+            with job_trace.span('save', index):
+                doc.SaveAs(os.path.abspath(out_path))
+                doc.Close(0)
+                if output_sink is not None:
+                    output_sink.add_file(row, os.path.abspath(out_path))
         except Exception as e:
             print(f"ERROR: 행 {index+1} 처리 실패: {e}")
             try: doc.Close(0)
@@ -160,21 +213,26 @@ def process_individual_word(word, dataframe, template_file_path, progress_callba
 
 def process_combined_word(word, dataframe, template_file_path, progress_callback, save_path):
     total_rows = len(dataframe)
+    rows = row_values.prepare_rows(dataframe)
+    scanner = placeholders.PlaceholderScanner(rows.names)
+    tokens = None  # 템플릿에 있는 자리 표시자 (첫 문서에서 한 번만 검색)
     temp_dir = tempfile.mkdtemp()
     temp_files = []
     
     try:
-        for index, row in dataframe.iterrows():
+        for index, row, prepared_images in image_pipeline.ImagePrefetcher(rows):
             if progress_callback: progress_callback.emit(int(((index + 1) / total_rows) * 50))
-            doc = safe_open_doc(word, template_file_path)
+            with job_trace.span('open', index):
+                doc = safe_open_doc(word, template_file_path)
             try:
-                for col in dataframe.columns:
-                    val = str(row[col]) if pd.notna(row[col]) else ""
-                    for p in [f'{{{{{col}}}}}', f'{{{col}}}']:
-                        replace_text_in_story_ranges(doc, p, val)
+                with job_trace.span('fill', index):
+                    if tokens is None:
+                        tokens = find_placeholders(doc, scanner)
+                    fill_document(doc, tokens, row, prepared_images)
                 t_path = os.path.join(temp_dir, f"temp_{index:04d}.docx")
-                doc.SaveAs(os.path.abspath(t_path))
-                doc.Close(0)
+                with job_trace.span('save', index):
+                    doc.SaveAs(os.path.abspath(t_path))
+                    doc.Close(0)
                 temp_files.append(t_path)
             except Exception as e:
                 print(f"ERROR: 행 {index} 생성 실패: {e}")
@@ -182,6 +240,7 @@ def process_combined_word(word, dataframe, template_file_path, progress_callback
                 except: pass
 
         if not temp_files: raise Exception("생성된 파일 없음")
+        merge_span = job_trace.begin('merge')
         combined_doc = safe_open_doc(word, temp_files[0], read_only=False)
         for i in range(1, len(temp_files)):
             if progress_callback: progress_callback.emit(50 + int((i / len(temp_files)) * 50))
@@ -191,9 +250,11 @@ def process_combined_word(word, dataframe, template_file_path, progress_callback
             rng = combined_doc.Content
             rng.Collapse(0)
             rng.InsertFile(os.path.abspath(temp_files[i]))
+        job_trace.end(merge_span)
         
-        combined_doc.SaveAs(os.path.abspath(save_path))
-        combined_doc.Close(0)
+        with job_trace.span('save'):
+            combined_doc.SaveAs(os.path.abspath(save_path))
+            combined_doc.Close(0)
         return f"COMBINED_DONE|{save_path}|{len(temp_files)}"
     finally:
         shutil.rmtree(temp_dir, ignore_errors=True)
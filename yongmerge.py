@@ -0,0 +1,522 @@
+"""YongMerge 헤드리스 API와 명령줄 도구 (PyQt 없이 병합 작업 실행).
+
+    python -m yongmerge run --template t.docx --data d.xlsx --mode combined --jobs 8
+    python -m yongmerge run --template t.docx --data d.xlsx --mode archive --name-pattern "{이름}_{학번}"
+
+진행 상황은 표준 출력에 JSON 한 줄씩 기록하고, 엔진의 DEBUG 로그는 표준 오류로 보냅니다.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import data_sources
+import image_resolver
+import job_trace
+import com_probe
+import com_factory
+import native_merge
+import output_archive
+import template_inspector
+
+# 종료 코드
+EXIT_OK = 0
+EXIT_FAILED = 1        # 병합 중 오류
+EXIT_USAGE = 2         # 잘못된 인자, 템플릿·데이터 파일 문제
+EXIT_UNSUPPORTED = 3   # 문서 엔진(COM)을 사용할 수 없는 환경
+
+# 템플릿 확장자별 문서 종류
+DOC_TYPES = {
+    '.hwp': 'hwp', '.hwpx': 'hwp',
+    '.ppt': 'ppt', '.pptx': 'ppt',
+    '.doc': 'word', '.docx': 'word',
+}
+
+# individual: 개별 파일, combined: 통합 파일 하나, archive: 개별 문서를 ZIP 하나로
+OUTPUT_TYPES = ('individual', 'combined', 'archive')
+
+# 문서 엔진 선택 - auto: 네이티브 엔진으로 처리할 수 있으면 네이티브, 아니면 COM
+ENGINES = ('auto', 'com', 'native')
+
+# 프로세스마다 별도 인스턴스를 띄울 수 있는 COM 엔진 (--jobs로 나눠 실행 가능)
+# 한글은 실행 중인 창에 붙고(get_active) PowerPoint는 단일 인스턴스 서버라서 작업끼리 문서를 닫거나 Quit으로 서로 종료함
+PARALLEL_COM_TYPES = ('word',)
+
+
+class MergeError(Exception):
+    """병합 작업 오류 (exit_code는 명령줄 종료 코드)."""
+
+    def __init__(self, message, exit_code=EXIT_FAILED):
+        super().__init__(message)
+        self.exit_code = exit_code
+
+
+class ProgressReporter:
+    """엔진의 progress_callback.emit(값) 호출을 일반 함수 호출로 바꿔 줍니다 (pyqtSignal 대체)."""
+
+    def __init__(self, callback=None):
+        self.callback = callback
+
+    def emit(self, value):
+        if self.callback:
+            self.callback(int(value))
+
+
+def detect_doc_type(template_path):
+    """템플릿 확장자로 문서 종류('hwp', 'ppt', 'word')를 반환합니다."""
+    ext = os.path.splitext(template_path)[1].lower()
+    doc_type = DOC_TYPES.get(ext)
+    if doc_type is None:
+        raise MergeError(f"지원하지 않는 템플릿 형식입니다: {os.path.basename(template_path)}", EXIT_USAGE)
+    return doc_type
+
+
+def default_combined_path(template_path):
+    """통합본 기본 저장 경로 (템플릿 폴더의 '<이름>_combined<확장자>')."""
+    base, ext = os.path.splitext(os.path.abspath(template_path))
+    return f"{base}_combined{ext}"
+
+
+def _load_engine(doc_type):
+    """문서 엔진 모듈을 필요할 때만 가져옵니다 (win32com이 없는 환경에서도 API 자체는 import 가능)."""
+    try:
+        if doc_type == 'hwp':
+            import hwp_automation as engine
+        elif doc_type == 'ppt':
+            import ppt_automation as engine
+        else:
+            import word_automation as engine
+    except ImportError as e:
+        raise MergeError(f"문서 엔진을 불러올 수 없습니다 (Windows와 pywin32 필요): {e}", EXIT_UNSUPPORTED)
+    if not com_factory.available():
+        raise MergeError("문서 프로그램(COM)을 사용할 수 없습니다 (Windows와 pywin32 필요)", EXIT_UNSUPPORTED)
+    return engine
+
+
+def _open_native(template_path, dataframe, output_type, engine='auto', native_options=None):
+    """네이티브 엔진을 쓸 수 있으면 native_merge.NativeMerge, COM 엔진을 써야 하면 None을 반환합니다.
+
+    engine='native'인데 처리할 수 없는 템플릿이면 MergeError를 발생시킵니다.
+    native_options는 {'compression': 압축 정책, 'threads': 압축 스레드 수}입니다.
+    """
+    if engine not in ENGINES:
+        raise MergeError(f"지원하지 않는 엔진입니다: {engine}", EXIT_USAGE)
+    if engine == 'com':
+        return None
+    compression = (native_options or {}).get('compression')
+    if compression is not None and compression not in native_merge.COMPRESSION_POLICIES:
+        raise MergeError(f"지원하지 않는 압축 정책입니다: {compression}", EXIT_USAGE)
+    try:
+        return native_merge.open_merge(template_path, dataframe, output_type, native_options)
+    except native_merge.UnsupportedTemplate as e:
+        if engine == 'native':
+            raise MergeError(str(e), EXIT_USAGE)
+        print(f"DEBUG: COM 엔진 사용 - {e}")
+        return None
+
+
+def _run_native(native, progress=None, trace=None, output_type='individual', save_path=None, name_pattern=None):
+    job_trace.activate(trace)
+    try:
+        if output_type == 'archive':
+            return native.process_archive(save_path or output_archive.default_archive_path(native.template_path),
+                                          name_pattern, progress)
+        return native.process_individual(progress)
+    finally:
+        job_trace.activate(None)
+
+
+def _archive_sink(doc_type, dataframe, template_path, save_path=None, name_pattern=None):
+    """COM 엔진의 개별 문서를 받을 output_archive.ArchiveWriter (PPT는 항상 .pptx로 저장)."""
+    namer = output_archive.FileNamer(template_path, [str(c) for c in dataframe.columns], name_pattern,
+                                     '.pptx' if doc_type == 'ppt' else None)
+    return output_archive.ArchiveWriter(save_path or output_archive.default_archive_path(template_path), namer)
+
+
+def run_engine(doc_type, dataframe, template_path, output_type, progress=None, save_path=None, image_options=None,
+               trace=None, com_stats=None, engine='auto', native_options=None, name_pattern=None):
+    """문서 엔진을 직접 호출하고 결과 메시지("INDIVIDUAL_DONE|..." / "COMBINED_DONE|..." / "ARCHIVE_DONE|...")를 반환합니다.
+
+    progress는 emit(int) 메서드를 가진 객체(pyqtSignal 또는 ProgressReporter)입니다.
+    trace(job_trace.JobTrace)를 넘기면 엔진의 단계별 소요 시간이 기록됩니다.
+    com_stats(com_probe.ComCallStats)를 넘기면 문서 프로그램 COM 호출을 멤버별로 집계합니다.
+    engine('auto', 'com', 'native')이 'com'이 아니면 가능한 경우 문서 프로그램 없이 네이티브 엔진으로 만들며,
+    native_options(압축 정책·스레드 수)를 네이티브 엔진에 넘깁니다.
+    통합본은 저장 후 같은 내용의 미디어를 하나로 합치고 결과를 메시지 뒤에 붙입니다.
+    archive는 개별 문서를 save_path의 ZIP 하나에 넣으며, ZIP 안의 파일 이름은 name_pattern('{열}' 패턴)으로 정합니다.
+    """
+    native = _open_native(template_path, dataframe, output_type, engine, native_options)
+    if native is not None:
+        return _run_native(native, progress, trace, output_type, save_path, name_pattern)
+
+    module = _load_engine(doc_type)
+    # archive는 엔진의 개별 저장에 ZIP(output_sink)을 넘겨 저장한 문서를 바로 옮김
+    sink, sink_options = None, {}
+    if output_type == 'archive':
+        sink = _archive_sink(doc_type, dataframe, template_path, save_path, name_pattern)
+        sink_options = {'output_sink': sink}
+    engine_output = 'individual' if sink is not None else output_type
+    job_trace.activate(trace)
+    com_probe.activate(com_stats)
+    try:
+        if doc_type == 'hwp':
+            result_message = module.process_hwp_template(
+                dataframe, template_path, engine_output, progress, save_path, image_options=image_options,
+                **sink_options
+            )
+        elif doc_type == 'ppt':
+            result_message = module.process_ppt_template(
+                dataframe, template_path, engine_output, progress, save_path, debug_mode=True, image_options=image_options,
+                **sink_options
+            )
+        else:
+            result_message = module.process_word_template(
+                dataframe, template_path, engine_output, progress, save_path, image_options=image_options,
+                **sink_options
+            )
+    except BaseException:
+        if sink is not None:
+            sink.abort()
+        raise
+    finally:
+        job_trace.activate(None)
+        com_probe.activate(None)
+
+    if sink is not None:
+        sink.close()
+        return f"ARCHIVE_DONE|{sink.path}|{sink.count}"
+
+    # 통합본은 저장 후 같은 내용의 이미지를 하나의 미디어 파트로 합침
+    if output_type == 'combined' and save_path and result_message.startswith("COMBINED_DONE"):
+        import media_store
+        media_report = media_store.dedupe_package_media(save_path)
+        if media_report and media_report['parts']:
+            result_message += f"|{media_report['parts']}|{media_report['unique']}|{media_report['saved_bytes']}"
+    return result_message
+
+
+def parse_result_message(message):
+    """엔진 결과 메시지를 dict로 바꿉니다."""
+    parts = message.split("|")
+    result = {'type': parts[0], 'path': parts[1] if len(parts) > 1 else "", 'count': int(parts[2]) if len(parts) > 2 else 0}
+    if len(parts) >= 6:
+        result['media'] = {'parts': int(parts[3]), 'unique': int(parts[4]), 'saved_bytes': int(parts[5])}
+    return result
+
+
+def report_base_path(template_path, output_type, save_path=None):
+    """작업 보고서 파일 경로의 앞부분 - 개별 저장은 결과 폴더의 '<템플릿 이름>', 통합본·ZIP은 '<저장 파일 이름>'."""
+    if output_type in ('combined', 'archive') and save_path:
+        return os.path.splitext(os.path.abspath(save_path))[0]
+    return os.path.splitext(os.path.abspath(template_path))[0]
+
+
+def write_trace(trace, template_path, output_type, save_path=None):
+    """추적 결과를 출력 옆에 '_trace.json/.csv'로 저장하고 (json 경로, csv 경로)를 반환합니다 (실패하면 None)."""
+    try:
+        return trace.write(report_base_path(template_path, output_type, save_path) + "_trace")
+    except OSError as e:
+        print(f"DEBUG: 작업 추적 저장 실패: {e}")
+        return None
+
+
+def write_com_stats(stats, template_path, output_type, save_path=None, limit=20):
+    """COM 호출 상위 limit개를 로그로 출력하고 전체 집계를 출력 옆 '_com_calls.json'에 저장합니다."""
+    print("DEBUG: " + stats.report(limit))
+    try:
+        return stats.write(report_base_path(template_path, output_type, save_path) + "_com_calls.json")
+    except OSError as e:
+        print(f"DEBUG: COM 호출 통계 저장 실패: {e}")
+        return None
+
+
+def load_dataframe(data_path, table=None, query=None):
+    """데이터 파일을 읽고 완전히 빈 행을 제외합니다 (GUI의 문서 생성과 같은 기준)."""
+    try:
+        dataframe, _ = data_sources.load_data_source(data_path, table=table, query=query)
+    except (OSError, ValueError) as e:
+        raise MergeError(f"데이터 파일을 읽을 수 없습니다: {e}", EXIT_USAGE)
+    return dataframe.dropna(how='all').reset_index(drop=True)
+
+
+def apply_image_patterns(dataframe, patterns, base_dir):
+    """{열 이름: 경로 패턴}으로 이미지 열을 실제 파일 경로로 바꾸고 (DataFrame, 찾지 못한 목록)을 반환합니다."""
+    if not patterns:
+        return dataframe, []
+    resolved_df = dataframe.copy()
+    unmatched_all = []
+    for column, pattern in patterns.items():
+        try:
+            resolved, unmatched = image_resolver.resolve_image_pattern(dataframe, pattern, base_dir)
+        except (OSError, ValueError) as e:
+            raise MergeError(f"이미지 경로 패턴 오류 ({column}): {e}", EXIT_USAGE)
+        resolved_df[column] = resolved
+        unmatched_all.extend((column, row, key) for row, key in unmatched)
+    return resolved_df, unmatched_all
+
+
+def _split_rows(dataframe, jobs):
+    """행을 jobs개의 연속 구간으로 나눕니다 (행 인덱스 유지 → 개별 파일 이름이 그대로)."""
+    size, extra = divmod(len(dataframe), jobs)
+    chunks, start = [], 0
+    for i in range(jobs):
+        end = start + size + (1 if i < extra else 0)
+        if end > start:
+            chunks.append(dataframe.iloc[start:end])
+        start = end
+    return chunks
+
+
+def _run_chunk(chunk_id, doc_type, dataframe, template_path, image_options, queue, count_com_calls=False,
+               engine='auto', native_options=None):
+    """프로세스 풀 작업 함수 - 프로세스마다 별도의 Word 인스턴스(또는 네이티브 엔진)로 개별 문서를 만듭니다."""
+    # 엔진 로그가 JSON 진행 출력에 섞이지 않도록 표준 오류로 보냄
+    sys.stdout = sys.stderr
+    com_factory.co_initialize()
+    try:
+        reporter = ProgressReporter(lambda value: queue.put((chunk_id, value)))
+        trace = job_trace.JobTrace(chunk=chunk_id)
+        com_stats = com_probe.ComCallStats() if count_com_calls else None
+        message = run_engine(doc_type, dataframe, template_path, 'individual', reporter, None, image_options, trace,
+                             com_stats, engine, native_options)
+        # 추적 기록과 COM 호출 통계는 부모 프로세스에서 하나로 합침
+        return message, trace.spans, trace.wall_start, com_stats.members if com_stats else None
+    finally:
+        com_factory.co_uninitialize()
+
+
+def _run_parallel(doc_type, dataframe, template_path, jobs, image_options, on_progress, trace=None, com_stats=None,
+                  engine='auto', native_options=None):
+    """개별 저장을 여러 프로세스에 나눠 실행하고 결과 메시지(와 추적 기록, COM 호출 통계)를 하나로 합칩니다."""
+    chunks = _split_rows(dataframe, jobs)
+    weights = [len(chunk) / len(dataframe) for chunk in chunks]
+    percents = [0] * len(chunks)
+    last_reported = -1
+    with multiprocessing.Manager() as manager:
+        queue = manager.Queue()
+        with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+            futures = [executor.submit(_run_chunk, i, doc_type, chunk, template_path, image_options, queue,
+                                       com_stats is not None, engine, native_options)
+                       for i, chunk in enumerate(chunks)]
+            while True:
+                done = all(f.done() for f in futures)
+                while not queue.empty():
+                    chunk_id, value = queue.get()
+                    percents[chunk_id] = max(percents[chunk_id], min(100, value))
+                overall = int(sum(p * w for p, w in zip(percents, weights)))
+                if on_progress and overall != last_reported:
+                    on_progress(overall)
+                    last_reported = overall
+                if done:
+                    break
+                time.sleep(0.1)
+            results = [f.result() for f in futures]
+    messages = [message for message, _, _, _ in results]
+    for _, spans, wall_start, members in results:
+        if trace is not None:
+            trace.extend(spans, wall_start)
+        if com_stats is not None and members:
+            com_stats.merge(members)
+    output_dir = parse_result_message(messages[0])['path']
+    total = sum(parse_result_message(m)['count'] for m in messages)
+    return f"INDIVIDUAL_DONE|{output_dir}|{total}"
+
+
+def _prepare_job(template_path, dataframe, template_fields=None, name_pattern=None):
+    """입력을 확인하고 (절대 경로, 문서 종류, 템플릿이 쓰는 열만 남긴 DataFrame, ColumnPlan 또는 None)을 반환합니다.
+
+    name_pattern(파일 이름 패턴)이 쓰는 열은 템플릿이 쓰지 않아도 남깁니다.
+    """
+    if not os.path.isfile(template_path):
+        raise MergeError(f"템플릿 파일이 없습니다: {template_path}", EXIT_USAGE)
+    if dataframe.empty:
+        raise MergeError("생성할 데이터 행이 없습니다.", EXIT_USAGE)
+
+    template_path = os.path.abspath(template_path)
+    doc_type = detect_doc_type(template_path)
+    if template_fields is None:
+        template_fields = template_inspector.inspect_template(template_path)
+    plan = template_fields.plan(dataframe.columns) if template_fields is not None else None
+    if plan is not None:
+        dataframe = plan.prune(dataframe, output_archive.pattern_columns(name_pattern, dataframe.columns))
+    return template_path, doc_type, dataframe, plan
+
+
+def iter_documents(template_path, dataframe, name_pattern=None, native_options=None, max_pending=None,
+                   template_fields=None):
+    """문서를 디스크에 쓰지 않고 행마다 (행 키, 파일 이름, 문서 bytes)를 반환하는 제너레이터를 돌려줍니다.
+
+    서비스에 병합을 넣어 쓸 때 사용하며, 메모리에서 만들 수 있는 네이티브 엔진 작업(.docx/.pptx/.hwpx,
+    텍스트 값)만 지원하고 그 외에는 MergeError를 발생시킵니다.
+    파일 이름은 name_pattern('{열}' 패턴, 템플릿이 쓰지 않는 열도 가능)으로 정하고,
+    미리 만들어 두는 문서는 max_pending개로 제한합니다.
+    """
+    template_path, _, dataframe, _ = _prepare_job(template_path, dataframe, template_fields, name_pattern)
+    native = _open_native(template_path, dataframe, 'individual', 'native', native_options)
+    return native.iter_documents(name_pattern, max_pending)
+
+
+def run_merge(template_path, dataframe, output_type='individual', save_path=None, jobs=1,
+              image_options=None, on_progress=None, com_stats_top=None, template_fields=None, engine='auto',
+              native_options=None, name_pattern=None):
+    """템플릿과 데이터로 문서를 생성하고 결과 dict(type, path, count[, media], engine[, compression], jobs, seconds, fields, trace[, com_calls])를 반환합니다.
+
+    jobs가 2 이상이면 개별 저장을 여러 프로세스(네이티브 엔진, 또는 각자 별도의 Word 인스턴스)로 나눠 실행합니다.
+    한글과 PowerPoint COM 엔진은 프로세스끼리 같은 인스턴스를 쓰게 되므로 jobs를 1로 줄이고
+    요청한 값을 jobs_requested에 담습니다.
+    통합본과 ZIP(archive)은 파일 하나에 차례로 써야 하므로 항상 한 프로세스에서 실행합니다.
+    archive는 개별 문서를 ZIP 하나(save_path, 기본 '<템플릿 이름>_documents.zip')로 저장하며
+    ZIP 안의 파일 이름은 name_pattern(예: '{이름}_{학번}')으로 정합니다.
+    단계별 소요 시간은 출력 옆의 '_trace.json/.csv'에 저장하고 요약(p50/p95)을 trace에 담습니다.
+    com_stats_top을 지정하면 COM 호출을 멤버별로 집계해 '_com_calls.json'에 저장하고 상위 N개를 com_calls에 담습니다.
+    템플릿 필드를 알 수 있으면(template_fields 또는 template_inspector) 템플릿이 쓰는 열만 엔진에 넘기고
+    비교 결과(used, unused_columns, missing_fields)를 fields에 담습니다.
+    engine이 'auto'(기본)이면 .docx/.pptx/.hwpx 개별 저장처럼 네이티브 엔진으로 처리할 수 있는 작업은
+    문서 프로그램 없이 만들고(native_options: 압축 정책·스레드 수), 그 외에는 COM 엔진을 씁니다.
+    """
+    if output_type not in OUTPUT_TYPES:
+        raise MergeError(f"지원하지 않는 출력 방식입니다: {output_type}", EXIT_USAGE)
+    template_path, doc_type, dataframe, plan = _prepare_job(template_path, dataframe, template_fields,
+                                                            name_pattern if output_type == 'archive' else None)
+    native = _open_native(template_path, dataframe, output_type, engine, native_options)
+    if native is None:
+        _load_engine(doc_type)  # 작업 프로세스를 띄우기 전에 엔진 사용 가능 여부 확인
+    engine = 'com' if native is None else 'native'
+    if output_type == 'combined':
+        save_path = os.path.abspath(save_path or default_combined_path(template_path))
+    elif output_type == 'archive':
+        save_path = os.path.abspath(save_path or output_archive.default_archive_path(template_path))
+    jobs = max(1, min(int(jobs or 1), len(dataframe)))
+    if output_type != 'individual':
+        jobs = 1
+    requested_jobs = jobs
+    if jobs > 1 and native is None and doc_type not in PARALLEL_COM_TYPES:
+        print(f"DEBUG: {doc_type} COM 엔진은 여러 프로세스에서 같은 인스턴스를 쓰므로 jobs {jobs} → 1")
+        jobs = 1
+
+    start = time.perf_counter()
+    trace = job_trace.JobTrace(template=template_path, doc_type=doc_type, output_type=output_type,
+                               rows=len(dataframe), jobs=jobs)
+    com_stats = com_probe.ComCallStats() if com_stats_top else None
+    if jobs > 1:
+        message = _run_parallel(doc_type, dataframe, template_path, jobs, image_options, on_progress, trace, com_stats,
+                                engine, native_options)
+    elif native is not None:
+        message = _run_native(native, ProgressReporter(on_progress), trace, output_type, save_path, name_pattern)
+    else:
+        message = run_engine(doc_type, dataframe, template_path, output_type,
+                             ProgressReporter(on_progress), save_path, image_options, trace, com_stats,
+                             name_pattern=name_pattern)
+    result = parse_result_message(message)
+    result['engine'] = engine
+    if native is not None:
+        result['compression'] = native.compression
+    result['jobs'] = jobs
+    if requested_jobs != jobs:
+        result['jobs_requested'] = requested_jobs
+    result['seconds'] = round(time.perf_counter() - start, 3)
+    result['fields'] = plan.to_dict() if plan is not None else None
+    paths = write_trace(trace, template_path, output_type, save_path)
+    result['trace'] = {'summary': trace.summary(), 'files': list(paths) if paths else []}
+    if com_stats is not None:
+        com_path = write_com_stats(com_stats, template_path, output_type, save_path, com_stats_top)
+        result['com_calls'] = dict(com_stats.to_dict(com_stats_top), file=com_path)
+    return result
+
+
+def _write_event(stream, event, **fields):
+    stream.write(json.dumps(dict(event=event, time=round(time.time(), 3), **fields), ensure_ascii=False) + "\n")
+    stream.flush()
+
+
+def _parse_patterns(values):
+    patterns = {}
+    for value in values or []:
+        column, sep, pattern = value.partition('=')
+        if not sep or not column.strip() or not pattern.strip():
+            raise MergeError(f"--image-pattern 형식은 열이름=패턴 입니다: {value}", EXIT_USAGE)
+        patterns[column.strip()] = pattern.strip()
+    return patterns
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='yongmerge', description="YongMerge 문서 병합 (GUI 없이 실행)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="템플릿과 데이터로 문서 생성")
+    run.add_argument('--template', required=True, help="템플릿 파일 (.hwp/.hwpx/.ppt/.pptx/.doc/.docx)")
+    run.add_argument('--data', required=True, help="데이터 파일 (xlsx, csv, parquet, feather, jsonl, sqlite)")
+    run.add_argument('--mode', choices=OUTPUT_TYPES, default='individual', help="개별 파일, 통합 파일 또는 개별 문서 ZIP")
+    run.add_argument('--output', help="통합본·ZIP 저장 경로 (기본: 템플릿 폴더의 <이름>_combined, <이름>_documents.zip)")
+    run.add_argument('--name-pattern', metavar='PATTERN',
+                     help="ZIP 안의 파일 이름 패턴 (예: {이름}_{학번}, 기본: <템플릿 이름>_row_<번호>)")
+    run.add_argument('--jobs', type=int, default=1, help="개별 저장 시 동시에 실행할 프로세스 수")
+    run.add_argument('--table', help="SQLite 테이블 이름")
+    run.add_argument('--query', help="SQLite SELECT 쿼리")
+    run.add_argument('--image-pattern', action='append', metavar='COLUMN=PATTERN',
+                     help="이미지 열 경로 패턴 (예: IMAGE=photos/{학번}.*), 여러 번 지정 가능")
+    run.add_argument('--downsample', action='store_true', help="삽입 전에 큰 이미지를 축소·재압축")
+    run.add_argument('--dpi', type=int, help="이미지 축소 목표 DPI")
+    run.add_argument('--quality', type=int, help="이미지 축소 JPEG 품질")
+    run.add_argument('--engine', choices=ENGINES, default='auto',
+                     help="문서 엔진 (auto: .docx/.pptx/.hwpx 개별 저장은 문서 프로그램 없이 생성, 그 외 COM)")
+    run.add_argument('--compression', choices=list(native_merge.COMPRESSION_POLICIES),
+                     help="네이티브 엔진 압축 정책 (store: 가장 빠름, fast, default(기본), max: 가장 작음)")
+    run.add_argument('--deflate-threads', type=int, metavar='N',
+                     help="네이티브 엔진에서 값 자리가 있는 파트를 압축할 스레드 수 (기본: CPU 수, 최대 4)")
+    run.add_argument('--com-stats', type=int, nargs='?', const=20, metavar='N',
+                     help="COM 호출 횟수·지연 시간을 집계하고 상위 N개 멤버를 보고 (기본 20)")
+    return parser
+
+
+def _command_run(args, out):
+    dataframe = load_dataframe(args.data, args.table, args.query)
+    base_dir = os.path.dirname(os.path.abspath(args.data))
+    dataframe, unmatched = apply_image_patterns(dataframe, _parse_patterns(args.image_pattern), base_dir)
+    for column, row, key in unmatched:
+        _write_event(out, 'warning', message="image_not_found", column=column, row=row + 1, key=key)
+
+    template_fields = template_inspector.inspect_template(args.template)
+    if template_fields is not None:
+        plan = template_fields.plan(dataframe.columns)
+        keep = output_archive.pattern_columns(args.name_pattern, dataframe.columns) if args.mode == 'archive' else []
+        unused = [str(c) for c in plan.unused_columns if str(c) not in keep]
+        if unused:
+            _write_event(out, 'warning', message="unused_columns", columns=unused)
+        if plan.missing_fields:
+            _write_event(out, 'warning', message="missing_fields", fields=plan.missing_fields)
+
+    image_options = {'enabled': args.downsample, 'dpi': args.dpi, 'quality': args.quality}
+    native_options = {'compression': args.compression, 'threads': args.deflate_threads}
+    _write_event(out, 'start', template=os.path.abspath(args.template), data=os.path.abspath(args.data),
+                 mode=args.mode, rows=len(dataframe), jobs=args.jobs)
+    result = run_merge(args.template, dataframe, args.mode, args.output, args.jobs, image_options,
+                       on_progress=lambda percent: _write_event(out, 'progress', percent=percent),
+                       com_stats_top=args.com_stats, template_fields=template_fields, engine=args.engine,
+                       native_options=native_options, name_pattern=args.name_pattern)
+    _write_event(out, 'done', **result)
+    return EXIT_OK
+
+
+def main(argv=None):
+    """명령줄 진입점 - 종료 코드를 반환합니다."""
+    args = build_parser().parse_args(argv)
+    out = sys.stdout
+    try:
+        # 엔진의 DEBUG 출력은 표준 오류로 (표준 출력은 JSON 진행 정보 전용)
+        with contextlib.redirect_stdout(sys.stderr):
+            return _command_run(args, out)
+    except MergeError as e:
+        _write_event(out, 'error', message=str(e), exit_code=e.exit_code)
+        return e.exit_code
+    except Exception as e:
+        _write_event(out, 'error', message=str(e), exit_code=EXIT_FAILED)
+        return EXIT_FAILED
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    sys.exit(main())
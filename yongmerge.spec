@@ -1,7 +1,6 @@
 # -*- mode: python ; coding: utf-8 -*-
 
 import os
-from PyInstaller.utils.hooks import collect_submodules
 
 block_cipher = None
 
@@ -10,7 +9,35 @@ def _resource(name):
     return os.path.join(os.getcwd(), name)
 
 
-hidden_imports = collect_submodules("win32com")
+# win32com 전체(collect_submodules)를 넣으면 데모·테스트까지 묶여 실행 파일이 커지고
+# one-file 실행 시 압축 해제 시간이 늘어나므로 실제로 쓰는 모듈만 지정
+hidden_imports = [
+    "pythoncom",
+    "pywintypes",
+    "win32com.client",
+    "win32com.client.dynamic",
+    "win32com.client.gencache",
+    "win32com.client.build",
+    "win32com.client.util",
+]
+
+# 사용하지 않는 대형 패키지와 Qt 모듈 제외
+excludes = [
+    "tkinter",
+    "matplotlib",
+    "IPython",
+    "notebook",
+    "scipy",
+    "pytest",
+    "PyQt5.QtWebEngineWidgets",
+    "PyQt5.QtWebEngineCore",
+    "PyQt5.QtQml",
+    "PyQt5.QtQuick",
+    "PyQt5.QtMultimedia",
+    "PyQt5.QtBluetooth",
+    "PyQt5.QtSql",
+    "PyQt5.QtTest",
+]
 
 a = Analysis(
     ["main_app.py"],
@@ -21,12 +48,13 @@ a = Analysis(
         (_resource("yongmerge.ico"), "."),
         (_resource("yongpdf_donation.jpg"), "."),
         (_resource("YongMerge_img.png"), "."),
+        (_resource("locales"), "locales"),
     ],
     hiddenimports=hidden_imports,
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=excludes,
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
@@ -49,7 +77,8 @@ exe = EXE(
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    # UPX로 압축한 Qt DLL은 실행할 때마다 풀어야 해서 시작이 느려짐
+    upx=False,
     upx_exclude=[],
     runtime_tmpdir=None,
     console=False,